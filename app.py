@@ -0,0 +1,96 @@
+"""
+Streamlit dashboard: GB imbalance vs intraday prices, spreads and volatility.
+
+All queries go to one memory-resident ``DashboardData`` per process
+(``st.cache_resource``); a redraw is a slice of precomputed arrays plus
+MinMaxLTTB downsampling to ≤ 2 000 points per trace.
+
+Usage:
+    streamlit run app.py
+"""
+
+import os
+import time
+from pathlib import Path
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from gbpower.dashboard import LABELS, PRICES, ROLLUPS, SPREADS, VOLATILITY, load_dashboard
+
+DATA = Path(os.environ.get("GBPOWER_DASHBOARD_DATA", "data/processed/final_merged_with_regimes.parquet"))
+MAX_SHADES = 300          # vrects are drawn one by one; skip shading on very long windows
+REGIME_COLOURS = {"HIGH_VOL": "rgba(255,165,0,0.15)", "EXTREME": "rgba(220,20,60,0.25)"}
+
+st.set_page_config(page_title="GB power spreads", layout="wide")
+
+
+@st.cache_resource
+def data():
+    return load_dashboard(DATA)
+
+
+def line_chart(traces: dict, title: str, regimes=None) -> go.Figure:
+    fig = go.Figure()
+    for col, frame in traces.items():
+        fig.add_trace(go.Scattergl(x=frame["datetime"], y=frame["value"], mode="lines", name=LABELS[col]))
+    if regimes is not None and 0 < len(regimes) <= MAX_SHADES:
+        stop = list(regimes["datetime"].iloc[1:]) + [traces_end(traces)]
+        for (_, row), end in zip(regimes.iterrows(), stop):
+            colour = REGIME_COLOURS.get(row["regime_flag"])
+            if colour:
+                fig.add_vrect(x0=row["datetime"], x1=end, fillcolor=colour, line_width=0, layer="below")
+    fig.update_layout(title=title, height=380, margin=dict(l=10, r=10, t=40, b=10), hovermode="x unified")
+    return fig
+
+
+def traces_end(traces: dict):
+    return max(frame["datetime"].iloc[-1] for frame in traces.values() if len(frame))
+
+
+d = data()
+first, last = d.span()
+
+with st.sidebar:
+    st.header("Window")
+    picked = st.date_input(
+        "Dates", value=(first.date(), last.date()), min_value=first.date(), max_value=last.date()
+    )
+    if len(picked) != 2:                  # mid-selection: only the start date is picked so far
+        st.stop()
+    start, end = picked
+    level = st.radio("Rollup", ["raw", *ROLLUPS], horizontal=True)
+    shade = st.checkbox("Shade stress regimes", value=True)
+
+t0 = time.perf_counter()
+lo, hi = str(start), f"{end} 23:30"
+panels = [("Prices (£/MWh)", PRICES), ("Spreads (£/MWh)", SPREADS), ("Volatility", VOLATILITY)]
+
+for title, group in panels:
+    cols = [c for c in group if c in d.columns]
+    if not cols:
+        continue
+    if level == "raw":
+        regimes = d.regimes(lo, hi) if shade else None
+        st.plotly_chart(line_chart(d.series(cols, lo, hi), title, regimes), use_container_width=True)
+    else:
+        table = d.rollup(level, lo, hi, cols)
+        fig = go.Figure()
+        for c in cols:
+            fig.add_trace(go.Scatter(x=table.index, y=table[f"{c}_mean"], mode="lines", name=LABELS[c]))
+            fig.add_trace(go.Scatter(
+                x=list(table.index) + list(table.index[::-1]),
+                y=list(table[f"{c}_max"]) + list(table[f"{c}_min"][::-1]),
+                fill="toself", line_width=0, opacity=0.2, showlegend=False, hoverinfo="skip",
+            ))
+        fig.update_layout(title=f"{title} – {level} mean, min–max band", height=380,
+                          margin=dict(l=10, r=10, t=40, b=10))
+        st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("Window summary")
+st.dataframe(d.summary(lo, hi), use_container_width=True)
+if level != "raw":
+    shares = [c for c in d.rollups[level].columns if c.startswith("share_")]
+    if shares:
+        st.bar_chart(d.rollup(level, lo, hi)[shares])
+st.caption(f"queried in {(time.perf_counter() - t0) * 1e3:.0f} ms")
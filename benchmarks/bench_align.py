@@ -0,0 +1,77 @@
+"""
+Source alignment: chained DataFrame.join(how="outer") vs gbpower.data.align.
+
+Synthetic half-hourly sources (int and float columns, a few gaps and
+duplicate periods each) are aligned both ways for a growing number of
+sources; the outputs are asserted equal.
+
+Run from the repo root:
+    python benchmarks/bench_align.py                      # 10 years, 4…32 sources
+    python benchmarks/bench_align.py --years 2 --sources 4 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gbpower.data.align import align_sources
+
+
+def make_sources(n_sources: int, years: float, cols: int = 6, seed: int = 0) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    n = int(years * 365 * 48)
+    dt = pd.date_range("2015-01-01", periods=n, freq="30min", tz="UTC")
+    out = []
+    for i in range(n_sources):
+        keep = rng.random(n) > 0.01                              # ~1 % gaps
+        dup = rng.choice(np.flatnonzero(keep), 20, replace=False)  # re-published periods
+        rows = np.sort(np.r_[np.flatnonzero(keep), dup])
+        df = pd.DataFrame({"datetime": dt[rows]})
+        for c in range(cols):
+            df[f"s{i}_c{c}"] = (rng.integers(0, 40_000, len(rows)) if c % 2
+                                else rng.normal(50, 20, len(rows)))
+        out.append(df)
+    return out
+
+
+def legacy_join(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    frames = [
+        f.sort_values("datetime", kind="stable").drop_duplicates("datetime").set_index("datetime")
+        for f in frames
+    ]
+    merged = frames[0]
+    for f in frames[1:]:
+        merged = merged.join(f, how="outer")
+    return merged
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--years", type=float, default=10)
+    p.add_argument("--sources", type=int, nargs="+", default=[4, 8, 16, 32])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    print(f"{'sources':>8}{'rows/source':>14}{'chained join':>15}{'align_sources':>16}{'speed-up':>10}")
+    for k in args.sources:
+        frames = make_sources(k, args.years)
+        t_old, old = best_of(lambda: legacy_join(frames), args.repeat)
+        t_new, new = best_of(lambda: align_sources([(f, "") for f in frames]), args.repeat)
+        pd.testing.assert_frame_equal(old, new)
+        print(f"{k:>8}{len(frames[0]):>14,}{t_old * 1e3:>12.1f} ms{t_new * 1e3:>13.1f} ms"
+              f"{t_old / t_new:>9.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Event annotation: legacy per-event mask loop vs searchsorted annotate_df.
+
+A synthetic half-hourly frame is annotated with synthetic, non-overlapping
+event logs of 10²…10⁵ events. The legacy loop is O(events × rows), so it is
+only run up to --legacy-max events; where both run, outputs are asserted equal.
+
+Run from the repo root:
+    python benchmarks/bench_annotate.py
+    python benchmarks/bench_annotate.py --years 2 --legacy-max 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gbpower.events.annotate import annotate_df
+
+
+def legacy_annotate(df: pd.DataFrame, event_log: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    out["event_id"] = pd.NA
+    for _, row in event_log.iterrows():
+        mask = (out["datetime"] >= row["start"]) & (out["datetime"] <= row["end"])
+        out.loc[mask, "event_id"] = row["event_id"]
+    out["event_age"] = out.groupby("event_id").cumcount().where(out["event_id"].notna())
+    return out
+
+
+def make_events(dt: pd.DatetimeIndex, n_events: int, seed: int = 0) -> pd.DataFrame:
+    """*n_events* disjoint [start, end] windows on the grid of *dt*."""
+    rng = np.random.default_rng(seed)
+    first = np.sort(rng.choice(len(dt) - 1, n_events, replace=False))
+    room = np.diff(np.r_[first, len(dt)]) - 1                  # rows before the next start
+    last = first + np.minimum(rng.integers(0, 12, n_events), room)
+    return pd.DataFrame({"event_id": np.arange(n_events), "start": dt[first], "end": dt[last]})
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--years", type=float, default=10)
+    p.add_argument("--events", type=int, nargs="+", default=[10**2, 10**3, 10**4, 10**5])
+    p.add_argument("--legacy-max", type=int, default=10**3)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    dt = pd.date_range("2015-01-01", periods=int(args.years * 365 * 48), freq="30min", tz="UTC")
+    df = pd.DataFrame({"datetime": dt, "x": np.arange(len(dt), dtype="float64")})
+    print(f"{len(df):,} half-hours")
+    print(f"{'events':>8}{'legacy loop':>15}{'annotate_df':>15}{'speed-up':>10}")
+
+    for n in args.events:
+        log = make_events(dt, n)
+        t_new, new = best_of(lambda: annotate_df(df, log), args.repeat)
+        if n <= args.legacy_max:
+            t_old, old = best_of(lambda: legacy_annotate(df, log), 1)
+            pd.testing.assert_frame_equal(new, old)
+            print(f"{n:>8,}{t_old * 1e3:>12.1f} ms{t_new * 1e3:>12.1f} ms{t_old / t_new:>9,.0f}×")
+        else:
+            print(f"{n:>8,}{'—':>15}{t_new * 1e3:>12.1f} ms{'':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Opening the merged table: read_dataset (parquet) vs open_cached (mmap'd Arrow IPC).
+
+final_merged_with_regimes.parquet is tiled --scale times into a temporary
+partitioned dataset. Timed: a parquet read, the one-off cache build, and a
+warm open (what every later process pays). "private MB" is what the open
+allocates on the Arrow heap, i.e. what each process does not share.
+
+Run from the repo root:
+    python benchmarks/bench_cache.py                 # ×10 (~150 k rows)
+    python benchmarks/bench_cache.py --scale 40
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from gbpower.data.cache import open_cached
+from gbpower.data.storage import read_dataset, write_dataset
+
+INPUT = "data/processed/final_merged_with_regimes.parquet"
+
+
+def best_of(fn, repeat: int) -> tuple[float, float, pd.DataFrame]:
+    best, mb = float("inf"), 0.0
+    for _ in range(repeat):
+        before = pa.total_allocated_bytes()
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+        mb = (pa.total_allocated_bytes() - before) / 2**20
+        del out
+    out = fn()
+    return best, mb, out
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--scale", type=int, default=10)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    df = read_dataset(INPUT)
+    step = pd.Timedelta(minutes=30) * len(df)
+    df = pd.concat([df.assign(datetime=df["datetime"] + i * step) for i in range(args.scale)], ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, cache = Path(tmp) / "merged.parquet", Path(tmp) / "cache"
+        write_dataset(df, src)
+        print(f"dataset: {len(df):,} rows × {df.shape[1]} cols")
+
+        t_pq, mb_pq, ref = best_of(lambda: read_dataset(src), args.repeat)
+        t0 = time.perf_counter()
+        open_cached(src, cache_dir=cache)
+        t_build = time.perf_counter() - t0
+        t_mm, mb_mm, got = best_of(lambda: open_cached(src, cache_dir=cache), args.repeat)
+        pd.testing.assert_frame_equal(got, ref)
+
+        size = sum(f.stat().st_size for f in cache.iterdir()) / 2**20
+        print(f"{'':<22}{'time':>10}{'private MB':>13}")
+        print(f"{'read_dataset':<22}{t_pq * 1e3:>7.1f} ms{mb_pq:>13.1f}")
+        print(f"{'open_cached (build)':<22}{t_build * 1e3:>7.1f} ms{'':>13}  → {size:.0f} MB cache file")
+        print(f"{'open_cached (warm)':<22}{t_mm * 1e3:>7.1f} ms{mb_mm:>13.1f}")
+        print(f"speed-up ×{t_pq / t_mm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Dashboard redraw: filter-and-plot the full frame vs DashboardData queries.
+
+The merged frame (final_merged_with_regimes.parquet) is tiled --scale times
+to mimic a multi-year history. A "redraw" is what app.py does on every
+widget change: every series over the selected window plus the weekly rollup
+and the window summary. The baseline does the same with a boolean mask,
+a resample and describe() on the DataFrame, plotting every row.
+
+The DashboardData redraw must stay within --budget-ms (default 200 ms, the
+interactive limit); the script exits 1 when it doesn't.
+
+Run from the repo root:
+    python benchmarks/bench_dashboard.py             # ×5 (~75 k rows)
+    python benchmarks/bench_dashboard.py --scale 20 --max-points 1000
+"""
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from gbpower.dashboard import LABELS, ROLLUPS, DashboardData
+from gbpower.data.storage import read_dataset
+
+INPUT = "data/processed/final_merged_with_regimes.parquet"
+
+
+def load(scale: int) -> pd.DataFrame:
+    df = read_dataset(INPUT, columns=["datetime", *LABELS, "regime_flag"])
+    step = pd.Timedelta(minutes=30) * len(df)
+    return pd.concat([df.assign(datetime=df["datetime"] + i * step) for i in range(scale)], ignore_index=True)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--scale", type=int, default=5)
+    p.add_argument("--max-points", type=int, default=2000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--budget-ms", type=float, default=200, help="max DashboardData redraw time")
+    args = p.parse_args(argv)
+
+    df = load(args.scale)
+    cols = [c for c in LABELS if c in df.columns]
+    start, end = df["datetime"].iloc[0], df["datetime"].iloc[-1]
+    print(f"frame: {len(df):,} rows, {len(cols)} series, {start:%Y-%m-%d} → {end:%Y-%m-%d}")
+
+    def baseline():
+        w = df[(df["datetime"] >= start) & (df["datetime"] <= end)]
+        points = sum(len(w[["datetime", c]].dropna()) for c in cols)
+        w.set_index("datetime")[cols].resample(**ROLLUPS["weekly"]).agg(["mean", "min", "max", "std"])
+        w[cols].describe()
+        return points
+
+    t0 = time.perf_counter()
+    data = DashboardData(df, max_points=args.max_points)
+    t_load = time.perf_counter() - t0
+
+    def query():
+        traces = data.series(cols, start, end)
+        data.rollup("weekly", start, end)
+        data.summary(start, end)
+        return sum(len(t) for t in traces.values())
+
+    t_old, t_new = best_of(baseline, args.repeat), best_of(query, args.repeat)
+    print(f"one-off load + rollups : {t_load * 1e3:7.0f} ms")
+    print(f"redraw, full frame     : {t_old * 1e3:7.1f} ms | {baseline():>9,} points to plot")
+    print(f"redraw, DashboardData  : {t_new * 1e3:7.1f} ms | {query():>9,} points to plot")
+    print(f"speed-up ×{t_old / t_new:.1f}")
+    if t_new * 1e3 > args.budget_ms:
+        print(f"❌ redraw {t_new * 1e3:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        return 1
+    print(f"✅ redraw within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
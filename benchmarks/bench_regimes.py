@@ -0,0 +1,78 @@
+"""
+Regime flags: current save_with_regimes path vs the fused compact path.
+
+The feature frame from final_merged_with_regimes.parquet (flag columns
+dropped) is tiled --scale times to mimic a multi-year history. Both paths
+are timed and their peak traced memory measured; flag values are asserted
+equal.
+
+Run from the repo root:
+    python benchmarks/bench_regimes.py               # ×8 (~120 k rows, ~7 years)
+    python benchmarks/bench_regimes.py --scale 20 --threshold-window 1440
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))      # for src.features
+
+from gbpower.data.storage import read_dataset
+from src.features.regime_flags import add_regime_flags
+
+INPUT = "data/processed/final_merged_with_regimes.parquet"
+FLAG_PREFIXES = ("driver_", "is_", "regime_flag", "vol_spread_SBP_vs_MIP", "vol_err_TSD_%")
+
+
+def load(scale: int) -> pd.DataFrame:
+    df = read_dataset(INPUT)
+    df = df.drop(columns=[c for c in df.columns if c.startswith(FLAG_PREFIXES)])
+    step = pd.Timedelta(minutes=30) * len(df)
+    parts = [df.assign(datetime=df["datetime"] + i * step) for i in range(scale)]
+    return pd.concat(parts, ignore_index=True)
+
+
+def measure(fn, repeat: int) -> tuple[float, float, object]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    out = fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return best, peak, out
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--scale", type=int, default=8)
+    p.add_argument("--threshold-window", type=int, default=None)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    df = load(args.scale)
+    in_mb = df.memory_usage(deep=True).sum() / 2**20
+    print(f"input: {len(df):,} rows × {df.shape[1]} cols | {in_mb:,.0f} MB")
+
+    kw = dict(config={}, window=48, threshold_window=args.threshold_window)
+    t_old, m_old, old = measure(lambda: add_regime_flags(df, **kw), args.repeat)
+    t_new, m_new, new = measure(lambda: add_regime_flags(df, compact=True, **kw), args.repeat)
+
+    added = [c for c in old.columns if c not in df.columns or c.startswith("vol_")]
+    pd.testing.assert_frame_equal(new[added].astype({"regime_flag": str}), old[added], check_dtype=False)
+    size = lambda f: f[added].memory_usage(deep=True, index=False).sum() / 2**20
+
+    print(f"{'':<26}{'time':>10}{'peak traced':>14}{'new columns':>14}")
+    print(f"{'current (copy + int64)':<26}{t_old * 1e3:>7.0f} ms{m_old:>11.0f} MB{size(old):>11.1f} MB")
+    print(f"{'compact (fused, no copy)':<26}{t_new * 1e3:>7.0f} ms{m_new:>11.0f} MB{size(new):>11.1f} MB")
+    print(f"speed-up ×{t_old / t_new:.1f} | peak memory ÷{m_old / max(m_new, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Settlement date/period → UTC: legacy per-row expression vs settlement_to_utc.
+
+Run from the repo root:
+    python benchmarks/bench_settlement.py              # bundled SBP/SSP CSV (2019→)
+    python benchmarks/bench_settlement.py --scale 10   # tile it 10× (~1.1 M rows)
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from gbpower.data import settlement
+from gbpower.data.settlement import settlement_to_utc
+
+RAW = "data/raw/sspsbp_20250609.csv"
+
+
+def legacy(dates: pd.Series, periods: pd.Series) -> pd.Series:
+    return (
+        pd.to_datetime(dates, dayfirst=True, utc=True)
+        + pd.to_timedelta((periods.astype(int) - 1) * 30, unit="m")
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--scale", type=int, default=1, help="tile the CSV this many times")
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    raw = pd.read_csv(RAW, encoding="latin-1", usecols=[0, 1])
+    raw = pd.concat([raw] * args.scale, ignore_index=True)
+    dates, periods = raw.iloc[:, 0], raw.iloc[:, 1]
+    print(f"{len(raw):,} rows | {dates.nunique():,} distinct dates")
+
+    t_old = timed(lambda: legacy(dates, periods), args.repeat)
+
+    def cold():
+        settlement._DAY_CACHE.clear()
+        return settlement_to_utc(dates, periods, "%d/%m/%Y")
+
+    t_cold = timed(cold, args.repeat)
+    t_warm = timed(lambda: settlement_to_utc(dates, periods, "%d/%m/%Y"), args.repeat)
+
+    new = settlement_to_utc(dates, periods, "%d/%m/%Y")
+    old = legacy(dates, periods)
+    moved = (pd.DatetimeIndex(old) != new).sum()
+    print(f"{'legacy to_datetime + timedelta':<34}{t_old * 1e3:>9.1f} ms")
+    print(f"{'settlement_to_utc (cold cache)':<34}{t_cold * 1e3:>9.1f} ms  ×{t_old / t_cold:,.1f}")
+    print(f"{'settlement_to_utc (warm cache)':<34}{t_warm * 1e3:>9.1f} ms  ×{t_old / t_warm:,.1f}")
+    print(f"rows re-timed by the DST-aware calendar: {moved:,} ({moved / len(raw):.1%})")
+
+
+if __name__ == "__main__":
+    main()
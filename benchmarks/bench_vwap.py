@@ -0,0 +1,89 @@
+"""
+VWAP / intraday aggregation: legacy groupby paths vs gbpower.data.intraday.
+
+Run from the repo root:
+    python benchmarks/bench_vwap.py            # bundled 2024 + 2025 MID CSVs
+    python benchmarks/bench_vwap.py --repeat 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gbpower.data.intraday import aggregate_trades
+
+RAW_FILES = ["data/raw/0000036990_MID_2024.csv", "data/raw/MID_2025.csv"]
+
+
+def load_mid() -> tuple[pd.DataFrame, str, str]:
+    df = pd.concat([pd.read_csv(f, encoding="latin-1") for f in RAW_FILES], ignore_index=True)
+    date_c = next(c for c in df.columns if "date" in c.lower())
+    sp_c = next(c for c in df.columns if "period" in c.lower())
+    price_c = next(c for c in df.columns if "price" in c.lower())
+    vol_c = next(c for c in df.columns if "volume" in c.lower())
+    df["datetime"] = (
+        pd.to_datetime(df[date_c], dayfirst=True, utc=True)
+        + pd.to_timedelta((df[sp_c].astype(int) - 1) * 30, unit="m")
+    )
+    return df, price_c, vol_c
+
+
+# ── legacy implementations (as they were in merging.py / intraday_processor.py)
+def legacy_compute_vwap(df, price, vol):
+    return (
+        df.groupby("datetime", group_keys=False)[[price, vol]]
+        .apply(lambda g: np.average(g[price], weights=g[vol]) if g[vol].sum() else np.nan)
+        .rename("mip_price")
+        .reset_index()
+    )
+
+
+def legacy_processor_agg(df, price_c, vol_c):
+    with np.errstate(invalid="ignore"):
+        return df.groupby("datetime").agg(
+            vwap_price=(price_c, lambda x: (x * df.loc[x.index, vol_c]).sum() / df.loc[x.index, vol_c].sum()),
+            mean_price=(price_c, "mean"),
+            min_price=(price_c, "min"),
+            max_price=(price_c, "max"),
+            std_price=(price_c, "std"),
+            total_volume=(vol_c, "sum"),
+        ).reset_index()
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    df, price_c, vol_c = load_mid()
+    print(f"MID trades: {len(df):,} rows | {df['datetime'].nunique():,} periods")
+
+    t_old_vwap, old_vwap = best_of(lambda: legacy_compute_vwap(df, price_c, vol_c), args.repeat)
+    t_old_agg, old_agg = best_of(lambda: legacy_processor_agg(df, price_c, vol_c), args.repeat)
+    t_new, new = best_of(lambda: aggregate_trades(df, price_c, vol_c), args.repeat)
+
+    # sanity: same numbers as the legacy paths
+    np.testing.assert_allclose(new["vwap_price"], old_vwap["mip_price"], rtol=1e-9, equal_nan=True)
+    for c in ["mean_price", "min_price", "max_price", "std_price", "total_volume"]:
+        np.testing.assert_allclose(new[c], old_agg[c], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    print(f"{'legacy compute_vwap':<28}{t_old_vwap * 1e3:>10.1f} ms")
+    print(f"{'legacy processor agg':<28}{t_old_agg * 1e3:>10.1f} ms")
+    print(f"{'aggregate_trades':<28}{t_new * 1e3:>10.1f} ms")
+    print(f"speed-up vs compute_vwap : ×{t_old_vwap / t_new:,.0f}")
+    print(f"speed-up vs processor agg: ×{t_old_agg / t_new:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
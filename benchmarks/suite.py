@@ -0,0 +1,178 @@
+"""
+Benchmark suite for the hot paths, on synthetic GB market data.
+
+Cases (each timed --repeat times on the same inputs):
+    compute_vwap        merging.compute_vwap on the MID trades
+    merge_join          merging.join_sources on the normalised sources
+    regime_flags        add_regime_flags(window=48), default path
+    regime_flags_compact  add_regime_flags(window=48, compact=True)
+    detect_events       detect_extreme_events with config/detection.yml
+    annotate            annotate_df with the detected event log
+
+Every run writes one JSON file (commit, versions, scale, per-case timings),
+so results from different commits can be compared offline.
+
+Run from the repo root, as a module (radar.*, src.* and benchmarks.* then
+import from the working directory):
+    python -m benchmarks.suite                         # 1 year, 2 providers
+    python -m benchmarks.suite --scale 10y --providers 4 --repeat 3
+    python -m benchmarks.suite --only compute_vwap merge_join
+    python -m benchmarks.suite --compare old.json new.json [--threshold 1.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic import SCALES, make_features, make_sources
+from gbpower.events.annotate import annotate_df
+from gbpower.events.detection import detect_extreme_events
+from radar.utils import merging
+from src.features.regime_flags import add_regime_flags
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RESULTS = ROOT / "benchmarks" / "results"
+CONFIG = ROOT / "config" / "detection.yml"
+
+
+# ───────────────────── cases ─────────────────────
+def build_cases(sources: dict[str, pd.DataFrame]) -> dict[str, tuple[object, int]]:
+    """{name: (zero-argument callable, input rows)}; inputs are prepared once, outside the timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        normalised = dict(sources)
+        merging.normalise_columns(normalised)
+        features = make_features(sources)
+    base = features.drop(columns=[c for c in features.columns
+                                  if c.startswith(("driver_", "is_", "vol_")) or c == "regime_flag"])
+    base = base.assign(regime_flag=features["regime_flag"].astype(str))
+    log = detect_extreme_events(features, CONFIG)
+    trades = sources["INTRADAY"]
+    return {
+        "compute_vwap": (lambda: merging.compute_vwap(trades), len(trades)),
+        "merge_join": (lambda: merging.join_sources(normalised), sum(len(d) for d in normalised.values())),
+        "regime_flags": (lambda: add_regime_flags(base, config={}, window=48), len(base)),
+        "regime_flags_compact": (lambda: add_regime_flags(base, config={}, window=48, compact=True), len(base)),
+        "detect_events": (lambda: detect_extreme_events(features, CONFIG), len(features)),
+        "annotate": (lambda: annotate_df(features, log), len(features)),
+    }
+
+
+def time_case(fn, repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+# ───────────────────── results ─────────────────────
+def git_commit() -> tuple[str | None, bool]:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    try:
+        return git("rev-parse", "HEAD") or None, bool(git("status", "--porcelain", "--untracked-files=no"))
+    except OSError:
+        return None, False
+
+
+def run_suite(months: int, providers: int, repeat: int, only: list[str] | None = None, seed: int = 0) -> dict:
+    t0 = time.perf_counter()
+    cases = build_cases(make_sources(months, providers=providers, seed=seed))
+    setup = time.perf_counter() - t0
+    unknown = set(only or []) - set(cases)
+    if unknown:
+        raise KeyError(f"unknown case(s): {sorted(unknown)}")
+
+    results = {}
+    for name, (fn, rows) in cases.items():
+        if only and name not in only:
+            continue
+        runs = time_case(fn, repeat)
+        results[name] = {"rows": rows, "best_s": min(runs), "median_s": statistics.median(runs), "runs": runs}
+        print(f"{name:<22}{rows:>11,} rows {min(runs) * 1e3:>10.1f} ms best {statistics.median(runs) * 1e3:>10.1f} ms median")
+
+    commit, dirty = git_commit()
+    return {
+        "meta": {
+            "commit": commit, "dirty": dirty,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": platform.node(), "platform": platform.platform(), "python": platform.python_version(),
+            "numpy": np.__version__, "pandas": pd.__version__, "pyarrow": pa.__version__,
+            "months": months, "providers": providers, "repeat": repeat, "seed": seed, "setup_s": setup,
+        },
+        "results": results,
+    }
+
+
+def save(report: dict, outdir: Path, label: str) -> Path:
+    meta = report["meta"]
+    stamp = meta["date"].replace(":", "").replace("-", "")[:15]
+    sha = (meta["commit"] or "nogit")[:8] + ("-dirty" if meta["dirty"] else "")
+    path = Path(outdir) / f"{stamp}-{sha}-{label}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=1))
+    return path
+
+
+def compare(old_path: Path, new_path: Path, threshold: float = 1.2) -> int:
+    """Print new/old best-time ratios; 1 if any case got slower than *threshold*×."""
+    old, new = (json.loads(Path(p).read_text()) for p in (old_path, new_path))
+    for key in ("months", "providers"):
+        if old["meta"][key] != new["meta"][key]:
+            print(f"⚠️  {key} differs: {old['meta'][key]} vs {new['meta'][key]}")
+    print(f"{'case':<22}{'old ms':>10}{'new ms':>10}{'ratio':>8}")
+    slower = []
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        if name not in old["results"] or name not in new["results"]:
+            print(f"{name:<22}{'(only in one run)':>28}")
+            continue
+        a, b = old["results"][name]["best_s"], new["results"][name]["best_s"]
+        ratio = b / a
+        flag = "  ⚠️ slower" if ratio > threshold else ("  ✓ faster" if ratio < 1 / threshold else "")
+        print(f"{name:<22}{a * 1e3:>10.1f}{b * 1e3:>10.1f}{ratio:>8.2f}{flag}")
+        if ratio > threshold:
+            slower.append(name)
+    return 1 if slower else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--scale", default="1y", help=f"history length: {', '.join(SCALES)} or N months")
+    p.add_argument("--providers", type=int, default=2, help="MID data providers")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--only", nargs="+", metavar="CASE")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--outdir", default=str(RESULTS), help="where the JSON result goes (default: %(default)s)")
+    p.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    p.add_argument("--threshold", type=float, default=1.2, help="slow-down ratio flagged by --compare")
+    args = p.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, threshold=args.threshold)
+
+    months = SCALES.get(args.scale) or int(args.scale.removesuffix("m"))
+    print(f"📊 {months} months × {args.providers} providers, best of {args.repeat}")
+    report = run_suite(months, args.providers, args.repeat, args.only, args.seed)
+    path = save(report, args.outdir, f"{months}m-{args.providers}p")
+    print(f"💾 {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Synthetic GB market tables shaped like data/processed, at any scale.
+
+• INTRADAY   – MID trades, one row per provider per half-hour (APX carries
+               the volume, N2EX mostly reports zero, like the real feed)
+• IMBALANCE  – single cash-out price (SBP = SSP), NIV, fat-tailed spikes
+• DEMAND     – actual ND/TSD with daily and seasonal shape, embedded wind
+               and solar
+• FORECAST   – day-ahead TSD/ND forecast = actual + autocorrelated error
+
+Columns, dtypes and names match the processed parquet files, so every
+pipeline step runs on them unchanged. ``make_features`` adds the notebook
+features (spreads, forecast errors, cash-out cost, regime flags) on top of
+the merged table for the event/regime benchmarks.
+
+Usage:
+    >>> from benchmarks.synthetic import make_sources, make_features
+    >>> src = make_sources(months=120, providers=3)      # 10 years
+    >>> feats = make_features(src)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from radar.utils import merging                 # repo root must be on sys.path
+from src.features.regime_flags import add_regime_flags
+
+PROVIDERS = ["APXMIDP", "N2EXMIDP"]
+SCALES = {"1m": 1, "1y": 12, "5y": 60, "10y": 120}
+
+
+def _ar1(rng, n: int, phi: float, sigma: float) -> np.ndarray:
+    """AR(1) noise: x[t] = phi·x[t-1] + N(0, sigma)."""
+    out, prev = [], 0.0
+    for e in rng.normal(0, sigma, n).tolist():
+        prev = phi * prev + e
+        out.append(prev)
+    return np.asarray(out)
+
+
+def _grid(start: str, months: int) -> pd.DatetimeIndex:
+    t0 = pd.Timestamp(start, tz="UTC")
+    return pd.date_range(t0, t0 + pd.DateOffset(months=months), freq="30min", tz="UTC", inclusive="left")
+
+
+def make_sources(
+    months: int = 12,
+    start: str = "2019-01-01",
+    providers: int = 2,
+    seed: int = 0,
+) -> dict[str, pd.DataFrame]:
+    """INTRADAY, IMBALANCE, DEMAND and FORECAST frames covering *months* months."""
+    rng = np.random.default_rng(seed)
+    dt = _grid(start, months)
+    n = len(dt)
+    hour = (dt.hour + dt.minute / 60).to_numpy()
+    doy = dt.dayofyear.to_numpy()
+    period = (hour * 2).astype("int64") + 1
+    daily = np.sin((hour - 7) / 24 * 2 * np.pi)
+    season = np.cos((doy - 15) / 365.25 * 2 * np.pi)
+
+    # ── demand
+    tsd = 27_000 + 5_500 * daily + 5_000 * season + _ar1(rng, n, 0.98, 120)
+    solar = np.clip(np.sin((hour - 6) / 12 * np.pi), 0, None) * (6_000 + 4_000 * -season) * rng.uniform(0.3, 1, n)
+    wind = np.clip(3_000 + _ar1(rng, n, 0.995, 150), 0, 6_500)
+    demand = pd.DataFrame({
+        "SETTLEMENT_DATE": dt.tz_localize(None).normalize(),
+        "SETTLEMENT_PERIOD": period,
+        "ND": (tsd - 1_800).astype("int64"),
+        "TSD": tsd.astype("int64"),
+        "EMBEDDED_WIND_GENERATION": wind.astype("int64"),
+        "EMBEDDED_SOLAR_GENERATION": solar.astype("int64"),
+        "datetime": dt,
+    })
+
+    # ── day-ahead forecast
+    err = _ar1(rng, n, 0.97, 180)
+    forecast = pd.DataFrame({
+        "settlementPeriod": period,
+        "boundary": "N",
+        "transmissionSystemDemand": (tsd + err).astype("int64"),
+        "nationalDemand": np.round(tsd - 1_800 + err, -2),
+        "datetime": dt,
+    })
+
+    # ── imbalance: one cash-out price following NIV, with rare fat-tailed spikes
+    niv = _ar1(rng, n, 0.9, 150)
+    base = 55 + 25 * daily + 15 * season + _ar1(rng, n, 0.99, 2.5)
+    spikes = np.where(rng.random(n) < 0.01, rng.standard_t(2, n) * 80, 0.0)
+    price = np.round(base + 0.04 * niv + rng.standard_t(4, n) * 8 + spikes, 2)
+    imbalance = pd.DataFrame({
+        "Settlement Period": period,
+        "System Sell Price(GBP/MWh)": price,
+        "System Buy Price(GBP/MWh)": price,
+        "Net Imbalance Volume(MWh)": np.round(niv, 3),
+        "datetime": dt,
+        "sbp": price,
+        "ssp": price,
+        "niv": np.round(niv, 3),
+    })
+
+    # ── MID trades: APX carries the volume; other providers mostly report zero
+    names = (PROVIDERS + [f"MIDP{i}" for i in range(3, providers + 1)])[:providers]
+    mid = base + rng.normal(0, 4, n)
+    rows = []
+    for i, name in enumerate(names):
+        live = rng.random(n) < (1.0 if i == 0 else 0.05)
+        vol = np.where(live, rng.lognormal(6.3, 0.4, n), 0.0)
+        rows.append(pd.DataFrame({
+            "Settlement Period": period,
+            "Market Index Data Provider Id": name,
+            "Market Index Volume (MWh)": np.round(vol, 1),
+            "Market Index Price (£/MWh)": np.where(live, np.round(mid + rng.normal(0, 1, n), 2), 0.0),
+            "datetime": dt,
+        }))
+    intraday = pd.concat(rows, ignore_index=True).sort_values("datetime", kind="stable", ignore_index=True)
+
+    return {"INTRADAY": intraday, "IMBALANCE": imbalance, "DEMAND": demand, "FORECAST": forecast}
+
+
+def make_features(sources: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Merged table + the notebook features + regime flags, as in final_merged_with_regimes."""
+    dfs = dict(sources)
+    merging.normalise_columns(dfs)
+    df = merging.join_sources(dfs).reset_index()
+    df["err_TSD_MW"] = df["forecast_TSD"] - df["TSD"]
+    df["err_TSD_%"] = df["err_TSD_MW"] / df["TSD"]
+    df["cashout_cost_GBP"] = np.where(df["niv"] > 0, df["niv"] * df["sbp"], df["niv"] * df["ssp"])
+    df["spread_SBP_vs_MIP"] = df["sbp"] - df["mip_price"]
+    df["spread_MIP_vs_SSP"] = df["mip_price"] - df["ssp"]
+    return add_regime_flags(df, config={}, window=48, compact=True)
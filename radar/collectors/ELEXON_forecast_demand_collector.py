@@ -2,28 +2,48 @@
 Scalable BMRS National Demand Forecast downloader (all columns)
 ===============================================================
 • Endpoint : /forecast/demand/day-ahead/latest
-• Strategy : 7-day chunks with retries & polite pacing
+• Strategy : 7-day chunks fetched by a bounded thread pool over one pooled
+             session, token-bucket rate limit, retries with exponential
+             backoff + jitter, atomic chunk writes (a killed backfill resumes
+             from the chunks already on disk)
+• Convert  : each JSON chunk is parsed once into a cached parquet fragment
+             (keyed by file name + mtime); the output is assembled by
+             streaming fragments through the parquet writer
 • Outputs  :
     - weekly JSON in  data/raw/forecast/
+    - fragments   in  data/interim/forecast/
     - full parquet  in data/processed/demand_forecast.parquet
 """
 
 from __future__ import annotations
 import os, json, time, requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 from pathlib import Path
 from dateutil.parser import parse as dtparse
 from tqdm import tqdm
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from gbpower.data.http import TokenBucket, atomic_write, backoff_delay
+from gbpower.data.settlement import settlement_to_utc
+from gbpower.data.storage import write_batches
 
 # ─── Config ────────────────────────────────────────────────────
 START_DATE  = "2024-01-01"
 END_DATE    = "2025-05-01"
 CHUNK_DAYS  = 7          # BMRS limit
-PAUSE_S     = 1.0        # polite pause between calls
-MAX_RETRY   = 3
+WORKERS     = 4          # concurrent requests
+RATE_PER_S  = 2.0        # polite average request rate (token bucket) …
+BURST       = 2          # … with this many back-to-back calls allowed
+MAX_RETRY   = 5
+BACKOFF_S   = 1.0        # first retry waits U(0, 1 s), then U(0, 2 s), …
+BACKOFF_CAP = 30.0
 RAW_DIR     = Path("data/raw/forecast")
+FRAG_DIR    = Path("data/interim/forecast")
 OUT_PARQUET = Path("data/processed/demand_forecast.parquet")
 
 load_dotenv()
@@ -33,68 +53,179 @@ BASE_URL = "https://data.elexon.co.uk/bmrs/api/v1/forecast/demand/day-ahead/late
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 OUT_PARQUET.parent.mkdir(parents=True, exist_ok=True)
 
-# ─── Fetch helper ──────────────────────────────────────────────
-def fetch_chunk(d_from: date, d_to: date, retries: int = MAX_RETRY) -> dict:
-    params  = {"from": d_from.isoformat(), "to": d_to.isoformat(), "format": "json"}
-    headers = {"apikey": API_KEY} if API_KEY else {}
+# ─── Fetch helpers ─────────────────────────────────────────────
+def make_session(workers: int = WORKERS) -> requests.Session:
+    """One keep-alive connection pool shared by all worker threads."""
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    if API_KEY:
+        sess.headers["apikey"] = API_KEY
+    return sess
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, ValueError))
+
+
+def fetch_chunk(
+    d_from: date,
+    d_to: date,
+    retries: int = MAX_RETRY,
+    session: requests.Session | None = None,
+    bucket: TokenBucket | None = None,
+    url: str = BASE_URL,
+    backoff: float = BACKOFF_S,
+) -> dict:
+    params = {"from": d_from.isoformat(), "to": d_to.isoformat(), "format": "json"}
+    session = session or make_session(1)
     for attempt in range(1, retries + 1):
+        if bucket is not None:
+            bucket.acquire()
         try:
-            r = requests.get(BASE_URL, params=params, headers=headers, timeout=60)
+            r = session.get(url, params=params, timeout=60)
             r.raise_for_status()
             return r.json()
         except Exception as e:
-            if attempt == retries:
+            if attempt == retries or not _retryable(e):
                 raise
-            print(f"   ⚠️  {d_from}–{d_to} attempt {attempt}/{retries} failed: {e}")
-            time.sleep(5)
+            wait = backoff_delay(attempt, backoff, BACKOFF_CAP)
+            tqdm.write(f"   ⚠️  {d_from}–{d_to} attempt {attempt}/{retries} failed: {e} (retry in {wait:.1f}s)")
+            time.sleep(wait)
+
+
+def chunk_plan(d_start: date, d_end: date, raw_dir: Path = RAW_DIR) -> list[tuple[date, date, Path]]:
+    plan, cur = [], d_start
+    while cur <= d_end:
+        d_to = min(cur + timedelta(days=CHUNK_DAYS - 1), d_end)
+        plan.append((cur, d_to, raw_dir / f"forecast_{cur:%Y%m%d}_{d_to:%Y%m%d}.json"))
+        cur += timedelta(days=CHUNK_DAYS)
+    return plan
+
+
+def download_chunks(
+    plan: list[tuple[date, date, Path]],
+    workers: int = WORKERS,
+    rate: float = RATE_PER_S,
+    burst: int = BURST,
+    url: str = BASE_URL,
+    backoff: float = BACKOFF_S,
+) -> list[Path]:
+    """Fetch every chunk in *plan* whose file is missing; return all chunk paths."""
+    todo = [(a, b, f) for a, b, f in plan if not f.exists()]
+    if todo:
+        session = make_session(workers)
+        bucket = TokenBucket(rate, burst)
+
+        def _one(d_from: date, d_to: date, fname: Path) -> Path:
+            data = fetch_chunk(d_from, d_to, session=session, bucket=bucket, url=url, backoff=backoff)
+            return atomic_write(fname, json.dumps(data))
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool, \
+             tqdm(total=len(plan), initial=len(plan) - len(todo), unit="chunk") as bar:
+            futures = [pool.submit(_one, *job) for job in todo]
+            for fut in as_completed(futures):
+                fut.result()                        # re-raise the first hard failure
+                bar.update(1)
+    return [f for _, _, f in plan]
+
+# ─── Conversion helpers ────────────────────────────────────────
+KEY_COLS = ["datetime", "boundary"]
+
+
+def parse_chunk(fp: Path) -> pd.DataFrame | None:
+    """One weekly JSON → tidy frame (deduped, datetime-sorted); None if empty."""
+    rows = json.loads(fp.read_text(encoding="utf-8")).get("data", [])
+    if not rows:
+        return None
+    df = pd.DataFrame(rows)
+    # build UTC datetime (DST-aware settlement calendar)
+    df["datetime"] = settlement_to_utc(df["settlementDate"], df["settlementPeriod"], "%Y-%m-%d")
+    # cast numeric demand cols
+    for col in ("transmissionSystemDemand", "nationalDemand"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return (df.drop_duplicates(subset=KEY_COLS)
+              .sort_values("datetime", kind="stable", ignore_index=True))
+
+
+def fragment_for(fp: Path, frag_dir: Path | None = None) -> Path | None:
+    """
+    Cached parquet fragment of chunk *fp* in *frag_dir* (default ``FRAG_DIR``),
+    converting it only if the chunk is new or its mtime changed. Chunks
+    without rows leave an ``.empty`` marker.
+    """
+    frag_dir = Path(frag_dir or FRAG_DIR)
+    frag_dir.mkdir(parents=True, exist_ok=True)
+    key = f"{fp.stem}-{fp.stat().st_mtime_ns}"
+    frag, empty = frag_dir / f"{key}.parquet", frag_dir / f"{key}.empty"
+    if frag.exists():
+        return frag
+    if empty.exists():
+        return None
+
+    for stale in frag_dir.glob(f"{fp.stem}-*"):
+        stale.unlink()
+    df = parse_chunk(fp)
+    if df is None:
+        empty.touch()
+        return None
+    tmp = frag.with_name(f".{frag.name}.tmp")
+    df.to_parquet(tmp, index=False)
+    tmp.replace(frag)
+    return frag
+
+
+def stream_fragments(frags: list[Path], schema: pa.Schema):
+    """
+    Yield record batches of the fragments in order, cast to *schema*.
+
+    Rows repeating a (datetime, boundary) key already seen in the previous
+    fragment are dropped – chunks only overlap at their edges – so memory
+    stays at one fragment.
+    """
+    prev_keys = pd.MultiIndex.from_arrays([[], []], names=KEY_COLS)
+    for frag in frags:
+        df = pd.read_parquet(frag)
+        keys = pd.MultiIndex.from_frame(df[KEY_COLS])
+        df = df[~keys.isin(prev_keys)]
+        prev_keys = keys
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        cols = [
+            table.column(f.name) if f.name in table.schema.names else pa.nulls(len(table), f.type)
+            for f in schema
+        ]
+        yield from pa.Table.from_arrays(cols, names=schema.names).cast(schema).to_batches()
+
 
 # ─── Main routine ──────────────────────────────────────────────
-def main(start=START_DATE, end=END_DATE):
+def main(start=START_DATE, end=END_DATE, workers=WORKERS):
     d_start, d_end = dtparse(start).date(), dtparse(end).date()
-    cur = d_start
-    files: list[Path] = []
-
-    total_chunks = ((d_end - d_start).days // CHUNK_DAYS) + 1
-    with tqdm(total=total_chunks, unit="chunk") as bar:
-        while cur <= d_end:
-            d_to   = min(cur + timedelta(days=CHUNK_DAYS - 1), d_end)
-            fname  = RAW_DIR / f"forecast_{cur:%Y%m%d}_{d_to:%Y%m%d}.json"
-
-            if not fname.exists():                         # download if missing
-                data = fetch_chunk(cur, d_to)
-                fname.write_text(json.dumps(data), encoding="utf-8")
-                time.sleep(PAUSE_S)
-            files.append(fname)
-            cur += timedelta(days=CHUNK_DAYS)
-            bar.update(1)
-
-    # ── Parse & concat ─────────────────────────────────────────
-    frames = []
-    for fp in files:
-        rows = json.loads(fp.read_text(encoding="utf-8")).get("data", [])
-        if not rows:
-            continue
-        df = pd.DataFrame(rows)
-        # build UTC datetime
-        df["datetime"] = (
-            pd.to_datetime(df["settlementDate"], utc=True)
-            + pd.to_timedelta((df["settlementPeriod"].astype(int) - 1) * 30, unit="m")
-        )
-        # cast numeric demand cols
-        for col in ("transmissionSystemDemand", "nationalDemand"):
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-        frames.append(df)
-
-    if not frames:
+    files = download_chunks(chunk_plan(d_start, d_end), workers=workers)
+
+    # ── Convert (cached) & stream ──────────────────────────────
+    frags = [f for f in (fragment_for(fp) for fp in files) if f is not None]
+    if not frags:
         raise SystemExit("❌  No data rows parsed.")
 
-    tidy = (pd.concat(frames, ignore_index=True)
-              .drop_duplicates(subset=["datetime", "boundary"])
-              .sort_values("datetime"))
+    # one schema for all fragments (e.g. int chunks widen to float)
+    schema = pa.unify_schemas(
+        [pq.read_schema(f) for f in frags], promote_options="permissive"
+    ).with_metadata(None)
+    counted = 0
+
+    def _batches():
+        nonlocal counted
+        for b in stream_fragments(frags, schema):
+            counted += b.num_rows
+            yield b
 
-    tidy.to_parquet(OUT_PARQUET, index=False)
-    print(f"✓ Saved {len(tidy):,} rows → {OUT_PARQUET}")
+    write_batches(_batches(), schema, OUT_PARQUET)
+    print(f"✓ Saved {counted:,} rows → {OUT_PARQUET}")
 
 # ───────────────────────────────────────────────────────────────
 if __name__ == "__main__":
@@ -1,34 +1,37 @@
 import pandas as pd
 import os
 
-def load_and_parse_data():
-    # Set project root directory
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-    # Load raw forecast CSV
-    df = pd.read_csv(os.path.join(project_root, "data", "raw", "archive_1dayahead.csv"))
-    print(f"Loaded {len(df):,} rows with columns: {df.columns.tolist()}")
+from gbpower.data.ingest import MW_DTYPE, read_csv_window
+from gbpower.data.settlement import clock_to_period, settlement_to_utc
+from gbpower.data.storage import write_dataset
 
-    # Parse TARGETDATE
-    df['TARGETDATE'] = pd.to_datetime(df['TARGETDATE'], errors='coerce')
+# Filter window
+START = pd.Timestamp("2024-01-01T00:00:00Z")
+END = pd.Timestamp("2025-05-01T00:00:00Z")
 
-    # Convert CP_ST_TIME (minutes from midnight) to a timedelta
-    df['minutes'] = (df['CP_ST_TIME'].astype(int) - 1) * 30
+def load_and_parse_data(start=START, end=END):
+    # Set project root directory
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Load raw forecast CSV: only the columns we use, window applied while streaming
+    df = read_csv_window(
+        os.path.join(project_root, "data", "raw", "archive_1dayahead.csv"),
+        date_col="TARGETDATE",
+        date_format="%Y-%m-%d",
+        usecols=["FORECASTDEMAND", "CP_ST_TIME"],
+        dtypes={"FORECASTDEMAND": MW_DTYPE, "CP_ST_TIME": "int16"},
+        start=start,
+        end=end,
+    )
+    print(f"Loaded {len(df):,} rows with columns: {df.columns.tolist()}")
 
-    # Build naive datetime, then localize directly to UTC
-    df['datetime'] = df['TARGETDATE'] + pd.to_timedelta(df['minutes'], unit='m')
-    df['datetime'] = df['datetime'].dt.tz_localize('UTC')
+    # CP_ST_TIME is the local (Europe/London) HHMM start time: turn it into a
+    # settlement date + period, then to UTC
+    df['datetime'] = settlement_to_utc(*clock_to_period(df['TARGETDATE'], df['CP_ST_TIME']))
 
-    # Cleanup
-    df.drop(columns=['minutes'], inplace=True)
-    
     return df
 
-def filter_data(df):
-    # Define filter window
-    start = pd.Timestamp("2024-01-01T00:00:00Z")
-    end = pd.Timestamp("2025-05-01T00:00:00Z")
-
+def filter_data(df, start=START, end=END):
     # Filter
     df_filt = df[(df['datetime'] >= start) & (df['datetime'] < end)].copy()
 
@@ -66,7 +69,7 @@ def clean_and_save(df):
 
     # Save
     out = "data/processed/da_demand_forecast.parquet"
-    df_clean.to_parquet(out, index=False)
+    write_dataset(df_clean, out)
     print(f"✅ Saved cleaned forecast to {out}")
 
 def main():
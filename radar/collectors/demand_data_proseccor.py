@@ -2,29 +2,32 @@
 import pandas as pd
 from pathlib import Path
 
+from gbpower.data.ingest import MW_DTYPE, SP_DTYPE, read_csv_window
+from gbpower.data.settlement import settlement_to_utc
+from gbpower.data.storage import write_dataset
+
 # === CONFIG ===
 RAW_2024 = Path("data/raw/demanddata_2024.csv")
 RAW_2025 = Path("data/raw/demanddata_2025.csv")
 OUT_MERGED = Path("data/processed/forecast_actual.parquet")
 
-# === LOAD ===
-df_2024 = pd.read_csv(RAW_2024)
-df_2025 = pd.read_csv(RAW_2025)
+# === LOAD (explicit date formats, compact dtypes) ===
+def load(path: Path, date_format: str) -> pd.DataFrame:
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: MW_DTYPE for c in header if c not in ("SETTLEMENT_DATE", "SETTLEMENT_PERIOD")}
+    dtypes["SETTLEMENT_PERIOD"] = SP_DTYPE
+    return read_csv_window(path, date_col="SETTLEMENT_DATE", date_format=date_format, dtypes=dtypes)
 
-# === DATE FORMAT FIX ===
-df_2024["SETTLEMENT_DATE"] = pd.to_datetime(df_2024["SETTLEMENT_DATE"], format="%d-%b-%Y")
-df_2025["SETTLEMENT_DATE"] = pd.to_datetime(df_2025["SETTLEMENT_DATE"], format="%Y-%m-%d")
+df_2024 = load(RAW_2024, "%d-%b-%Y")
+df_2025 = load(RAW_2025, "%Y-%m-%d")
 
 # === CONCATENATE ===
 df = pd.concat([df_2024, df_2025], ignore_index=True)
 
 # === ADD DATETIME ===
-df["datetime"] = (
-    pd.to_datetime(df["SETTLEMENT_DATE"], utc=True) +
-    pd.to_timedelta((df["SETTLEMENT_PERIOD"].astype(int) - 1) * 30, unit="m")
-)
+df["datetime"] = settlement_to_utc(df["SETTLEMENT_DATE"], df["SETTLEMENT_PERIOD"])
 
 # === SAVE ===
 OUT_MERGED.parent.mkdir(parents=True, exist_ok=True)
-df.to_parquet(OUT_MERGED, index=False)
+write_dataset(df, OUT_MERGED)
 print(f"✅ Saved merged forecast/actual file to {OUT_MERGED}")
@@ -12,31 +12,40 @@ from pathlib import Path
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter, Retry
 
+from gbpower.data.ingest import PRICE_DTYPE, SP_DTYPE, find_columns, read_csv_window
+from gbpower.data.settlement import settlement_to_utc
+from gbpower.data.storage import write_dataset
+
 # ── Config ─────────────────────────────────────
-load_dotenv()
-KEY = os.getenv("ELEXON_SCRIPT_KEY")
-if not KEY or len(KEY) != 15:
-    sys.exit("❌ ELEXON_SCRIPT_KEY missing or wrong length (15 chars)")
+RAW = Path("data/raw")
+PROC = Path("data/processed")
 
-RAW = Path("data/raw"); RAW.mkdir(parents=True, exist_ok=True)
-PROC = Path("data/processed"); PROC.mkdir(parents=True, exist_ok=True)
+URL = "https://downloads.elexonportal.co.uk/file/download/SSPSBPNIV_FILE?key={key}"
 
-URL = f"https://downloads.elexonportal.co.uk/file/download/SSPSBPNIV_FILE?key={KEY}"
+def script_key() -> str:
+    """ELEXON_SCRIPT_KEY from the environment / .env (checked when a download is needed, not on import)."""
+    load_dotenv()
+    key = os.getenv("ELEXON_SCRIPT_KEY")
+    if not key or len(key) != 15:
+        sys.exit("❌ ELEXON_SCRIPT_KEY missing or wrong length (15 chars)")
+    return key
 
 def download_sbpssp() -> Path:
     """Download latest SSPSBPNIV CSV from Elexon portal with scripting key (cache <24h)."""
+    RAW.mkdir(parents=True, exist_ok=True)
     today = datetime.now(timezone.utc).strftime("%Y%m%d")
     raw_path = RAW / f"sspsbp_{today}.csv"
     if raw_path.exists() and (time.time() - raw_path.stat().st_mtime) < 86400:
         print(f"✓ Using cached copy: {raw_path}")
         return raw_path
+    url = URL.format(key=script_key())
 
     sess = requests.Session()
     retries = Retry(total=5, backoff_factor=1, status_forcelist=[500,502,503,504], allowed_methods=["GET"])
     sess.mount("https://", HTTPAdapter(max_retries=retries))
 
-    print(f"\nFetching SBP/SSP from Portal → {URL}")
-    r = sess.get(URL, timeout=(10,300))
+    print(f"\nFetching SBP/SSP from Portal → {URL.format(key='…')}")
+    r = sess.get(url, timeout=(10,300))
     r.raise_for_status()
     if b"Scripting Error" in r.content[:100] or not r.content.strip():
         raise RuntimeError("⚠️ Portal returned error or empty SBP/SSP file")
@@ -47,20 +56,21 @@ def download_sbpssp() -> Path:
 
 def tidy(raw_csv: Path, start_date=None, end_date=None) -> pd.DataFrame:
     """Process raw SBP/SSP/NIV CSV into clean Parquet."""
-    df = pd.read_csv(raw_csv, encoding="latin-1")
-
     # Robust column name detection
-    date_c = next(c for c in df.columns if "date" in c.lower())
-    sp_c   = next(c for c in df.columns if "period" in c.lower())
-    sbp_c  = next(c for c in df.columns if "buy price" in c.lower())
-    ssp_c  = next(c for c in df.columns if "sell price" in c.lower())
-    niv_c  = next(c for c in df.columns if "net imbalance volume" in c.lower())
+    cols = find_columns(raw_csv, encoding="latin-1", date="date", sp="period",
+                        sbp="buy price", ssp="sell price", niv="net imbalance volume")
+    date_c, sp_c, sbp_c, ssp_c, niv_c = (cols[k] for k in ("date", "sp", "sbp", "ssp", "niv"))
 
-    # Add datetime and convert numeric columns while keeping all original columns
-    df["datetime"] = (
-        pd.to_datetime(df[date_c], dayfirst=True, utc=True) +
-        pd.to_timedelta((df[sp_c].astype(int)-1)*30, unit="m")
+    # Stream the CSV (history goes back to 2019) keeping only the date window
+    windowed = bool(start_date and end_date)
+    df = read_csv_window(
+        raw_csv, date_col=date_c, date_format="%d/%m/%Y", encoding="latin-1",
+        dtypes={sp_c: SP_DTYPE, sbp_c: PRICE_DTYPE, ssp_c: PRICE_DTYPE, niv_c: PRICE_DTYPE},
+        start=start_date if windowed else None, end=end_date if windowed else None,
     )
+
+    # Add datetime and convert numeric columns while keeping all original columns
+    df["datetime"] = settlement_to_utc(df[date_c], df[sp_c])
     df["sbp"] = pd.to_numeric(df[sbp_c], errors="coerce")
     df["ssp"] = pd.to_numeric(df[ssp_c], errors="coerce")
     df["niv"] = pd.to_numeric(df[niv_c], errors="coerce")
@@ -79,8 +89,9 @@ def main(start_date="2024-01-01", end_date="2025-05-31"):
     clean = tidy(raw, start_date, end_date)
     if clean.empty:
         sys.exit("❌ No SBP/SSP data in the requested range!")
+    PROC.mkdir(parents=True, exist_ok=True)
     out = PROC / "imbalance_prices.parquet"
-    clean.to_parquet(out, index=False)
+    write_dataset(clean, out)
     print(f" SBP/SSP range: {clean['datetime'].min()} → {clean['datetime'].max()}")
     print(f"Settlement periods: {len(clean):,}")
     print(f" Saved → {out}")
@@ -1,6 +1,11 @@
 import pandas as pd
 from pathlib import Path
 
+from gbpower.data.ingest import PRICE_DTYPE, SP_DTYPE, find_columns, read_csv_window
+from gbpower.data.intraday import aggregate_trades
+from gbpower.data.settlement import settlement_to_utc
+from gbpower.data.storage import write_dataset
+
 # === CONFIG: List all raw MID files you want to process ===
 RAW_FILES = [
     "data/raw/0000036990_MID_2024.csv",   # 2024 file
@@ -9,26 +14,24 @@ RAW_FILES = [
 RAW_OUT  = "data/processed/intraday_trades_raw.parquet"
 PROC_OUT = "data/processed/intraday_prices.parquet"
 
-# === LOAD & CONCATENATE ALL FILES ===
+# === DETECT COLUMNS DYNAMICALLY ===
+cols = find_columns(RAW_FILES[0], encoding="latin-1",
+                    date="date", sp="period", prov="provider", price="price", vol="volume")
+date_c, sp_c, prov_c, price_c, vol_c = (cols[k] for k in ("date", "sp", "prov", "price", "vol"))
+
+# === LOAD & CONCATENATE ALL FILES (pinned dtypes, e.g. "01 January 2024") ===
+dtypes = {sp_c: SP_DTYPE, prov_c: "category", price_c: PRICE_DTYPE, vol_c: PRICE_DTYPE}
 dfs = []
 for file in RAW_FILES:
     print(f"Loading {file} ...")
-    df = pd.read_csv(file, encoding="latin-1")
-    dfs.append(df)
+    dfs.append(read_csv_window(file, date_col=date_c, date_format="%d %B %Y",
+                               dtypes=dtypes, encoding="latin-1"))
 df = pd.concat(dfs, ignore_index=True)
+df[prov_c] = df[prov_c].astype("category")
 print(f"Loaded total CSV rows: {len(df):,}")
 
-# === DETECT COLUMNS DYNAMICALLY ===
-date_c  = next(c for c in df.columns if "date" in c.lower())
-sp_c    = next(c for c in df.columns if "period" in c.lower())
-price_c = next(c for c in df.columns if "price" in c.lower())
-vol_c   = next(c for c in df.columns if "volume" in c.lower())
-
 # === ADD DATETIME COLUMN ===
-df["datetime"] = (
-    pd.to_datetime(df[date_c], dayfirst=True, utc=True) +
-    pd.to_timedelta((df[sp_c].astype(int) - 1) * 30, unit="m")
-)
+df["datetime"] = settlement_to_utc(df[date_c], df[sp_c])
 
 # === SHOW UNIQUE PERIODS ===
 n_unique_dt = df["datetime"].nunique()
@@ -37,23 +40,14 @@ print(f"First 5 unique datetimes: {df['datetime'].drop_duplicates().sort_values(
 
 # === SAVE TRADE-LEVEL (RAW) DATA ===
 Path(RAW_OUT).parent.mkdir(parents=True, exist_ok=True)
-df.to_parquet(RAW_OUT, index=False)
+write_dataset(df, RAW_OUT)
 print(f"✅ Saved full trade-level data to {RAW_OUT} ({len(df)} rows)")
 
 # === AGGREGATE TO 1 ROW PER PERIOD ===
-agg = (
-    df.groupby("datetime").agg(
-        vwap_price = (price_c, lambda x: (x * df.loc[x.index, vol_c]).sum() / df.loc[x.index, vol_c].sum()),
-        mean_price = (price_c, "mean"),
-        min_price  = (price_c, "min"),
-        max_price  = (price_c, "max"),
-        std_price  = (price_c, "std"),
-        total_volume = (vol_c, "sum"),
-    ).reset_index()
-)
+agg = aggregate_trades(df, price_c, vol_c)
 print(f"Aggregated to {len(agg)} unique settlement periods.")
 
 # === SAVE AGGREGATED DATA ===
-agg.to_parquet(PROC_OUT, index=False)
+write_dataset(agg, PROC_OUT)
 print(f"✅ Saved aggregated VWAP data to {PROC_OUT} ({len(agg)} rows)")
 print("First 5 aggregated rows:\n", agg.head())
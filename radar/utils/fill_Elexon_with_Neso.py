@@ -1,14 +1,35 @@
-# notebooks/patch_elexon_with_neso.py
+"""
+Patch the Elexon national-demand forecast with NESO (and any further sources).
 
-from pathlib import Path
+Every half-hour between the first and last Elexon period takes the first
+non-null forecast in priority order: Elexon, then NESO, then each
+``--fallback`` in the order given. The ``source`` column records where each
+value came from (see gbpower.data.gaps.fill).
+
+Run from anywhere (the repo root is found from this file):
+    python radar/utils/fill_Elexon_with_Neso.py
+    python radar/utils/fill_Elexon_with_Neso.py --fallback backup=data/processed/other_forecast.parquet
+"""
+
+import argparse
 import re
+import sys
+from pathlib import Path
+
 import pandas as pd
 
+from gbpower.data.gaps import count_missing, fill
+from gbpower.data.storage import read_dataset, write_dataset
+
+ROOT = Path(__file__).resolve().parents[2]
+PROC = ROOT / "data" / "processed"
+
+
 def find_forecast_column(df, label):
     # Add all possible column names we've seen
     candidates = {
         c for c in df.columns
-        if c in {'nationalDemand', 'transmissionSystemDemand', 'nd', 'forecastDemand', 'forecast_demand'}
+        if c in {'nationalDemand', 'transmissionSystemDemand', 'nd', 'forecastDemand', 'forecast_demand', 'forecast_MW'}
         or re.fullmatch(
             r"(nd|n\d*demandforecast|forecastdemand|forcastdemand|forecast_demand|nationaldemand|transmissionsystemdemand)",
             c,
@@ -24,74 +45,52 @@ def find_forecast_column(df, label):
     print(f"🛈  Using {label} column → '{col}'")
     return col
 
-ROOT = Path(__file__).resolve().parents[2]  # Changed from parents[1] to parents[2]
-PROC = ROOT / "data" / "processed"
 
-# Add debug prints
-print(f"Root directory: {ROOT}")
-print(f"Processing directory: {PROC}")
-
-# Check if directory exists
-if not PROC.exists():
-    raise FileNotFoundError(f"Processing directory not found at: {PROC}")
-
-elexon_pq = PROC / "demand_forecast.parquet"
-neso_pq = PROC / "da_demand_forecast.parquet"
-out_pq = PROC / "demand_forecast_neso_patched.parquet"
-
-# Check if files exist
-print(f"Checking for Elexon file: {elexon_pq}")
-if not elexon_pq.exists():
-    raise FileNotFoundError(f"Elexon forecast file not found at: {elexon_pq}")
-
-print(f"Checking for NESO file: {neso_pq}")
-if not neso_pq.exists():
-    raise FileNotFoundError(f"NESO forecast file not found at: {neso_pq}")
-
-elexon = pd.read_parquet(elexon_pq)
-neso = pd.read_parquet(neso_pq)
-
-for df in (elexon, neso):
-    if not pd.api.types.is_datetime64_any_dtype(df["datetime"]):
-        df["datetime"] = pd.to_datetime(df["datetime"], utc=True)
-    elif df["datetime"].dt.tz is None:
-        df["datetime"] = df["datetime"].dt.tz_localize("UTC")
-    else:
-        df["datetime"] = df["datetime"].dt.tz_convert("UTC")
-
-elexon_fc = find_forecast_column(elexon, "Elexon")
-neso_fc = find_forecast_column(neso, "NESO")
-elexon = elexon.rename(columns={elexon_fc: "nd"})
-neso = neso.rename(columns={neso_fc: "nd"})
-
-full_idx = pd.date_range(
-    elexon["datetime"].min(), elexon["datetime"].max(), freq="30min", tz="UTC"
-)
-missing_dt = full_idx.difference(elexon["datetime"])
-print(f"🔍 Missing half-hours in Elexon: {len(missing_dt):,}")
-
-neso_avail = neso.set_index("datetime").reindex(missing_dt)["nd"].dropna()
-print(f"🩹 NESO can supply         : {len(neso_avail):,} of those half-hours")
-print(
-    f"✅ Fill-rate               : {len(neso_avail) / len(missing_dt):.1%}"
-    if missing_dt.size else "✅ No gaps :-)"
-)
-
-patched = pd.concat(
-    [
-        elexon[["datetime", "nd"]],
-        pd.DataFrame({"datetime": neso_avail.index, "nd": neso_avail.values}),
-    ],
-    ignore_index=True,
-).drop_duplicates("datetime", keep="first")
-
-patched.sort_values("datetime", inplace=True)
-patched.reset_index(drop=True).to_parquet(out_pq)
-print(f"💾 Saved patched parquet → {out_pq.relative_to(ROOT)}")
-
-full_expected = pd.date_range(
-    patched["datetime"].min(), patched["datetime"].max(), freq="30min", tz="UTC"
-)
-print(
-    f"🔧 Remaining blanks        : {len(full_expected.difference(patched['datetime'])):,}"
-)
+def load_source(path: Path, label: str) -> pd.DataFrame:
+    """*path* as a UTC ``datetime`` + ``nd`` frame."""
+    print(f"Checking for {label} file: {path}")
+    if not path.exists():
+        raise FileNotFoundError(f"{label} forecast file not found at: {path}")
+    df = read_dataset(path)
+    df["datetime"] = pd.to_datetime(df["datetime"], utc=True)
+    return df[["datetime", find_forecast_column(df, label)]].set_axis(["datetime", "nd"], axis=1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--elexon", type=Path, default=PROC / "demand_forecast.parquet")
+    p.add_argument("--neso", type=Path, default=PROC / "da_demand_forecast.parquet")
+    p.add_argument("--fallback", action="append", default=[], metavar="NAME=PATH",
+                   help="further source, tried after NESO (repeatable, in priority order)")
+    p.add_argument("--out", type=Path, default=PROC / "demand_forecast_neso_patched.parquet")
+    args = p.parse_args(argv)
+
+    paths = {"Elexon": args.elexon, "NESO": args.neso}
+    for item in args.fallback:
+        name, sep, path = item.partition("=")
+        if not sep:
+            p.error(f"--fallback needs NAME=PATH, got {item!r}")
+        paths[name] = Path(path)
+    sources = [(name, load_source(path, name)) for name, path in paths.items()]
+
+    elexon = sources[0][1]
+    span = elexon["datetime"].min(), elexon["datetime"].max()
+    missing = count_missing(elexon["datetime"][elexon["nd"].notna()], *span)
+    print(f"🔍 Missing half-hours in Elexon: {missing:,}")
+
+    patched = fill(sources, column="nd")
+    supplied = patched["source"].value_counts()
+    for name, _ in sources[1:]:
+        print(f"🩹 {name:<23}: {supplied[name]:,} half-hours")
+    filled = len(patched) - supplied["Elexon"]
+    print(f"✅ Fill-rate               : {filled / missing:.1%}" if missing else "✅ No gaps :-)")
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    write_dataset(patched, args.out)
+    print(f"💾 Saved patched parquet → {args.out}")
+    print(f"🔧 Remaining blanks        : {count_missing(patched['datetime'], *span):,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,26 +6,42 @@ Merge all processed parquet files into one tidy table.
  • Checks for missing half-hours
  • Calculates intraday VWAP 
  • Renames forecast columns only if they really exist
- • Writes <root>/data/processed/final_merged.parquet  
+ • Writes <root>/data/processed/final_merged.parquet  (year/month partitioned)
+ • --start/--end are pushed down to the parquet reader
+ • --incremental: appends only periods past the watermark stored in the output
+ • --chunked: full rebuild one calendar month at a time, streamed into the
+   parquet writer (peak memory ≈ one month of every source)
+ • --profile [DIR]: cProfile report + per-stage timings JSON for the run
 """
 
 from __future__ import annotations
 
-import argparse, sys, textwrap, warnings
+import argparse, io, itertools, sys, textwrap, warnings
 from collections import Counter
+from contextlib import redirect_stdout
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+from gbpower.data import storage
+from gbpower.data.align import align_sources
+from gbpower.data.gaps import count_missing, find_gaps
+from gbpower.data.intraday import aggregate_trades
+from gbpower.profiling import add_profile_args, maybe_profile, stage, timed
 
 warnings.filterwarnings("ignore", category=pd.errors.PerformanceWarning)
 
 UTC       = "UTC"
 HALF_HOUR = pd.Timedelta(minutes=30)
 
+# dataset-metadata key holding the merge watermark: every source was complete
+# up to (and including) this datetime when the output was written
+WATERMARK_KEY = "merge_watermark"
+
 
 # ───────────────────────── CLI ──────────────────────────
-def cli() -> argparse.Namespace:
+def cli(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(
         formatter_class=argparse.RawTextHelpFormatter,
         description=textwrap.dedent(
@@ -40,6 +56,12 @@ def cli() -> argparse.Namespace:
               --start 2024-01-01T00:00:00Z   (UTC start filter)
               --end   2025-05-01T23:30:00Z   (UTC end   filter)
               --out   C:/tmp/merged.parquet  (custom output)
+              --incremental                  (append only periods newer than
+                                              the output's watermark)
+              --chunked                      (merge month by month; memory
+                                              bounded by one month of data)
+              --profile [DIR]                (profile report + timings JSON,
+                                              default reports/profiles)
             """
         ),
     )
@@ -47,7 +69,12 @@ def cli() -> argparse.Namespace:
     p.add_argument("--start")
     p.add_argument("--end")
     p.add_argument("--out")
-    return p.parse_args()
+    p.add_argument("--incremental", action="store_true",
+                   help="Merge only rows newer than the watermark stored in --out")
+    p.add_argument("--chunked", action="store_true",
+                   help="Full rebuilds merge one calendar month at a time")
+    add_profile_args(p)
+    return p.parse_args(argv)
 
 
 # ──────────────── path helpers / loader ────────────────
@@ -75,11 +102,25 @@ def file_map(root: Path) -> dict[str, Path]:
     }
 
 
-def load_parquet(path: Path, tag: str) -> pd.DataFrame:
+@timed()
+def load_parquet(
+    path: Path,
+    tag: str,
+    after: pd.Timestamp | None = None,
+    start: str | None = None,
+    end: str | None = None,
+) -> pd.DataFrame:
+    """Read a processed table; *start/end/after* are pushed down to pyarrow.
+
+    Month partitions and row groups outside the window are never decoded
+    (*after* is a strict lower bound, used by --incremental).
+    """
     if not path.exists():
         sys.exit(f"❌  {tag}: expected file not found → {path}")
     try:
-        df = pd.read_parquet(path)
+        df = storage.read_dataset(path, start, end, after=after)
+    except (KeyError, TypeError) as exc:
+        sys.exit(f"❌  {tag}: {exc}")
     except Exception as exc:  # pragma: no cover
         sys.exit(f"❌  {tag}: can't read parquet → {exc}")
 
@@ -98,56 +139,36 @@ def print_columns(df: pd.DataFrame, tag: str) -> None:
 
 # ────────────── data quality utilities ────────────────
 def missing_half_hours(df: pd.DataFrame) -> int:
-    full = pd.date_range(df["datetime"].min(), df["datetime"].max(), freq=HALF_HOUR, tz=UTC)
-    return len(full) - df["datetime"].nunique()
+    return count_missing(df["datetime"])
 
 
 def show_missing(df: pd.DataFrame, tag: str) -> None:
-    miss = missing_half_hours(df)
-    if miss == 0:
+    gaps = find_gaps(df["datetime"])
+    if gaps.empty:
         print(f"✓  {tag:<9}: no missing half-hours")
         return
-    rng = pd.date_range(df["datetime"].min(), df["datetime"].max(), freq=HALF_HOUR, tz=UTC)
-    sample = sorted(set(rng) - set(df["datetime"]))[:3]
-    print(f"⚠️  {tag:<9}: {miss:,} missing half-hours; e.g. {sample}")
+    sample = ", ".join(f"{g.start} (+{g.n_missing})" for g in gaps.head(3).itertuples())
+    print(f"⚠️  {tag:<9}: {gaps['n_missing'].sum():,} missing half-hours in {len(gaps):,} gaps; "
+          f"e.g. {sample}")
 
 
+@timed()
 def compute_vwap(df: pd.DataFrame) -> pd.DataFrame:
     """Return df with new 'mip_price' column (VWAP of price*volume)."""
     price = next(c for c in df.columns if "price" in c.lower())
     vol = next(c for c in df.columns if "volume" in c.lower())
 
     vwap = (
-        df.groupby("datetime", group_keys=False)[[price, vol]]
-        .apply(lambda g: np.average(g[price], weights=g[vol]) if g[vol].sum() else np.nan)
-        .rename("mip_price")
-        .reset_index()
+        aggregate_trades(df, price, vol)[["datetime", "vwap_price"]]
+        .rename(columns={"vwap_price": "mip_price"})
     )
 
     return df.drop_duplicates("datetime").merge(vwap, on="datetime", how="left")
 
 
-# ───────────────────── main merge ──────────────────────
-def main() -> None:
-    args = cli()
-    ROOT = locate_root(args.root)
-    FILES = file_map(ROOT)
-
-    # 1 ── LOAD & REPORT
-    print("── Loading ──────────────────────────────────────────────")
-    dfs = {tag: load_parquet(path, tag) for tag, path in FILES.items()}
-    for tag, df in dfs.items():
-        print(
-            f"✓  {tag:<9}: {len(df):>8,} rows | {df['datetime'].min()} → {df['datetime'].max()}"
-        )
-        print_columns(df, tag)
-
-    # 2 ── QUICK QUALITY CHECKS
-    print("\n── Checks ──────────────────────────────────────────────")
-    for tag, df in dfs.items():
-        show_missing(df, tag)
-
-    # 3 ── COLUMN NORMALISATION
+# ───────────────────── merge steps ─────────────────────
+def normalise_columns(dfs: dict[str, pd.DataFrame]) -> None:
+    """VWAP the intraday trades and rename demand/forecast columns (in place)."""
     dfs["INTRADAY"] = compute_vwap(dfs["INTRADAY"])
 
     # DEMAND
@@ -170,53 +191,266 @@ def main() -> None:
         dfs["FORECAST"] = dfs["FORECAST"].rename(columns=valid_map)
         print(f"\n✓  FORECAST columns renamed: {valid_map}")
 
-    # 4 ── OPTIONAL DATE FILTER
-    if args.start or args.end:
-        s = pd.to_datetime(args.start, utc=True) if args.start else None
-        e = pd.to_datetime(args.end, utc=True) if args.end else None
-        for tag in dfs:
-            before = len(dfs[tag])
-            if s is not None:
-                dfs[tag] = dfs[tag][dfs[tag]["datetime"] >= s]
-            if e is not None:
-                dfs[tag] = dfs[tag][dfs[tag]["datetime"] <= e]
-            print(f"{tag:<9}: {before:,} → {len(dfs[tag]):,} rows after date filter")
-
-    # 5 ── INDEX & OUTER JOIN
+
+def filter_dates(dfs: dict[str, pd.DataFrame], start: str | None, end: str | None) -> None:
+    """Keep rows inside [start, end] (UTC, inclusive) in every frame (in place)."""
+    if not (start or end):
+        return
+    s = pd.to_datetime(start, utc=True) if start else None
+    e = pd.to_datetime(end, utc=True) if end else None
     for tag in dfs:
-        dfs[tag] = (
-            dfs[tag]
-            .sort_values("datetime")
-            .drop_duplicates("datetime")
-            .set_index("datetime")
-        )
+        before = len(dfs[tag])
+        if s is not None:
+            dfs[tag] = dfs[tag][dfs[tag]["datetime"] >= s]
+        if e is not None:
+            dfs[tag] = dfs[tag][dfs[tag]["datetime"] <= e]
+        print(f"{tag:<9}: {before:,} → {len(dfs[tag]):,} rows after date filter")
+
+
+@timed()
+def join_sources(dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Dedupe each source on datetime and outer-align them on one half-hour grid.
+
+    Same frame as the former ``set_index`` + chained ``join(how="outer")``,
+    built by slot arithmetic instead of hash joins (see gbpower.data.align).
+    """
+    forecast_cols = [c for c in ["forecast_TSD", "forecast_ND"] if c in dfs["FORECAST"].columns]
+    return align_sources([
+        (dfs["DEMAND"], ""),
+        (dfs["INTRADAY"], "_intraday"),
+        (dfs["IMBALANCE"], "_imb"),
+        (dfs["FORECAST"][["datetime", *forecast_cols]], ""),
+    ])
+
+
+# ─────────────── watermark / incremental I/O ──────────────
+def source_watermark(
+    dfs: dict[str, pd.DataFrame], previous: pd.Timestamp | None = None
+) -> pd.Timestamp | None:
+    """Latest datetime every source has reached (sources with no rows keep *previous*)."""
+    ends = []
+    for df in dfs.values():
+        last = df["datetime"].max()
+        if pd.isna(last):
+            if previous is None:
+                return None
+            last = previous
+        ends.append(last)
+    return min(ends) if ends else None
+
+
+def read_watermark(out_path: Path) -> pd.Timestamp | None:
+    raw = storage.read_meta(out_path).get(WATERMARK_KEY) if out_path.is_dir() else None
+    return pd.Timestamp(raw) if raw else None
+
+
+def write_full(merged: pd.DataFrame, out_path: Path, watermark: pd.Timestamp | None) -> None:
+    meta = {WATERMARK_KEY: watermark.isoformat()} if watermark is not None else {}
+    storage.write_dataset(merged.reset_index(), out_path, meta=meta)
+
+
+@timed()
+def append_delta(
+    delta: pd.DataFrame, out_path: Path, old_wm: pd.Timestamp, new_wm: pd.Timestamp | None
+) -> bool:
+    """
+    Append *delta* (rows after *old_wm*) to the partitioned output.
+
+    Only month partitions from *old_wm*'s month onward are rewritten: rows up
+    to the old watermark are kept, rows past it were provisional and are
+    replaced by *delta*. The watermark is cleared while partitions are being
+    swapped, so an interrupted run is followed by a full rebuild.
+
+    Returns False, leaving the output untouched, if *delta* can't be cast to
+    the existing schema (new column, or NaNs in a column that was int); the
+    caller then falls back to a full rebuild, which would widen the dtype too.
+    """
+    schema = storage.dataset_schema(out_path)
+    try:
+        table = pa.Table.from_pandas(delta.reset_index(), schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError, ValueError):
+        return False
+    if table.schema.names != schema.names:
+        return False
+
+    month_start = old_wm.tz_convert(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0, nanosecond=0)
+    kept = storage.read_table(out_path, start=month_start, end=old_wm).cast(schema)
+
+    meta = storage.read_meta(out_path)
+    storage.write_meta(out_path, {k: v for k, v in meta.items() if k != WATERMARK_KEY})
+    storage.overwrite_from(pa.concat_tables([kept, table]), out_path, since=month_start)
+    if new_wm is not None:
+        storage.write_meta(out_path, {**meta, WATERMARK_KEY: new_wm.isoformat()})
+    return True
+
+
+# ───────────────────── chunked merge ─────────────────────
+def month_windows(
+    first: pd.Timestamp, last: pd.Timestamp
+) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    """Inclusive [start, end] windows, one per UTC calendar month, covering first → last."""
+    months = pd.date_range(first.tz_convert(UTC).floor("D").replace(day=1), last, freq="MS")
+    edges = [*months[1:], last + pd.Timedelta(1, "ns")]
+    return [(max(m, first), e - pd.Timedelta(1, "ns")) for m, e in zip(months, edges)]
+
+
+def merge_month(files: dict[str, Path], start: pd.Timestamp, end: pd.Timestamp) -> tuple[pd.DataFrame, dict]:
+    """The merged rows of one window, plus each source's last datetime in it."""
+    dfs = {tag: load_parquet(path, tag, start=start, end=end) for tag, path in files.items()}
+    ends = {tag: df["datetime"].max() for tag, df in dfs.items()}
+    with redirect_stdout(io.StringIO()):                      # the per-step chatter, ×months
+        normalise_columns(dfs)
+    return join_sources(dfs), ends
+
+
+def run_chunked(
+    files: dict[str, Path],
+    out_path: Path,
+    start: str | None = None,
+    end: str | None = None,
+) -> tuple[pd.Timestamp | None, dict]:
+    """
+    Full rebuild, one calendar month at a time, streamed into *out_path*.
+
+    Every source is read for one month only (partition / row-group pruned),
+    merged with the same steps as the in-memory path and written as record
+    batches, so peak memory is about one month of data whatever the history
+    length. Alignment never crosses a month edge (rows are keyed by their
+    own half-hour), so the output equals the in-memory merge. The schema
+    comes from the first month; int columns that only gain NaNs later are
+    stored as nullable ints and read back as float, as the full join would.
+
+    Returns the new watermark and a summary (rows, columns, span, NaNs).
+    """
+    bounds = [storage.time_bounds(p) for p in files.values()]
+    firsts = [b[0] for b in bounds if b[0] is not None]
+    lasts = [b[1] for b in bounds if b[1] is not None]
+    if not firsts:
+        sys.exit("❌  --chunked: every source is empty")
+    first = max(min(firsts), pd.to_datetime(start, utc=True)) if start else min(firsts)
+    last = min(max(lasts), pd.to_datetime(end, utc=True)) if end else max(lasts)
+
+    summary = {"rows": 0, "cols": 0, "span": [None, None], "nans": None}
+    ends: dict[str, pd.Timestamp] = {}
+    schema: list[pa.Schema] = []
+
+    def month_tables():
+        for lo, hi in month_windows(first, last):
+            merged, month_ends = merge_month(files, lo, hi)
+            for tag, t in month_ends.items():
+                if pd.notna(t):
+                    ends[tag] = t
+            if merged.empty:
+                continue
+            table = pa.Table.from_pandas(merged.reset_index(), schema=schema[0] if schema else None,
+                                         preserve_index=False)
+            print(f"✓  {lo:%Y-%m}: {len(merged):>6,} rows")
+            nans = merged.isna().sum()
+            summary["rows"] += len(merged)
+            summary["cols"] = len(merged.columns)
+            summary["span"] = [summary["span"][0] or merged.index.min(), merged.index.max()]
+            summary["nans"] = nans if summary["nans"] is None else summary["nans"] + nans
+            yield from table.to_batches()
+
+    with stage("chunked_merge") as probe:                     # month loop + streamed write
+        batches = month_tables()
+        head = next(batches, None)                            # fixes the schema
+        if head is None:
+            sys.exit("❌  --chunked: no rows in the selected window")
+        schema.append(head.schema)
+        storage.write_batches(itertools.chain([head], batches), head.schema, out_path)
+        probe.rows_out = summary["rows"]
+
+    new_wm = min(ends.values()) if len(ends) == len(files) else None
+    return new_wm, summary
+
 
-    merged = (
-        dfs["DEMAND"]
-        .join(dfs["INTRADAY"], how="outer", rsuffix="_intraday")
-        .join(dfs["IMBALANCE"], how="outer", rsuffix="_imb")
-        .join(
-            dfs["FORECAST"][
-                [c for c in ["forecast_TSD", "forecast_ND"] if c in dfs["FORECAST"].columns]
-            ],
-            how="outer",
+# ───────────────────── main merge ──────────────────────
+def run(
+    root: Path,
+    start: str | None = None,
+    end: str | None = None,
+    out: str | Path | None = None,
+    incremental: bool = False,
+    chunked: bool = False,
+) -> Path:
+    FILES = file_map(root)
+    out_path = Path(out) if out else root / "data" / "processed" / "final_merged.parquet"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    watermark = read_watermark(out_path) if incremental else None
+    if incremental and watermark is None:
+        print("⚠️  --incremental: no watermark in output – running a full rebuild")
+    elif watermark is not None:
+        print(f"↻  Incremental merge after watermark {watermark}")
+
+    if chunked and watermark is None:
+        print("── Chunked merge (one month at a time) ─────────────────")
+        new_wm, summary = run_chunked(FILES, out_path, start, end)
+        if new_wm is not None:
+            storage.write_meta(out_path, {WATERMARK_KEY: new_wm.isoformat()})
+        print("\n── Final sanity checks ─────────────────────────────────")
+        print("Rows:", f"{summary['rows']:,}")
+        print("Cols:", summary["cols"])
+        print("Span:", summary["span"][0], "→", summary["span"][1])
+        print("NaN per column (top 10):")
+        print(summary["nans"].sort_values(ascending=False).head(10))
+        print(f"\n✅  Saved merged parquet → {out_path}")
+        return out_path
+
+    # 1 ── LOAD & REPORT
+    print("── Loading ──────────────────────────────────────────────")
+    dfs = {tag: load_parquet(path, tag, watermark, start, end) for tag, path in FILES.items()}
+    for tag, df in dfs.items():
+        print(
+            f"✓  {tag:<9}: {len(df):>8,} rows | {df['datetime'].min()} → {df['datetime'].max()}"
         )
-    )
+        print_columns(df, tag)
+
+    if watermark is not None and all(df.empty for df in dfs.values()):
+        print(f"\n✅  Nothing newer than {watermark} – {out_path} is up to date")
+        return out_path
+
+    # 2 ── QUICK QUALITY CHECKS
+    print("\n── Checks ──────────────────────────────────────────────")
+    for tag, df in dfs.items():
+        if not df.empty:
+            show_missing(df, tag)
+
+    # 3 ── COLUMN NORMALISATION
+    normalise_columns(dfs)
+
+    # 4 ── OPTIONAL DATE FILTER
+    filter_dates(dfs, start, end)
+
+    # 5 ── ALIGN ON THE HALF-HOUR GRID
+    new_wm = source_watermark(dfs, previous=watermark)
+    merged = join_sources(dfs)
 
     # 6 ── SAVE
-    out_path = Path(args.out) if args.out else ROOT / "data" / "processed" / "final_merged.parquet"
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    merged.reset_index().to_parquet(out_path, index=False)
+    if watermark is None:
+        with stage("write_full", rows_in=len(merged)):
+            write_full(merged, out_path, new_wm)
+    elif not append_delta(merged, out_path, watermark, new_wm):
+        print("⚠️  Delta doesn't fit the existing schema – running a full rebuild")
+        return run(root, start, end, out_path, incremental=False, chunked=chunked)
 
     # 7 ── FINAL SUMMARY
     print("\n── Final sanity checks ─────────────────────────────────")
-    print("Rows:", f"{len(merged):,}")
+    print("Rows:", f"{len(merged):,}", "(appended)" if watermark is not None else "")
     print("Cols:", len(merged.columns))
     print("Span:", merged.index.min(), "→", merged.index.max())
     print("NaN per column (top 10):")
     print(merged.isna().sum().sort_values(ascending=False).head(10))
 
     print(f"\n✅  Saved merged parquet → {out_path}")
+    return out_path
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = cli(argv)
+    with maybe_profile("merge", args):
+        run(locate_root(args.root), args.start, args.end, args.out, args.incremental, args.chunked)
 
 
 # —————————————————————————————————————————————
@@ -1,24 +1,129 @@
 """
 Utility functions to create stress-event / regime flags.
 
+Thresholds are either full-sample percentiles (the default) or trailing-
+window percentiles (``threshold_window=…``), which never look ahead and can
+be carried forward with ``RollingRegimeFlags`` so a live job only processes
+new rows.
+
 Usage:
     >>> from src.features.regime_flags import add_regime_flags
     >>> df = add_regime_flags(df, config, perc_95=0.95, perc_99=0.99)
+    >>> df = add_regime_flags(df, config, window=48, threshold_window=48 * 30)
+    >>> df = add_regime_flags(df, config, window=48, compact=True)   # int8 / categorical, no copy
 """
 
 import pandas as pd
 import numpy as np
 
+from gbpower.profiling import timed
+from src.features.rolling_quantile import RollingQuantile
+
+DRIVERS = ["vol_spread_SBP_vs_MIP", "vol_err_TSD_%", "spread_SBP_vs_MIP"]
+VOL_SOURCES = {"vol_spread_SBP_vs_MIP": "spread_SBP_vs_MIP", "vol_err_TSD_%": "err_TSD_%"}
+REGIMES = ["NORMAL", "HIGH_VOL", "EXTREME"]
+
 def _calc_percentile_thresholds(df: pd.DataFrame, cols: list[str], perc: float) -> dict[str, float]:
     """Return {col: percentile_value} for each col."""
     return {c: df[c].abs().quantile(perc) for c in cols}
 
+def _rolling_percentile_thresholds(
+    df: pd.DataFrame, cols: list[str], perc: float, window: int, min_periods: int
+) -> dict[str, np.ndarray]:
+    """Return {col: trailing-window percentile per row} (no look-ahead)."""
+    return {
+        c: df[c].abs().rolling(window, min_periods=min_periods).quantile(perc).to_numpy()
+        for c in cols
+    }
+
+def _apply_thresholds(df: pd.DataFrame, thr_95: dict, thr_99: dict) -> pd.DataFrame:
+    """Driver flags + regime columns; thresholds may be scalars or per-row arrays."""
+    # compute z-score-like flags
+    for c in DRIVERS:
+        df[f"driver_{c}_gt95"] = (df[c].abs() > thr_95[c]).astype(int)
+        df[f"driver_{c}_gt99"] = (df[c].abs() > thr_99[c]).astype(int)
+
+    # --- regime logic -------------------------------------------------------
+    df["is_high_vol"] = df[[f"driver_{c}_gt95" for c in DRIVERS]].max(axis=1)
+    df["is_extreme"]  = (df[[f"driver_{c}_gt99" for c in DRIVERS]].sum(axis=1) >= 2).astype(int)
+
+    df["regime_flag"] = "NORMAL"
+    df.loc[df["is_high_vol"] == 1, "regime_flag"]  = "HIGH_VOL"
+    df.loc[df["is_extreme"]  == 1, "regime_flag"]  = "EXTREME"
+
+    df["is_stress_event"] = (df["regime_flag"] != "NORMAL").astype(int)
+
+    return df
+
+def _fused_flags(a: np.ndarray, thr_95: np.ndarray, thr_99: np.ndarray) -> dict:
+    """
+    Every flag from the (n, 3) |driver| matrix in one NumPy pass; thresholds
+    broadcast as (3,) full-sample or (n, 3) trailing values.
+    """
+    with np.errstate(invalid="ignore"):
+        gt95, gt99 = a > thr_95, a > thr_99
+    high = gt95.any(axis=1)
+    extreme = gt99.sum(axis=1) >= 2
+    codes = np.where(extreme, 2, high).astype("int8")
+
+    cols = {}
+    for j, c in enumerate(DRIVERS):
+        cols[f"driver_{c}_gt95"] = gt95[:, j].astype("int8")
+        cols[f"driver_{c}_gt99"] = gt99[:, j].astype("int8")
+    cols["is_high_vol"] = high.astype("int8")
+    cols["is_extreme"] = extreme.astype("int8")
+    cols["regime_flag"] = pd.Categorical.from_codes(codes, categories=REGIMES)
+    cols["is_stress_event"] = (codes > 0).astype("int8")
+    return cols
+
+def regime_flag_columns(
+    df: pd.DataFrame,
+    perc_95: float = 0.95,
+    perc_99: float = 0.99,
+    window: int | None = None,
+    threshold_window: int | None = None,
+    min_periods: int = 48,
+) -> pd.DataFrame:
+    """
+    Only the columns ``add_regime_flags`` would add (volatility columns when
+    *window* is given), read from the three driver columns without copying
+    *df*. Flags are int8 and ``regime_flag`` is categorical.
+    """
+    new = {}
+    if window:
+        for vol, src in VOL_SOURCES.items():
+            new[vol] = df[src].rolling(window, min_periods=1).std().to_numpy()
+    a = np.abs(np.column_stack([
+        new[c] if c in new else df[c].to_numpy(dtype="float64", na_value=np.nan) for c in DRIVERS
+    ]))
+
+    if threshold_window:
+        rolled = pd.DataFrame(a).rolling(threshold_window, min_periods=min_periods)
+        thr_95 = rolled.quantile(perc_95).to_numpy()
+        thr_99 = rolled.quantile(perc_99).to_numpy()
+    else:
+        with np.errstate(invalid="ignore"):
+            thr_95, thr_99 = np.nanquantile(a, [perc_95, perc_99], axis=0)
+
+    return pd.DataFrame({**new, **_fused_flags(a, thr_95, thr_99)}, index=df.index)
+
+def _join_new(df: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """*df* with *new*'s columns added or replaced in place; *df*'s data is shared, not copied."""
+    out = df.copy(deep=False)           # copy-on-write: untouched columns stay views
+    for c, values in new.items():
+        out[c] = values
+    return out
+
+@timed()
 def add_regime_flags(
     df: pd.DataFrame,
     config: dict,
     perc_95: float = 0.95,
     perc_99: float = 0.99,
     window: int | None = None,
+    threshold_window: int | None = None,
+    min_periods: int = 48,
+    compact: bool = False,
 ) -> pd.DataFrame:
     """
     Adds:
@@ -29,7 +134,19 @@ def add_regime_flags(
     window : optional
         If given, recompute rolling volatility with that window; otherwise
         expect 'vol_spread_SBP_vs_MIP' & 'vol_err_TSD_%' already exist.
+    threshold_window : optional
+        If given, percentile thresholds use only the trailing
+        *threshold_window* rows (e.g. 48*30 for 30 days) instead of the
+        full sample; rows with fewer than *min_periods* values are NORMAL.
+    compact : default False
+        Compute the flags in one pass (:func:`regime_flag_columns`) as int8
+        / categorical columns and join them without copying *df*.
     """
+    if compact:
+        return _join_new(
+            df, regime_flag_columns(df, perc_95, perc_99, window, threshold_window, min_periods)
+        )
+
     df = df.copy()
 
     # --- ensure volatility columns -----------------------------------------
@@ -41,24 +158,95 @@ def add_regime_flags(
             df["err_TSD_%"].rolling(window, min_periods=1).std()
         )
 
-    drivers = ["vol_spread_SBP_vs_MIP", "vol_err_TSD_%", "spread_SBP_vs_MIP"]
+    if threshold_window:
+        thr_95 = _rolling_percentile_thresholds(df, DRIVERS, perc_95, threshold_window, min_periods)
+        thr_99 = _rolling_percentile_thresholds(df, DRIVERS, perc_99, threshold_window, min_periods)
+    else:
+        thr_95 = _calc_percentile_thresholds(df, DRIVERS, perc_95)
+        thr_99 = _calc_percentile_thresholds(df, DRIVERS, perc_99)
 
-    thr_95 = _calc_percentile_thresholds(df, drivers, perc_95)
-    thr_99 = _calc_percentile_thresholds(df, drivers, perc_99)
+    return _apply_thresholds(df, thr_95, thr_99)
 
-    # compute z-score-like flags
-    for c in drivers:
-        df[f"driver_{c}_gt95"] = (df[c].abs() > thr_95[c]).astype(int)
-        df[f"driver_{c}_gt99"] = (df[c].abs() > thr_99[c]).astype(int)
+class RollingRegimeFlags:
+    """
+    Trailing-window regime flags carried forward from saved state.
 
-    # --- regime logic -------------------------------------------------------
-    df["is_high_vol"] = df[[f"driver_{c}_gt95" for c in drivers]].max(axis=1)
-    df["is_extreme"]  = (df[[f"driver_{c}_gt99" for c in drivers]].sum(axis=1) >= 2).astype(int)
+    Gives the same rows as ``add_regime_flags(..., threshold_window=…)`` on the
+    full history, but each :meth:`update` only touches the new rows: the
+    volatility tails and the threshold windows live in the object and
+    round-trip through :meth:`state` / :meth:`from_state` (plain JSON).
+    """
 
-    df["regime_flag"] = "NORMAL"
-    df.loc[df["is_high_vol"] == 1, "regime_flag"]  = "HIGH_VOL"
-    df.loc[df["is_extreme"]  == 1, "regime_flag"]  = "EXTREME"
+    def __init__(
+        self,
+        threshold_window: int,
+        perc_95: float = 0.95,
+        perc_99: float = 0.99,
+        window: int | None = None,
+        min_periods: int = 48,
+        compact: bool = False,
+    ):
+        self.params = dict(threshold_window=threshold_window, perc_95=perc_95, perc_99=perc_99,
+                           window=window, min_periods=min_periods, compact=compact)
+        self.quantiles = {
+            c: RollingQuantile(threshold_window, (perc_95, perc_99), min_periods) for c in DRIVERS
+        }
+        self.vol_tails = {src: [] for src in VOL_SOURCES.values()} if window else {}
+        self.last_datetime = None
 
-    df["is_stress_event"] = (df["regime_flag"] != "NORMAL").astype(int)
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Flag *df* (new rows, datetime-ordered, following the previous update)."""
+        df = df.copy()
+        window = self.params["window"]
 
-    return df
+        if window:
+            for vol, src in VOL_SOURCES.items():
+                tail = self.vol_tails[src]
+                joined = pd.Series(np.r_[np.array(tail, dtype="float64"), df[src].to_numpy(dtype="float64")])
+                df[vol] = joined.rolling(window, min_periods=1).std().to_numpy()[len(tail):]
+                self.vol_tails[src] = joined.iloc[-(window - 1):].tolist() if window > 1 else []
+
+        a = np.abs(np.column_stack([df[c].to_numpy(dtype="float64", na_value=np.nan) for c in DRIVERS]))
+        thr = np.stack([self.quantiles[c].run(a[:, j]) for j, c in enumerate(DRIVERS)], axis=1)
+
+        if len(df) and "datetime" in df.columns:
+            self.last_datetime = pd.Timestamp(df["datetime"].iloc[-1])
+        if self.params["compact"]:
+            return _join_new(df, pd.DataFrame(_fused_flags(a, thr[:, :, 0], thr[:, :, 1]), index=df.index))
+        return _apply_thresholds(
+            df,
+            {c: thr[:, j, 0] for j, c in enumerate(DRIVERS)},
+            {c: thr[:, j, 1] for j, c in enumerate(DRIVERS)},
+        )
+
+    def seed(self, flagged: pd.DataFrame) -> "RollingRegimeFlags":
+        """Load the windows from the tail of an already-flagged history."""
+        window, tw = self.params["window"], self.params["threshold_window"]
+        if window:
+            self.vol_tails = {src: flagged[src].iloc[-(window - 1):].tolist() if window > 1 else []
+                              for src in VOL_SOURCES.values()}
+        for c, rq in self.quantiles.items():
+            for x in flagged[c].abs().iloc[-tw:].to_numpy(dtype="float64"):
+                rq.push(x)
+        if len(flagged):
+            self.last_datetime = pd.Timestamp(flagged["datetime"].iloc[-1])
+        return self
+
+    def state(self) -> dict:
+        return {
+            "params": self.params,
+            "last_datetime": self.last_datetime.isoformat() if self.last_datetime is not None else None,
+            "vol_tails": {k: [None if np.isnan(x) else x for x in v] for k, v in self.vol_tails.items()},
+            "windows": {c: rq.values() for c, rq in self.quantiles.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RollingRegimeFlags":
+        self = cls(**state["params"])
+        self.vol_tails = {k: [np.nan if x is None else x for x in v] for k, v in state["vol_tails"].items()}
+        for c, values in state["windows"].items():
+            for x in values:
+                self.quantiles[c].push(x)
+        raw = state.get("last_datetime")
+        self.last_datetime = pd.Timestamp(raw) if raw else None
+        return self
@@ -0,0 +1,80 @@
+"""
+Trailing-window quantiles that can be carried forward one value at a time.
+
+A ``RollingQuantile`` keeps the last *window* values twice: in arrival order
+(a deque, to know what leaves) and sorted (a list maintained with bisect),
+so each new value costs one binary-search insert and one delete, and any
+number of quantiles are read straight off the sorted window.
+
+Results equal ``Series.rolling(window, min_periods).quantile(q)`` (linear
+interpolation, NaNs occupy a slot but are skipped), and the window can be
+saved and restored so a live job only processes new rows.
+
+Usage:
+    >>> from src.features.rolling_quantile import RollingQuantile
+    >>> rq = RollingQuantile(48 * 30, quantiles=(0.95, 0.99), min_periods=48)
+    >>> thr = rq.run(history)            # (n, 2) array of thresholds
+    >>> saved = rq.values()              # … later: RollingQuantile(…, values=saved)
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+
+class RollingQuantile:
+    def __init__(
+        self,
+        window: int,
+        quantiles: Sequence[float] = (0.5,),
+        min_periods: int | None = None,
+        values: Iterable[float] = (),
+    ):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+        self.quantiles = tuple(quantiles)
+        self.min_periods = self.window if min_periods is None else int(min_periods)
+        self._fifo: deque[float] = deque()
+        self._sorted: list[float] = []
+        for x in values:
+            self.push(x)
+
+    def push(self, x: float) -> None:
+        x = math.nan if x is None else float(x)
+        self._fifo.append(x)
+        if not math.isnan(x):
+            bisect.insort(self._sorted, x)
+        if len(self._fifo) > self.window:
+            old = self._fifo.popleft()
+            if not math.isnan(old):
+                del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+    def current(self) -> tuple[float, ...]:
+        s, m = self._sorted, len(self._sorted)
+        if m == 0 or m < self.min_periods:
+            return (math.nan,) * len(self.quantiles)
+        out = []
+        for q in self.quantiles:
+            pos = q * (m - 1)
+            lo = int(pos)
+            hi = min(lo + 1, m - 1)
+            out.append(s[lo] + (s[hi] - s[lo]) * (pos - lo))
+        return tuple(out)
+
+    def run(self, xs: Iterable[float]) -> np.ndarray:
+        """Push every value of *xs*; return the quantiles after each, shape (n, len(quantiles))."""
+        rows = []
+        for x in xs:
+            self.push(x)
+            rows.append(self.current())
+        return np.array(rows, dtype="float64").reshape(-1, len(self.quantiles))
+
+    def values(self) -> list[float | None]:
+        """Window contents in arrival order (NaN → None), for saving as JSON."""
+        return [None if math.isnan(x) else x for x in self._fifo]
@@ -0,0 +1,7 @@
+"""``python -m gbpower`` – same as the ``gbpower`` console script."""
+
+import sys
+
+from gbpower.cli.main import main
+
+sys.exit(main())
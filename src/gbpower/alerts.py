@@ -0,0 +1,256 @@
+"""
+Slack alerts for spread-risk events on newly landed half-hours.
+
+Three parts, each usable on its own:
+
+• ``AlertRules``   – per-row rules: the detection.yml drivers through an
+                     :class:`~gbpower.events.online.OnlineDetector`, plus the
+                     ``regime_flag`` column. Deduplicated: one alert when an
+                     event opens and one when it closes (nothing while it
+                     stays open); one alert when the regime escalates to or
+                     past *min_regime*, none again until it is back to NORMAL
+• ``SlackSender``  – non-blocking send queue: ``send`` only enqueues; a
+                     worker thread batches whatever is queued (up to
+                     *max_batch*, waiting at most *linger* s) into one
+                     incoming-webhook post, paced by a TokenBucket and
+                     retried on 429 / 5xx (Retry-After or jittered backoff)
+• ``AlertService`` – polls a dataset (default: the regimes table, which
+                     save_with_regimes appends to) and feeds rows newer than
+                     the last one seen to the rules and the sender
+
+With ``poll=1`` and ``linger=0.5`` a new settlement period is alerted on
+about 1–2 s after its rows land.
+
+Usage:
+    >>> from gbpower.alerts import AlertRules, AlertService, SlackSender
+    >>> sender = SlackSender(os.environ["SLACK_WEBHOOK_URL"])
+    >>> svc = AlertService("data/processed/final_merged_with_regimes.parquet",
+    ...                    AlertRules("config/detection.yml"), sender)
+    >>> svc.start()                   # prime quantiles/open event from history
+    >>> svc.run_forever()
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Mapping
+from pathlib import Path
+
+import pandas as pd
+
+from gbpower.data.http import TokenBucket, backoff_delay
+from gbpower.data.storage import dataset_mtime, read_dataset
+from gbpower.events.online import OnlineDetector
+
+SEVERITY = {"NORMAL": 0, "HIGH_VOL": 1, "EXTREME": 2}
+PRIME_TAIL = 48                 # half-hours replayed silently so an open event isn't re-alerted
+_STOP = object()
+
+
+# ───────────────────────── rules ──────────────────────────
+class AlertRules:
+    """Rows in, deduplicated alert dicts (``key``, ``kind``, ``status``, ``datetime``, ``text``) out."""
+
+    def __init__(self, config_path: str | Path | Mapping = "config/detection.yml", min_regime: str = "EXTREME"):
+        if min_regime not in SEVERITY or not SEVERITY[min_regime]:
+            raise ValueError(f"min_regime must be one of {[r for r, s in SEVERITY.items() if s]}")
+        self.detector = OnlineDetector(config_path)
+        self.min_level = SEVERITY[min_regime]
+        self.regime_level = 0           # highest level alerted in the current stressed run
+
+    def prime(self, history: pd.DataFrame, tail: int = PRIME_TAIL) -> None:
+        """Warm the quantile sketches on *history* and replay its tail without alerting."""
+        history = history.sort_values("datetime", kind="stable")
+        self.detector.warm_up(history.iloc[:-tail] if tail else history)
+        for row in history.iloc[-tail:].to_dict("records") if tail else []:
+            self.evaluate(row)
+
+    def _event_alert(self, rec: dict) -> dict:
+        col, value = rec["driver_col"], rec["peak_value"]
+        if rec["status"] == "opened":
+            text = (f"🚨 Spread risk: {col} event #{rec['event_id']} opened {rec['start']:%Y-%m-%d %H:%M} UTC"
+                    f" | {col} = {value:,.1f} (threshold {self.detector.threshold(col):,.1f})"
+                    f" | regime {rec['regime_flag_mode']}")
+        else:
+            text = (f"✅ {col} event #{rec['event_id']} closed: {rec['start']:%Y-%m-%d %H:%M}"
+                    f" → {rec['end']:%H:%M} UTC, peak {value:,.1f} at {rec['peak_dt']:%H:%M}")
+        return {"key": f"event:{rec['event_id']}:{rec['status']}", "kind": "event",
+                "status": rec["status"], "datetime": rec["end"], "text": text}
+
+    def _regime_alert(self, row: Mapping) -> list[dict]:
+        regime = row.get("regime_flag")
+        level = SEVERITY.get(regime, 0) if isinstance(regime, str) else 0
+        if level == 0:
+            self.regime_level = 0
+            return []
+        if level < self.min_level or level <= self.regime_level:
+            return []
+        self.regime_level = level
+        ts = pd.Timestamp(row["datetime"])
+        parts = [f"{c} = {row[c]:,.1f}" for c in ("spread_SBP_vs_MIP", "vol_spread_SBP_vs_MIP")
+                 if c in row and row[c] is not None and not math.isnan(row[c])]
+        text = f"⚠️ Regime {regime} from {ts:%Y-%m-%d %H:%M} UTC" + (f" | {', '.join(parts)}" if parts else "")
+        return [{"key": f"regime:{ts.isoformat()}:{regime}", "kind": "regime",
+                 "status": "opened", "datetime": ts, "text": text}]
+
+    def evaluate(self, row: Mapping) -> list[dict]:
+        """Alerts triggered by one settlement period (rows must arrive in datetime order)."""
+        alerts = [self._event_alert(r) for r in self.detector.update(row) if r["status"] != "updated"]
+        return alerts + self._regime_alert(row)
+
+
+# ───────────────────────── sender ──────────────────────────
+class SlackSender:
+    """Batched, rate-limited, non-blocking poster to a Slack incoming webhook."""
+
+    def __init__(
+        self,
+        url: str,
+        rate: float = 1.0,
+        burst: int = 1,
+        max_batch: int = 20,
+        linger: float = 0.5,
+        max_retries: int = 5,
+        timeout: float = 10.0,
+        maxsize: int = 10_000,
+    ):
+        self.url = url
+        self.bucket = TokenBucket(rate, burst)
+        self.max_batch, self.linger = max_batch, linger
+        self.max_retries, self.timeout = max_retries, timeout
+        self.sent = self.posts = self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._worker = threading.Thread(target=self._run, name="slack-sender", daemon=True)
+        self._worker.start()
+
+    def send(self, alert: dict) -> bool:
+        """Enqueue *alert*; never blocks. False (and counted as dropped) if the queue is full."""
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout: float | None = None) -> None:
+        """Deliver everything queued so far, then stop the worker."""
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def _collect(self, first) -> tuple[list[dict], bool]:
+        batch, stop = [first], False
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            self.bucket.acquire()
+            while not stop and len(batch) < self.max_batch:        # top up while we waited
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if self._post({"text": "\n".join(a["text"] for a in batch)}):
+                self.sent += len(batch)
+            else:
+                self.dropped += len(batch)
+
+    def _post(self, payload: dict) -> bool:
+        body = json.dumps(payload).encode()
+        for attempt in range(1, self.max_retries + 1):
+            req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout):
+                    self.posts += 1
+                    return True
+            except urllib.error.HTTPError as e:
+                if e.code != 429 and e.code < 500:
+                    print(f"❌ Slack webhook rejected the message (HTTP {e.code})")
+                    return False
+                retry_after = e.headers.get("Retry-After")
+                wait = float(retry_after) if retry_after else backoff_delay(attempt)
+            except (urllib.error.URLError, TimeoutError) as e:
+                wait = backoff_delay(attempt)
+                print(f"⚠️  Slack webhook unreachable ({e}); retry {attempt}/{self.max_retries}")
+            time.sleep(wait)
+        print(f"❌ Slack webhook: giving up after {self.max_retries} attempts")
+        return False
+
+
+# ───────────────────────── service ──────────────────────────
+class AlertService:
+    """Poll *source* for rows newer than the last one seen and alert on them."""
+
+    def __init__(self, source: str | Path, rules: AlertRules, sender: SlackSender, poll: float = 1.0):
+        self.source = Path(source)
+        self.rules, self.sender, self.poll = rules, sender, poll
+        self.last: pd.Timestamp | None = None
+        self._stamp = 0
+
+    def start(self, warm_up: pd.Timedelta | None = pd.Timedelta(days=30), holdback: int = 0) -> int:
+        """
+        Prime the rules from the stored history; later rows are treated as new.
+        *holdback* leaves the last N stored rows out, so they are alerted on.
+        """
+        self._stamp = dataset_mtime(self.source)
+        if not self._stamp:
+            return 0
+        times = read_dataset(self.source, columns=["datetime"])["datetime"]
+        if len(times) <= holdback:
+            return 0
+        self.last = times.iloc[-1 - holdback]
+        start = self.last - warm_up if warm_up is not None else None
+        history = read_dataset(self.source, start=start, end=self.last)
+        self.rules.prime(history)
+        return len(history)
+
+    def poll_once(self, force: bool = False) -> int:
+        """Alert on rows landed since the previous call; returns the number of new rows."""
+        stamp = dataset_mtime(self.source)
+        if not stamp or (stamp == self._stamp and not force):
+            return 0
+        try:
+            new = read_dataset(self.source, after=self.last)
+        except (FileNotFoundError, OSError) as e:                # caught mid-swap; next poll retries
+            print(f"⚠️  {self.source}: {e}")
+            return 0
+        self._stamp = stamp
+        for row in new.to_dict("records"):
+            for alert in self.rules.evaluate(row):
+                self.sender.send(alert)
+        if len(new):
+            self.last = new["datetime"].iloc[-1]
+        return len(new)
+
+    def run_forever(self, stop: threading.Event | None = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            n = self.poll_once()
+            if n:
+                print(f"📥 {n} new half-hour(s) up to {self.last}")
+            stop.wait(self.poll)
@@ -0,0 +1,66 @@
+"""
+Watch the regimes table and post spread-risk alerts to Slack.
+
+Rules come from config/detection.yml (event drivers) and the regime_flag
+column; see gbpower.alerts for the deduplication and batching rules.
+
+Run from the repo root:
+    SLACK_WEBHOOK_URL=https://hooks.slack.com/services/… python -m gbpower.cli.alerts
+    python -m gbpower.cli.alerts --webhook URL --min-regime HIGH_VOL --poll 2
+    python -m gbpower.cli.alerts --replay 48    # treat the last day as new, alert, exit
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+import pandas as pd
+
+from gbpower.alerts import SEVERITY, AlertRules, AlertService, SlackSender
+
+SOURCE = "data/processed/final_merged_with_regimes.parquet"
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--source", default=SOURCE, help="dataset to watch (default: %(default)s)")
+    p.add_argument("--config", default="config/detection.yml")
+    p.add_argument("--webhook", default=os.getenv("SLACK_WEBHOOK_URL"),
+                   help="Slack incoming-webhook URL (default: $SLACK_WEBHOOK_URL)")
+    p.add_argument("--min-regime", default="EXTREME", choices=[r for r, s in SEVERITY.items() if s])
+    p.add_argument("--poll", type=float, default=1.0, help="seconds between checks for new rows")
+    p.add_argument("--rate", type=float, default=1.0, help="webhook posts per second")
+    p.add_argument("--warm-up-days", type=float, default=30, help="history used to prime the thresholds")
+    p.add_argument("--replay", type=int, metavar="N",
+                   help="prime on all but the last N rows, alert on those and exit")
+    args = p.parse_args(argv)
+    if not args.webhook:
+        p.error("no webhook: pass --webhook or set SLACK_WEBHOOK_URL")
+
+    sender = SlackSender(args.webhook, rate=args.rate)
+    svc = AlertService(args.source, AlertRules(args.config, args.min_regime), sender, poll=args.poll)
+    warm_up = pd.Timedelta(days=args.warm_up_days)
+
+    if args.replay:
+        svc.start(warm_up, holdback=args.replay)
+        n = svc.poll_once(force=True)
+        sender.close()
+        print(f"✅ {n} row(s) checked, {sender.sent} alert(s) sent, {sender.dropped} dropped")
+        return 0 if not sender.dropped else 1
+
+    rows = svc.start(warm_up)
+    print(f"👀 Watching {args.source} from {svc.last} (primed on {rows:,} rows)")
+    stop = threading.Event()
+    try:
+        svc.run_forever(stop)
+    except KeyboardInterrupt:
+        stop.set()
+    finally:
+        sender.close(timeout=30)
+    print(f"✅ {sender.sent} alert(s) sent, {sender.dropped} dropped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
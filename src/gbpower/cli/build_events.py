@@ -1,11 +1,55 @@
 import argparse
-import pandas as pd
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+from gbpower.data.cache import open_cached
+from gbpower.data.storage import write_dataset
 from gbpower.events.detection import detect_extreme_events
 from gbpower.events.annotate import annotate_df
-from gbpower.events.plotting import plot_event
+from gbpower.events.plotting import event_window, render_event, render_key
+from gbpower.profiling import add_profile_args, maybe_profile, stage
+
+RENDER_CACHE = ".render_cache.json"
+
+def render_figures(annotated, log, figdir: Path, jobs: int = 1) -> list[Path]:
+    """
+    Render one figure per event row of *log*, skipping unchanged ones.
+
+    Each job gets only its event's window (searchsorted slice of the sorted
+    frame). A figure is re-rendered only when its file is missing or the
+    hash of its data slice and plot style differs from the cached one.
+    """
+    cache_path = figdir / RENDER_CACHE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+    if not annotated["datetime"].is_monotonic_increasing:
+        annotated = annotated.sort_values("datetime", kind="stable")
+
+    todo, done = [], []
+    for _, row in log.iterrows():
+        fpath = figdir / f"event_{int(row.event_id):03}.png"
+        sub = event_window(annotated, row)
+        key = render_key(sub, row)
+        if fpath.exists() and cache.get(fpath.name) == key:
+            print("⏭", fpath, "(unchanged)")
+            done.append(fpath)
+            continue
+        cache[fpath.name] = key
+        todo.append((sub, row, fpath))
 
-def main():
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(render_event, sub, row, fpath) for sub, row, fpath in todo]
+            rendered = [f.result() for f in futures]
+    else:
+        rendered = [render_event(sub, row, fpath) for sub, row, fpath in todo]
+    for fpath in rendered:
+        print("📊", fpath)
+
+    cache_path.write_text(json.dumps(cache, indent=2))
+    return done + rendered
+
+def main(argv: list[str] | None = None):
     p = argparse.ArgumentParser(description="Build event log + figs")
     p.add_argument("--input",  required=True, default="data/processed/final_merged_with_regimes.parquet",)
     p.add_argument("--config", default="config/detection.yml")
@@ -13,9 +57,17 @@ def main():
     p.add_argument("--figdir", default="reports/figures")
     p.add_argument("--top",    type=int, default=20,
                    help="How many largest events to plot")
-    args = p.parse_args()
+    p.add_argument("--jobs",   type=int, default=1,
+                   help="Render figures in N worker processes")
+    add_profile_args(p)
+    args = p.parse_args(argv)
+    with maybe_profile("build_events", args):
+        build(args)
 
-    df  = pd.read_parquet(args.input)
+def build(args):
+    with stage("open_cached") as probe:
+        df = open_cached(args.input)
+        probe.rows_out = len(df)
     log = detect_extreme_events(df, args.config)
     outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
     log_path = outdir / "event_log.parquet"; log.to_parquet(log_path)
@@ -24,16 +76,15 @@ def main():
     # annotate & overwrite parquet ready for ML
     annotated = annotate_df(df, log)
     ann_path = outdir / "features_with_events.parquet"
-    annotated.to_parquet(ann_path)
+    with stage("write_dataset", rows_in=len(annotated)):
+        write_dataset(annotated, ann_path)
     print(f"✅ Annotated feature set → {ann_path}")
 
     # plots for the top-N events by |peak_value|
     figdir = Path(args.figdir); figdir.mkdir(parents=True, exist_ok=True)
     top_log = log.nlargest(args.top, "peak_value")
-    for _, row in top_log.iterrows():
-        fpath = figdir / f"event_{int(row.event_id):03}.png"
-        plot_event(annotated, row, path=fpath)
-        print("📊", fpath)
+    with stage("render_figures", rows_in=len(top_log)):
+        render_figures(annotated, top_log, figdir, jobs=args.jobs)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,109 @@
+"""
+``gbpower`` – one entry point for every processing step.
+
+    gbpower collect {intraday,demand,neso,imbalance,forecast} [ARGS…]
+    gbpower merge    [ARGS…]      radar/utils/merging.py
+    gbpower regimes  [ARGS…]      src/pipelines/save_with_regimes.py
+    gbpower events   [ARGS…]      build_events (event log, annotation, figures)
+    gbpower sweep    [ARGS…]      event counts / durations per threshold × merge window
+    gbpower alerts   [ARGS…]      Slack alerting service
+    gbpower pipeline [ARGS…]      the whole DAG, skipping fresh stages
+
+Everything after the subcommand goes to that step's own parser, so
+``gbpower merge --help`` shows the merge options. This module imports
+nothing beyond the standard library: pandas, pyarrow, matplotlib, requests
+… load inside the subcommand that needs them, keeping ``gbpower --help``
+well under 150 ms.
+
+The collectors, merge and regimes steps are scripts of the repo (not part
+of the installed package), so run them from the repo root, as the pipeline
+does.
+
+Usage:
+    $ gbpower collect imbalance
+    $ gbpower merge --chunked --profile
+    $ python -m gbpower events --input data/processed/final_merged_with_regimes.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import runpy
+import sys
+from pathlib import Path
+
+COLLECTORS = {
+    "intraday": "radar/collectors/intraday_processor.py",
+    "demand": "radar/collectors/demand_data_proseccor.py",
+    "neso": "radar/collectors/NESO_demand_forecast_processor.py",
+    "imbalance": "radar/collectors/elexon_sbp_collector.py",
+    "forecast": "radar/collectors/ELEXON_forecast_demand_collector.py",
+}
+MERGE_SCRIPT = "radar/utils/merging.py"
+
+# name → (help, script path relative to the repo root | importable module with main(argv))
+COMMANDS = {
+    "collect": ("run one data collector", None),
+    "merge": ("merge the processed tables into final_merged.parquet", MERGE_SCRIPT),
+    "regimes": ("add regime flags to the feature table", "src.pipelines.save_with_regimes"),
+    "events": ("detect events, annotate the features, plot the top events", "gbpower.cli.build_events"),
+    "sweep": ("tabulate events over detection thresholds × merge windows", "gbpower.cli.sweep"),
+    "alerts": ("watch the merged table and post Slack alerts", "gbpower.cli.alerts"),
+    "pipeline": ("run every stale stage of the processing DAG", "gbpower.cli.pipeline"),
+}
+
+
+def run_script(path: str, argv: list[str], root: Path | None = None) -> int:
+    """Run a repo script as ``__main__`` with *argv*, the repo root importable."""
+    root = Path(root or Path.cwd()).resolve()
+    script = root / path
+    if not script.exists():
+        sys.exit(f"❌  {path} not found – run gbpower from the repo root")
+    sys.path.insert(0, str(root))
+    saved, sys.argv = sys.argv, [str(script), *argv]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    finally:
+        sys.argv = saved
+    return 0
+
+
+def run_module(name: str, argv: list[str], prog: str | None = None) -> int:
+    """Import *name* (only now) and call its ``main(argv)``."""
+    if name.startswith("src."):                             # repo tree, not the installed package
+        sys.path.insert(0, str(Path.cwd().resolve()))
+    saved, sys.argv = sys.argv, [prog or name, *argv]       # argv[0] names the step in --help
+    try:
+        return importlib.import_module(name).main(argv) or 0
+    finally:
+        sys.argv = saved
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="gbpower",
+        description="GB power processing steps. Arguments after COMMAND go to that step's\n"
+                    "own parser: gbpower merge --help shows the merge options.",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    sub = p.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for name, (help_, _) in COMMANDS.items():
+        sp = sub.add_parser(name, help=help_, add_help=False)
+        if name == "collect":
+            sp.add_argument("source", choices=sorted(COLLECTORS))
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args, rest = parser().parse_known_args(argv)          # the rest belongs to the subcommand
+    if args.command == "collect":
+        return run_script(COLLECTORS[args.source], rest)
+    target = COMMANDS[args.command][1]
+    if target.endswith(".py"):
+        return run_script(target, rest)
+    return run_module(target, rest, prog=f"gbpower {args.command}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Run the whole GB power pipeline, skipping stages whose inputs haven't changed.
+
+    collectors (parallel) ─┬─► merge ─────────────────────────────┐
+                           └─► neso_patch                          │
+    final_merged_with_features (notebook) ─► regimes ─► events ◄──┘ (via regimes)
+
+Run from the repo root:
+    python -m gbpower.cli.pipeline                  # everything that is stale
+    python -m gbpower.cli.pipeline --jobs 4         # collectors side by side
+    python -m gbpower.cli.pipeline --only merge     # merge + what it needs
+    python -m gbpower.cli.pipeline --dry-run        # list what would run
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+from gbpower.cli.main import COLLECTORS, MERGE_SCRIPT
+from gbpower.pipeline import Pipeline, Stage
+
+PROC = "data/processed"
+STATE = "data/interim/pipeline_state.json"
+# library code the stages import: an edit here invalidates them too
+DATA_LIB = "src/gbpower/data"                 # storage, align, gaps, ingest, settlement, cache, …
+PROFILING = "src/gbpower/profiling.py"
+
+
+def default_stages(python: str = sys.executable) -> list[Stage]:
+    def script(name, path, inputs=(), outputs=(), params=None, args=(), code=()):
+        return Stage(name, [python, path, *args], list(inputs), list(outputs),
+                     [path, DATA_LIB, *code], params or {})
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    return [
+        # ── collectors (independent) ──────────────────────────
+        script("intraday", COLLECTORS["intraday"],
+               ["data/raw/0000036990_MID_2024.csv", "data/raw/MID_2025.csv"],
+               [f"{PROC}/intraday_trades_raw.parquet", f"{PROC}/intraday_prices.parquet"]),
+        script("demand", COLLECTORS["demand"],
+               ["data/raw/demanddata_2024.csv", "data/raw/demanddata_2025.csv"],
+               [f"{PROC}/forecast_actual.parquet"]),
+        script("neso", COLLECTORS["neso"],
+               ["data/raw/archive_1dayahead.csv"],
+               [f"{PROC}/da_demand_forecast.parquet"]),
+        # API collectors: the portal file is re-published daily; the BMRS
+        # range is fixed in the script, so its code hash covers it
+        script("imbalance", COLLECTORS["imbalance"],
+               outputs=[f"{PROC}/imbalance_prices.parquet"], params={"as_of": today}),
+        script("forecast", COLLECTORS["forecast"],
+               outputs=[f"{PROC}/demand_forecast.parquet"]),
+        # ── downstream ────────────────────────────────────────
+        script("merge", MERGE_SCRIPT,
+               [f"{PROC}/intraday_trades_raw.parquet", f"{PROC}/imbalance_prices.parquet",
+                f"{PROC}/forecast_actual.parquet", f"{PROC}/demand_forecast.parquet"],
+               [f"{PROC}/final_merged.parquet"], args=["--chunked"], code=[PROFILING]),
+        script("neso_patch", "radar/utils/fill_Elexon_with_Neso.py",
+               [f"{PROC}/demand_forecast.parquet", f"{PROC}/da_demand_forecast.parquet"],
+               [f"{PROC}/demand_forecast_neso_patched.parquet"]),
+        Stage("regimes",
+              [python, "-m", "src.pipelines.save_with_regimes",
+               "--in", f"{PROC}/final_merged_with_features.parquet",
+               "--out", f"{PROC}/final_merged_with_regimes.parquet"],
+              inputs=[f"{PROC}/final_merged_with_features.parquet"],
+              outputs=[f"{PROC}/final_merged_with_regimes.parquet"],
+              code=["src/pipelines/save_with_regimes.py", "src/features/regime_flags.py",
+                    "src/features/rolling_quantile.py", DATA_LIB, PROFILING]),
+        Stage("events",
+              [python, "-m", "gbpower.cli.build_events",
+               "--input", f"{PROC}/final_merged_with_regimes.parquet",
+               "--outdir", PROC, "--figdir", "reports/figures"],
+              inputs=[f"{PROC}/final_merged_with_regimes.parquet", "config/detection.yml"],
+              outputs=[f"{PROC}/event_log.parquet", f"{PROC}/features_with_events.parquet"],
+              code=["src/gbpower/cli/build_events.py", "src/gbpower/events", DATA_LIB, PROFILING]),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--root", default=".", help="project root (default: cwd)")
+    p.add_argument("--only", nargs="+", metavar="STAGE", help="run these stages and their dependencies")
+    p.add_argument("--jobs", type=int, default=4, help="stages run concurrently")
+    p.add_argument("--force", action="store_true", help="ignore fingerprints, rerun everything selected")
+    p.add_argument("--dry-run", action="store_true", help="show which stages are stale")
+    p.add_argument("--list", action="store_true", help="list stages and exit")
+    args = p.parse_args(argv)
+
+    pipe = Pipeline(default_stages(), root=args.root, state_path=STATE)
+    if args.list:
+        for name, stage in pipe.stages.items():
+            deps = ", ".join(sorted(pipe.deps[name])) or "—"
+            print(f"{name:<11} ← {deps:<40} → {', '.join(stage.outputs)}")
+        return 0
+
+    t0 = time.perf_counter()
+    result = pipe.run(args.only, jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+    print("\n── Summary ──────────────────────────────")
+    for name, status in result.items():
+        print(f"{name:<11} {status}")
+    print(f"⏱  {time.perf_counter() - t0:.1f}s")
+    return 1 if any(s in ("failed", "blocked") for s in result.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
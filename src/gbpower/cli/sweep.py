@@ -0,0 +1,73 @@
+"""
+Sweep detection thresholds × merge windows on the feature table.
+
+The table is opened once (only the datetime and driver columns); each
+(threshold, merge_window) pair then costs a lookup and a re-split instead
+of a full ``build_events`` run.
+
+Ranges are comma lists or inclusive START:STOP:STEP.
+
+Run from the repo root:
+    python -m gbpower.cli.sweep                                  # 90:99.5:0.5 × 1:12
+    python -m gbpower.cli.sweep --thresholds 95,97.5,99 --windows 2,4,8
+    python -m gbpower.cli.sweep --drivers cashout_cost_GBP --jobs 8 --out reports/sweep.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import yaml
+
+from gbpower.data.cache import open_cached
+from gbpower.events.rules import RuleSet
+from gbpower.events.sweep import sweep
+
+
+def grid(text: str, cast=float) -> list:
+    """'1,2,4' or inclusive 'start:stop:step'."""
+    if ":" in text:
+        start, stop, step = (float(v) for v in text.split(":"))
+        return [cast(round(v, 6)) for v in np.arange(start, stop + step / 2, step)]
+    return [cast(v) for v in text.split(",")]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--input", default="data/processed/final_merged_with_regimes.parquet")
+    p.add_argument("--config", default="config/detection.yml")
+    p.add_argument("--thresholds", default="90:99.5:0.5", help="percentiles (default: %(default)s)")
+    p.add_argument("--windows", default="1:12:1", help="merge windows in half-hours (default: %(default)s)")
+    p.add_argument("--drivers", nargs="+", help="percentile drivers to sweep (default: all of them)")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    p.add_argument("--out", help="write the table here (.csv or .parquet)")
+    p.add_argument("--sort", help="sort the printed table by this column (descending)")
+    p.add_argument("--top", type=int, default=40, help="rows printed (default: %(default)s)")
+    args = p.parse_args(argv)
+
+    with open(args.config, "r") as fp:
+        config = yaml.safe_load(fp)
+    df = open_cached(args.input, ["datetime", *RuleSet(config).columns])
+
+    thresholds, windows = grid(args.thresholds), grid(args.windows, int)
+    t0 = time.perf_counter()
+    table = sweep(df, config, thresholds, windows, drivers=args.drivers, jobs=args.jobs)
+    took = time.perf_counter() - t0
+    print(f"✓ {len(table):,} combinations on {len(df):,} rows in {took:.2f}s")
+
+    shown = table.sort_values(args.sort, ascending=False, kind="stable") if args.sort else table
+    print(shown.head(args.top).to_string(index=False, float_format="{:,.1f}".format))
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        if args.out.endswith(".parquet"):
+            table.to_parquet(args.out, index=False)
+        else:
+            table.to_csv(args.out, index=False)
+        print(f"💾 {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
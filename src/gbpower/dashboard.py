@@ -0,0 +1,171 @@
+"""
+Query backend for the Streamlit dashboard (``app.py``).
+
+The merged half-hourly table is loaded once per process and kept as plain
+NumPy columns on an int64 time axis. Everything a widget asks for is then
+a binary search plus a slice:
+
+• ``series``  – raw half-hours for short windows, MinMaxLTTB-downsampled
+                (≤ ``max_points`` per trace) for long ones
+• ``rollup``  – daily / weekly / monthly mean, min, max, std of every series
+                plus regime shares, precomputed at load
+• ``summary`` – window mean / std / count from prefix sums, O(1) per query
+
+Usage:
+    >>> from gbpower.dashboard import load_dashboard
+    >>> data = load_dashboard("data/processed/final_merged_with_regimes.parquet")
+    >>> traces = data.series(["spread_SBP_vs_MIP"], "2024-01-01", "2025-05-01")
+    >>> weekly = data.rollup("weekly", "2024-01-01", "2025-05-01")
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gbpower.data.downsample import minmax_lttb
+from gbpower.data.cache import cached_table
+from gbpower.data.storage import dataset_mtime
+
+PRICES = {
+    "sbp_IMBALANCE": "SBP",
+    "ssp_IMBALANCE": "SSP",
+    "mip_price_INTRADAY": "MIP (intraday VWAP)",
+}
+SPREADS = {
+    "spread_SBP_vs_MIP": "SBP − MIP",
+    "spread_MIP_vs_SSP": "MIP − SSP",
+}
+VOLATILITY = {
+    "vol_spread_SBP_vs_MIP": "σ(SBP − MIP), 24 h",
+    "vol_spread_MIP_vs_SSP": "σ(MIP − SSP), 24 h",
+    "vol_err_TSD_%": "σ(TSD forecast error %), 24 h",
+}
+LABELS = {**PRICES, **SPREADS, **VOLATILITY}
+REGIMES = ["NORMAL", "HIGH_VOL", "EXTREME"]
+# resample arguments per rollup; every bin is labelled by its first day, and
+# weeks are calendar weeks Monday 00:00 → Sunday 23:30 (UTC)
+ROLLUPS = {
+    "daily": {"rule": "D"},
+    "weekly": {"rule": "W-MON", "label": "left", "closed": "left"},
+    "monthly": {"rule": "MS"},
+}
+MAX_POINTS = 2000
+
+
+class DashboardData:
+    """Memory-resident, query-ready view of the merged table."""
+
+    def __init__(self, df: pd.DataFrame, max_points: int = MAX_POINTS):
+        if not df["datetime"].is_monotonic_increasing:
+            df = df.sort_values("datetime", kind="stable")
+        self.max_points = max_points
+        self.index = pd.DatetimeIndex(df["datetime"]).tz_convert("UTC")
+        self.t = self.index.as_unit("ns").asi8
+        self.columns = [c for c in LABELS if c in df.columns]
+        self.values = {c: df[c].to_numpy(dtype="float64", na_value=np.nan) for c in self.columns}
+        self.regime = (
+            pd.Categorical(df["regime_flag"].astype("string"), categories=REGIMES).codes
+            if "regime_flag" in df.columns else None
+        )
+        self._prefix = {c: self._prefix_sums(v) for c, v in self.values.items()}
+        self.rollups = {name: self._build_rollup(**kw) for name, kw in ROLLUPS.items()}
+
+    @classmethod
+    def from_parquet(cls, path: str | Path, **kw) -> "DashboardData":
+        table = cached_table(path)
+        cols = [c for c in ["datetime", *LABELS, "regime_flag"] if c in table.schema.names]
+        return cls(table.select(cols).to_pandas(split_blocks=True), **kw)
+
+    # ───────────────────── precomputation ─────────────────────
+    @staticmethod
+    def _prefix_sums(v: np.ndarray) -> np.ndarray:
+        ok = ~np.isnan(v)
+        x = np.where(ok, v, 0.0)
+        return np.vstack([np.r_[0, np.cumsum(ok)], np.r_[0.0, np.cumsum(x)], np.r_[0.0, np.cumsum(x * x)]])
+
+    def _build_rollup(self, **resample) -> pd.DataFrame:
+        frame = pd.DataFrame(self.values, index=self.index)
+        g = frame.resample(**resample)
+        out = pd.concat({"mean": g.mean(), "min": g.min(), "max": g.max(), "std": g.std()}, axis=1)
+        out.columns = [f"{c}_{stat}" for stat, c in out.columns]
+        if self.regime is not None:
+            onehot = pd.DataFrame(
+                {f"share_{r}": (self.regime == i).astype("float64") for i, r in enumerate(REGIMES)},
+                index=self.index,
+            )
+            out = out.join(onehot.resample(**resample).mean())
+        return out
+
+    # ───────────────────── queries ─────────────────────
+    def _bounds(self, start, end) -> tuple[int, int]:
+        lo = 0 if start is None else self.t.searchsorted(_ns(start), side="left")
+        hi = len(self.t) if end is None else self.t.searchsorted(_ns(end), side="right")
+        return int(lo), int(hi)
+
+    def span(self) -> tuple[pd.Timestamp, pd.Timestamp]:
+        return self.index[0], self.index[-1]
+
+    def series(self, cols, start=None, end=None, max_points: int | None = None) -> dict[str, pd.DataFrame]:
+        """``{col: DataFrame(datetime, value)}`` for the window, downsampled if longer than *max_points*."""
+        lo, hi = self._bounds(start, end)
+        n_out = max_points or self.max_points
+        t = self.t[lo:hi]
+        out = {}
+        for c in cols:
+            y = self.values[c][lo:hi]
+            idx = minmax_lttb(t, y, n_out) if hi - lo > n_out else np.arange(hi - lo)
+            out[c] = pd.DataFrame({"datetime": self.index[lo:hi][idx], "value": y[idx]})
+        return out
+
+    def regimes(self, start=None, end=None) -> pd.DataFrame:
+        """One row per run of equal regime in the window (run start + regime_flag); empty without regimes."""
+        if self.regime is None:
+            return pd.DataFrame({"datetime": self.index[:0],
+                                 "regime_flag": pd.Categorical([], categories=REGIMES)})
+        lo, hi = self._bounds(start, end)
+        codes = self.regime[lo:hi]
+        idx = np.r_[0, np.flatnonzero(codes[1:] != codes[:-1]) + 1] if len(codes) else np.arange(0)
+        return pd.DataFrame({"datetime": self.index[lo:hi][idx],
+                             "regime_flag": pd.Categorical.from_codes(codes[idx], categories=REGIMES)})
+
+    def rollup(self, level: str, start=None, end=None, cols=None) -> pd.DataFrame:
+        table = self.rollups[level]
+        table = table.loc[_ts(start) if start is not None else None:_ts(end) if end is not None else None]
+        if cols is not None:
+            keep = [c for c in table.columns if any(c.startswith(f"{k}_") for k in cols) or c.startswith("share_")]
+            table = table[keep]
+        return table
+
+    def summary(self, start=None, end=None) -> pd.DataFrame:
+        """Count, mean and std of every series over the window, from prefix sums."""
+        lo, hi = self._bounds(start, end)
+        rows = {}
+        for c, (cnt, s, s2) in self._prefix.items():
+            n, tot, sq = cnt[hi] - cnt[lo], s[hi] - s[lo], s2[hi] - s2[lo]
+            mean = tot / n if n else np.nan
+            var = (sq - n * mean * mean) / (n - 1) if n > 1 else np.nan
+            rows[c] = {"label": LABELS[c], "count": int(n), "mean": mean, "std": np.sqrt(max(var, 0.0))}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def _ts(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _ns(value) -> int:
+    return _ts(value).as_unit("ns").value
+
+
+@lru_cache(maxsize=4)
+def _load(path: str, mtime_ns: int, max_points: int) -> DashboardData:
+    return DashboardData.from_parquet(path, max_points=max_points)
+
+
+def load_dashboard(path: str | Path, max_points: int = MAX_POINTS) -> DashboardData:
+    """One DashboardData per (path, modification time) per process."""
+    return _load(str(path), dataset_mtime(path), max_points)
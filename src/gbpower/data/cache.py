@@ -0,0 +1,116 @@
+"""
+Memory-mapped Arrow IPC cache of processed datasets.
+
+Reading a partitioned parquet dataset decompresses every page and gives
+each process a private copy. ``open_cached`` instead
+
+• fingerprints the source from its file names, sizes and mtimes (a stat
+  per file, no reads)
+• on a miss, reads it once and writes an uncompressed Arrow IPC file
+  ``<cache_dir>/<name>-<fingerprint>.arrow`` (nulls in float columns become
+  NaN so pandas can use the buffers as they are), then deletes older
+  fingerprints of the same source
+• memory-maps that file: numeric and timestamp columns reach pandas
+  without a copy, and every process opening it shares the same pages
+
+A changed source gets a new fingerprint, so stale entries are never read.
+Writers publish with an atomic rename, so concurrent builders are safe.
+
+Frames are backed by read-only memory: replacing or adding columns works,
+in-place writes (``df.loc[mask, col] = …``) need a ``.copy()`` first.
+
+Usage:
+    >>> from gbpower.data.cache import open_cached
+    >>> df = open_cached("data/processed/final_merged_with_regimes.parquet")   # ms when warm
+    >>> spreads = open_cached(path, columns=["datetime", "spread_SBP_vs_MIP"])
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from gbpower.data.storage import TIME_COL, read_table
+
+CACHE_DIR = Path("data/interim/cache")
+
+
+def fingerprint(path: str | Path) -> str:
+    """Hash of (relative name, size, mtime_ns) of every file in the dataset."""
+    path = Path(path)
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    h = hashlib.sha1(str(path.resolve()).encode())
+    for f in files:
+        st = f.stat()
+        h.update(f"{f.relative_to(path) if f != path else f.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()[:16]
+
+
+def cache_path(path: str | Path, cache_dir: str | Path | None = None) -> Path:
+    """Cache entry for *path* in *cache_dir* (default: ``CACHE_DIR``, looked up at call time)."""
+    path = Path(path)
+    return Path(cache_dir or CACHE_DIR) / f"{path.name.removesuffix('.parquet')}-{fingerprint(path)}.arrow"
+
+
+def _nan_for_null(table: pa.Table) -> pa.Table:
+    """Float columns with NaN instead of nulls, so to_pandas needn't allocate a masked copy."""
+    for i, field in enumerate(table.schema):
+        col = table.column(i)
+        if pa.types.is_floating(field.type) and col.null_count:
+            table = table.set_column(i, field, pc.fill_null(col, float("nan")))
+    return table
+
+
+def _read(path: Path) -> pa.Table:
+    """Whole dataset, datetime-sorted like ``read_dataset``, NaN for float nulls."""
+    table = read_table(path)
+    if TIME_COL in table.schema.names:
+        t = table.column(TIME_COL)
+        if len(t) > 1 and not pc.all(pc.greater_equal(t[1:], t[:-1])).as_py():
+            table = table.take(pc.sort_indices(table, [(TIME_COL, "ascending")]))
+    return _nan_for_null(table).combine_chunks()     # one chunk per column: to_pandas can use it as is
+
+
+def _publish(table: pa.Table, path: Path, target: Path) -> bool:
+    """Write *table* to *target* atomically; False if *path* changed since *target* was named."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    if cache_path(path, target.parent) != target:
+        tmp.unlink()
+        return False
+    os.replace(tmp, target)
+    stem = target.name.rsplit("-", 1)[0]
+    for old in target.parent.glob(f"{stem}-*.arrow"):
+        if old != target and old.name.rsplit("-", 1)[0] == stem:
+            old.unlink(missing_ok=True)                  # mapped readers keep their pages
+    return True
+
+
+def cached_table(path: str | Path, cache_dir: str | Path | None = None) -> pa.Table:
+    """The dataset as a memory-mapped Arrow table, (re)building the cache entry if needed."""
+    path = Path(path)
+    target = cache_path(path, cache_dir)
+    if not target.exists():
+        table = _read(path)
+        if not _publish(table, path, target):
+            return table                                 # source changed mid-read: serve uncached
+    return pa.ipc.open_file(pa.memory_map(str(target), "r")).read_all()
+
+
+def open_cached(
+    path: str | Path,
+    columns: list[str] | None = None,
+    cache_dir: str | Path | None = None,
+) -> pd.DataFrame:
+    """Drop-in for ``read_dataset(path, columns=…)`` served from the mmap cache."""
+    table = cached_table(path, cache_dir)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
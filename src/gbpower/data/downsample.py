@@ -0,0 +1,101 @@
+"""
+Shape-preserving downsampling of long time series for plotting.
+
+• ``lttb``         – Largest-Triangle-Three-Buckets: keeps the points that
+                     span the largest triangles, so peaks and turns survive
+• ``minmax_lttb``  – MinMaxLTTB: first keeps only each small bucket's min and
+                     max (vectorised), then runs LTTB on those candidates;
+                     the global min and max are always in the result
+
+Both return sorted integer indices into the input, so every column of a
+frame can be gathered with one ``take``.
+
+Usage:
+    >>> from gbpower.data.downsample import minmax_lttb
+    >>> idx = minmax_lttb(df["datetime"], df["spread_SBP_vs_MIP"], n_out=2000)
+    >>> small = df.iloc[idx]
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+MINMAX_RATIO = 4        # candidates per output point kept by the min/max pass
+
+
+def _as_float(x) -> np.ndarray:
+    """Monotonic x as float64 offsets (datetimes → ns since the first point)."""
+    if isinstance(x, (pd.Series, pd.Index)) and pd.api.types.is_datetime64_any_dtype(x):
+        x = pd.DatetimeIndex(x).asi8
+    x = np.asarray(x)
+    if x.dtype.kind == "M":
+        x = x.view("int64")
+    return (x - x[0]).astype("float64") if len(x) else x.astype("float64")
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Indices of *n_out* points chosen by Largest-Triangle-Three-Buckets."""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf = _as_float(x)
+
+    # bucket i (1…n_out-2) covers [edges[i-1], edges[i]); first/last points are fixed
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype("int64") + 1
+    edges[-1] = n - 1
+    # the average point of each next bucket doesn't depend on the selection
+    nxt_lo = edges[1:]
+    nxt_hi = np.r_[edges[2:], n]
+    csx, csy = np.r_[0.0, np.cumsum(xf)], np.r_[0.0, np.cumsum(y)]
+    cnt = nxt_hi - nxt_lo
+    avg_x = (csx[nxt_hi] - csx[nxt_lo]) / cnt
+    avg_y = (csy[nxt_hi] - csy[nxt_lo]) / cnt
+
+    xs, ys = xf.tolist(), y.tolist()
+    out = [0]
+    a = 0
+    for b in range(n_out - 2):
+        xa, ya = xs[a], ys[a]
+        dx, dy = avg_x[b] - xa, avg_y[b] - ya
+        best, best_area = edges[b], -1.0
+        for j in range(edges[b], edges[b + 1]):
+            area = abs(dx * (ys[j] - ya) - dy * (xs[j] - xa))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(best)
+        a = best
+    out.append(n - 1)
+    return np.asarray(out, dtype="int64")
+
+
+def minmax_lttb(x, y, n_out: int, ratio: int = MINMAX_RATIO) -> np.ndarray:
+    """
+    Indices of about *n_out* points: min/max preselection, then LTTB.
+
+    NaN values are dropped first. The global min and max are added if LTTB
+    didn't pick them, so the result can hold up to ``n_out + 2`` points.
+    """
+    y = np.asarray(y, dtype="float64")
+    keep = np.flatnonzero(~np.isnan(y))
+    if len(keep) <= n_out:
+        return keep
+    yk, xk = y[keep], _as_float(x)[keep]
+
+    n = len(yk)
+    cand = np.arange(n)
+    n_buckets = max(1, (n_out * ratio) // 2)
+    if n > 2 * n_buckets:
+        size = -(-n // n_buckets)
+        n_buckets = -(-n // size)
+        pad = np.full(n_buckets * size, np.nan)
+        pad[:n] = yk
+        grid = pad.reshape(n_buckets, size)
+        base = np.arange(n_buckets) * size
+        cand = np.unique(np.r_[0, base + np.nanargmin(grid, axis=1),
+                               base + np.nanargmax(grid, axis=1), n - 1])
+
+    picked = cand[lttb(xk[cand], yk[cand], n_out)]
+    picked = np.union1d(picked, [np.argmin(yk), np.argmax(yk)])
+    return keep[picked]
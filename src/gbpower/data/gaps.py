@@ -0,0 +1,146 @@
+"""
+Missing half-hours and priority gap-filling on int64 slot numbers.
+
+A timestamp on the 30-minute settlement grid is one integer:
+
+    slot = epoch_ns // 30 min
+
+so a series' gaps are where consecutive (sorted, distinct) slots differ by
+more than one. No full ``date_range`` is built and no timestamp is boxed
+into a Python set:
+
+• :func:`missing_runs` returns the gaps as compact ``(start, length)``
+  arrays from a single ``np.diff``; :func:`find_gaps` gives them as a frame
+• :func:`fill` merges sources in priority order (Elexon → NESO → …) in one
+  sort: every slot takes the value of the first source that has a non-null
+  one there, and a categorical ``source`` column records which
+
+Usage:
+    >>> from gbpower.data.gaps import count_missing, find_gaps, fill
+    >>> count_missing(df["datetime"])
+    >>> find_gaps(df["datetime"]).head(3)             # start, end, n_missing
+    >>> patched = fill([("elexon", elexon), ("neso", neso)], column="nd")
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+HALF_HOUR = pd.Timedelta(minutes=30)
+_NAT = np.iinfo("int64").min
+
+
+def to_slots(times, freq: pd.Timedelta = HALF_HOUR) -> np.ndarray:
+    """int64 slot (epoch // *freq*) of every timestamp, NaT dropped; naive = UTC."""
+    ns = pd.DatetimeIndex(times).as_unit("ns").asi8
+    return ns[ns != _NAT] // freq.value
+
+
+def _distinct(slots: np.ndarray) -> np.ndarray:
+    """Sorted distinct slots (no sort when already in order)."""
+    if len(slots) and not (slots[1:] >= slots[:-1]).all():
+        slots = np.sort(slots)
+    return slots[np.r_[True, slots[1:] != slots[:-1]]] if len(slots) else slots
+
+
+def missing_runs(
+    slots: np.ndarray, start: int | None = None, end: int | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    First slot and length of every run of missing slots between *start* and
+    *end* (inclusive; default: the first and last slot present).
+    """
+    s = _distinct(np.asarray(slots, dtype="int64"))
+    if start is not None:
+        s = s[s >= start]
+    if end is not None:
+        s = s[s <= end]
+    if not len(s):
+        if start is None or end is None or end < start:
+            return np.zeros(0, dtype="int64"), np.zeros(0, dtype="int64")
+        return np.array([start]), np.array([end - start + 1])
+
+    # pad with the slot before start / after end so the edges are gaps too
+    lo = s[0] if start is None else min(start - 1, s[0])
+    hi = s[-1] if end is None else max(end + 1, s[-1])
+    step = np.diff(np.r_[lo, s, hi])
+    s = np.r_[lo, s]
+    at = np.flatnonzero(step > 1)
+    return s[at] + 1, step[at] - 1
+
+
+def _stamps(slots: np.ndarray, freq: pd.Timedelta, like: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Slots back to timestamps, in the unit and time zone of *like*."""
+    out = pd.DatetimeIndex((slots * freq.value).view("M8[ns]")).as_unit(like.unit)
+    return out.tz_localize("UTC").tz_convert(like.tz) if like.tz is not None else out
+
+
+def _runs(times, start, end, freq: pd.Timedelta):
+    idx = pd.DatetimeIndex(times)
+    bound = [None if t is None else int(to_slots([pd.Timestamp(t)], freq)[0]) for t in (start, end)]
+    return idx, *missing_runs(to_slots(idx, freq), *bound)
+
+
+def count_missing(times, start=None, end=None, freq: pd.Timedelta = HALF_HOUR) -> int:
+    """Number of missing *freq* periods in *times* (between *start* and *end* if given)."""
+    return int(_runs(times, start, end, freq)[2].sum())
+
+
+def find_gaps(times, start=None, end=None, freq: pd.Timedelta = HALF_HOUR) -> pd.DataFrame:
+    """One row per gap: first and last missing timestamp and ``n_missing``."""
+    idx, starts, lengths = _runs(times, start, end, freq)
+    return pd.DataFrame({"start": _stamps(starts, freq, idx),
+                         "end": _stamps(starts + lengths - 1, freq, idx),
+                         "n_missing": lengths})
+
+
+def fill(
+    sources: Sequence[tuple[str, pd.DataFrame]],
+    column: str,
+    key: str = "datetime",
+    span: tuple | None = None,
+    freq: pd.Timedelta = HALF_HOUR,
+) -> pd.DataFrame:
+    """
+    Patch *column* across *sources* (``(name, frame)``, highest priority first).
+
+    Every slot in *span* (default: the first source's first → last
+    timestamp) takes the first non-null value in priority order; duplicate
+    rows within a source keep the first. Returns *key*, *column* and
+    ``source`` (categorical, categories in priority order), sorted by *key*,
+    one row per slot that any source could fill.
+    """
+    if not sources:
+        raise ValueError("no sources to fill from")
+    names = [name for name, _ in sources]
+    like = pd.DatetimeIndex(sources[0][1][key])
+
+    slots, prio, values = [], [], []
+    for i, (_, df) in enumerate(sources):
+        ns = pd.DatetimeIndex(df[key]).as_unit("ns").asi8
+        ok = (ns != _NAT) & df[column].notna().to_numpy()
+        slots.append(ns[ok] // freq.value)
+        prio.append(np.full(int(ok.sum()), i, dtype="int64"))
+        values.append(df[column][ok])
+    slot, prio = np.concatenate(slots), np.concatenate(prio)
+
+    if span is None:
+        first = to_slots(sources[0][1][key], freq)
+        span = (first.min(), first.max()) if len(first) else (0, -1)
+    else:
+        span = tuple(int(to_slots([pd.Timestamp(t)], freq)[0]) for t in span)
+    inside = np.flatnonzero((slot >= span[0]) & (slot <= span[1]))
+
+    # 1 ── one stable sort on (slot, priority): the first row of each slot wins
+    order = inside[np.lexsort((prio[inside], slot[inside]))]
+    s = slot[order]
+    win = order[np.r_[True, s[1:] != s[:-1]]] if len(s) else order
+
+    # 2 ── gather the winners
+    stamps = _stamps(slot[win], freq, like)
+    value = pd.concat(values, ignore_index=True).array.take(win)
+    source = pd.Categorical.from_codes(prio[win], categories=names)
+    return pd.DataFrame({key: stamps, column: value, "source": source})
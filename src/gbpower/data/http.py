@@ -0,0 +1,70 @@
+"""
+Small, dependency-free helpers for polite API collectors.
+
+• TokenBucket    – thread-safe rate limiter (rate/s with a burst allowance)
+• backoff_delay  – exponential backoff with full jitter
+• atomic_write   – write-to-temp + rename, so a killed run never leaves a
+                   truncated file that a resume would mistake for a good one
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+
+class TokenBucket:
+    """Allow *rate* acquisitions per second on average, bursts up to *burst*."""
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._clock, self._sleep = clock, sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0, rng=random) -> float:
+    """Seconds to wait before retry *attempt* (1-based): U(0, min(cap, base·2^(n-1)))."""
+    return rng.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def atomic_write(path: str | Path, data: str | bytes, encoding: str = "utf-8") -> Path:
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if isinstance(data, str):
+        tmp.write_text(data, encoding=encoding)
+    else:
+        tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,133 @@
+"""
+Chunked, dtype-pinned CSV ingestion for the large raw files.
+
+• reads only the requested columns, with explicit compact dtypes
+  (int8 settlement periods, int32 MW, categorical provider ids …)
+• parses the settlement-date column with an explicit format, once per
+  distinct date
+• applies the date window chunk by chunk, so out-of-window rows are
+  dropped before they are ever concatenated
+• prints rows/s and peak traced memory per file
+
+Usage:
+    >>> from gbpower.data.ingest import find_columns, read_csv_window
+    >>> cols = find_columns(path, encoding="latin-1", date="date", sp="period")
+    >>> df = read_csv_window(path, date_col=cols["date"], date_format="%d/%m/%Y",
+    ...                      dtypes={cols["sp"]: "int8"}, start="2024-01-01")
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from gbpower.data.settlement import parse_dates
+
+CHUNK_ROWS = 100_000
+
+# dtypes shared by the collectors
+SP_DTYPE = "int8"          # settlement period 1…50
+MW_DTYPE = "int32"         # integer MW columns (demand, flows, capacities)
+PRICE_DTYPE = "float64"    # prices / volumes feed VWAP & cash-out sums → keep full precision
+
+
+def find_columns(path: str | Path, encoding: str = "utf-8", **tokens: str) -> dict[str, str]:
+    """Map each keyword to the first header column containing its token (case-insensitive)."""
+    header = pd.read_csv(path, nrows=0, encoding=encoding).columns
+    return {key: next(c for c in header if tok in c.lower()) for key, tok in tokens.items()}
+
+
+def _window(start, end) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """Naive date bounds for settlement dates.
+
+    A settlement date starts at London midnight, i.e. on or up to an hour
+    before its UTC midnight: in BST, periods 1–2 of date D+1 start at
+    D 23:00Z / 23:30Z. Hence the one-day margin on the upper side (none is
+    needed below *start*); callers trim to exact datetimes.
+    """
+    def _day(ts):
+        ts = pd.Timestamp(ts)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return ts.floor("D")
+
+    lo = _day(start) if start is not None else None
+    hi = _day(end) + pd.Timedelta(days=1) if end is not None else None
+    return lo, hi
+
+
+def read_csv_window(
+    path: str | Path,
+    *,
+    date_col: str,
+    date_format: str,
+    dtypes: dict[str, str] | None = None,
+    usecols: list[str] | None = None,
+    start=None,
+    end=None,
+    encoding: str = "utf-8",
+    chunksize: int = CHUNK_ROWS,
+    report: bool = True,
+) -> pd.DataFrame:
+    """
+    Stream *path* in chunks and return the rows whose *date_col* falls in the
+    window, with *date_col* parsed to datetime64 (naive, settlement date).
+
+    ``"category"`` dtypes are applied once after the chunks are joined, so
+    every chunk shares one set of categories. Stats land in
+    ``df.attrs["ingest"]``.
+    """
+    path = Path(path)
+    dtypes = dict(dtypes or {})
+    cats = [c for c, d in dtypes.items() if d == "category"]
+    read_dtypes = {c: ("str" if d == "category" else d) for c, d in dtypes.items()}
+    read_dtypes[date_col] = "str"
+    if usecols is not None and date_col not in usecols:
+        usecols = [date_col, *usecols]
+    lo, hi = _window(start, end)
+
+    tracing = tracemalloc.is_tracing()
+    if report and not tracing:
+        tracemalloc.start()
+    if report:
+        tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+
+    kept, n_read = [], 0
+    reader = pd.read_csv(
+        path, usecols=usecols, dtype=read_dtypes, encoding=encoding, chunksize=chunksize
+    )
+    with reader:
+        for chunk in reader:
+            n_read += len(chunk)
+            chunk[date_col] = parse_dates(chunk[date_col], date_format)
+            if lo is not None:
+                chunk = chunk[chunk[date_col] >= lo]
+            if hi is not None:
+                chunk = chunk[chunk[date_col] <= hi]
+            if len(chunk):
+                kept.append(chunk)
+
+    if kept:
+        df = pd.concat(kept, ignore_index=True)
+    else:
+        df = pd.read_csv(path, usecols=usecols, dtype=read_dtypes, encoding=encoding, nrows=0)
+        df[date_col] = pd.to_datetime(df[date_col], format=date_format)
+    for c in cats:
+        df[c] = df[c].astype("category")
+
+    secs = time.perf_counter() - t0
+    stats = {"file": path.name, "rows_read": n_read, "rows_kept": len(df), "seconds": secs}
+    if report:
+        stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        if not tracing:
+            tracemalloc.stop()
+        print(
+            f"📥 {path.name}: {len(df):,}/{n_read:,} rows kept | "
+            f"{n_read / max(secs, 1e-9):,.0f} rows/s | peak {stats['peak_mb']:.1f} MB"
+        )
+    df.attrs["ingest"] = stats
+    return df
@@ -0,0 +1,98 @@
+"""
+Per-settlement-period aggregation of MID intraday trades.
+
+One sort + reduce pass over NumPy arrays: rows are ordered by period once,
+group boundaries are found with a diff, and every statistic is a
+``ufunc.reduceat`` over the same boundaries.
+
+Usage:
+    >>> from gbpower.data.intraday import aggregate_trades
+    >>> agg = aggregate_trades(trades)      # one row per datetime
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+AGG_COLUMNS = ["vwap_price", "mean_price", "min_price", "max_price", "std_price", "total_volume"]
+
+
+def _detect(df: pd.DataFrame, token: str) -> str:
+    return next(c for c in df.columns if token in c.lower())
+
+
+def _sort_codes(s: pd.Series) -> np.ndarray:
+    """Integer/real codes that sort like *s* (datetimes → int64 epoch)."""
+    if isinstance(s.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(s):
+        return pd.DatetimeIndex(s).asi8
+    return s.to_numpy()
+
+
+def aggregate_trades(
+    df: pd.DataFrame,
+    price_col: str | None = None,
+    vol_col: str | None = None,
+    key: str = "datetime",
+) -> pd.DataFrame:
+    """
+    Collapse trade rows to one row per *key*.
+
+    Returns a frame with *key* plus ``vwap_price, mean_price, min_price,
+    max_price, std_price, total_volume``. NaN prices/volumes are skipped
+    like the pandas reducers; periods whose traded volume sums to zero get
+    a NaN ``vwap_price``.
+    """
+    price_col = price_col or _detect(df, "price")
+    vol_col = vol_col or _detect(df, "volume")
+
+    keys = df[key]
+    valid = keys.notna().to_numpy()
+    if not valid.all():
+        df, keys = df[valid], keys[valid]
+    if keys.empty:
+        return pd.DataFrame({key: keys, **{c: pd.Series(dtype="float64") for c in AGG_COLUMNS}})
+
+    codes = _sort_codes(keys)
+    price = df[price_col].to_numpy(dtype="float64", na_value=np.nan)
+    vol = df[vol_col].to_numpy(dtype="float64", na_value=np.nan)
+
+    # 1 ── one stable sort (skipped when the input is already ordered)
+    if (codes[1:] >= codes[:-1]).all():
+        order = None
+    else:
+        order = np.argsort(codes, kind="stable")
+        codes, price, vol = codes[order], price[order], vol[order]
+
+    starts = np.r_[0, np.flatnonzero(codes[1:] != codes[:-1]) + 1]
+    lengths = np.diff(np.r_[starts, len(codes)])
+
+    # 2 ── grouped reductions
+    p_ok = ~np.isnan(price)
+    v_ok = ~np.isnan(vol)
+    pv_ok = p_ok & v_ok
+
+    n = np.add.reduceat(p_ok, starts).astype("float64")
+    p0 = np.where(p_ok, price, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.add.reduceat(p0, starts) / n
+        dev = np.where(p_ok, price - np.repeat(mean, lengths), 0.0)
+        std = np.sqrt(np.add.reduceat(dev * dev, starts) / (n - 1))
+        std[n < 2] = np.nan
+
+        pv = np.add.reduceat(np.where(pv_ok, price * vol, 0.0), starts)
+        w = np.add.reduceat(np.where(pv_ok, vol, 0.0), starts)
+        vwap = np.where(w != 0, pv / w, np.nan)
+
+    out_keys = keys.iloc[starts if order is None else order[starts]].reset_index(drop=True)
+    return pd.DataFrame(
+        {
+            key: out_keys,
+            "vwap_price": vwap,
+            "mean_price": mean,
+            "min_price": np.fmin.reduceat(price, starts),
+            "max_price": np.fmax.reduceat(price, starts),
+            "std_price": std,
+            "total_volume": np.add.reduceat(np.where(v_ok, vol, 0.0), starts),
+        }
+    )
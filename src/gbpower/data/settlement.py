@@ -0,0 +1,131 @@
+"""
+Settlement date + period → UTC start time, vectorised and DST-aware.
+
+GB settlement days run from Europe/London midnight to midnight, so a day has
+48 periods normally, 46 on the spring clock change and 50 in the autumn.
+Period *p* of day *d* starts at ``utc(local midnight of d) + (p-1)·30 min``.
+
+Each distinct date is parsed once (``pd.factorize``) and its UTC midnight
+and period count are cached for the life of the process, so the per-row work
+is one integer gather and one multiply-add.
+
+Usage:
+    >>> from gbpower.data.settlement import settlement_to_utc
+    >>> df["datetime"] = settlement_to_utc(df["Settlement Date"], df["Settlement Period"],
+    ...                                    date_format="%d/%m/%Y")
+    >>> settlement_to_utc(*clock_to_period(df["TARGETDATE"], df["CP_ST_TIME"]))   # HHMM clock times
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+LONDON = "Europe/London"
+PERIOD_NS = 30 * 60 * 10**9
+_NAT = np.iinfo("int64").min
+
+# (date_format, raw value) → (utc_midnight_ns, n_periods)
+_DAY_CACHE: dict[tuple, tuple[int, int]] = {}
+
+
+def _factorize(values) -> tuple[np.ndarray, pd.Index]:
+    if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        values = np.asarray(values)
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Index(uniques)
+
+
+def _day_table(uniques: pd.Index, date_format: str | None) -> tuple[np.ndarray, np.ndarray]:
+    """UTC-midnight ns and number of periods for every distinct date value."""
+    keys = [(date_format, u) for u in uniques]
+    todo = [i for i, k in enumerate(keys) if k not in _DAY_CACHE]
+    if todo:
+        raw = uniques[todo]
+        if pd.api.types.is_datetime64_any_dtype(raw):
+            days = pd.DatetimeIndex(raw)
+            if days.tz is not None:
+                days = days.tz_localize(None)
+        else:
+            days = pd.DatetimeIndex(pd.to_datetime(raw, format=date_format))
+        days = days.normalize()
+        start = days.tz_localize(LONDON).tz_convert("UTC").as_unit("ns").asi8
+        nxt = (days + pd.Timedelta(days=1)).tz_localize(LONDON).tz_convert("UTC").as_unit("ns").asi8
+        for i, s, n in zip(todo, start, (nxt - start) // PERIOD_NS):
+            _DAY_CACHE[keys[i]] = (int(s), int(n))
+    table = np.array([_DAY_CACHE[k] for k in keys], dtype="int64").reshape(-1, 2)
+    return table[:, 0], table[:, 1]
+
+
+def parse_dates(values, date_format: str | None = None) -> pd.DatetimeIndex:
+    """Naive settlement dates, parsing each distinct string once."""
+    codes, uniques = _factorize(values)
+    if not len(uniques):
+        return pd.DatetimeIndex(np.full(len(codes), _NAT).view("M8[ns]"))
+    parsed = pd.DatetimeIndex(pd.to_datetime(uniques, format=date_format)).as_unit("ns").asi8
+    out = np.where(codes >= 0, parsed[np.maximum(codes, 0)], _NAT)
+    return pd.DatetimeIndex(out.view("M8[ns]"))
+
+
+def periods_in_day(dates, date_format: str | None = None) -> np.ndarray:
+    """46, 48 or 50 for each settlement date."""
+    codes, uniques = _factorize(dates)
+    _, n = _day_table(uniques, date_format)
+    return np.where(codes >= 0, n[np.maximum(codes, 0)], 0)
+
+
+def clock_to_period(dates, hhmm, date_format: str | None = None) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    (settlement date, period) of local HHMM clock start times (0, 30, 100 … 2330).
+
+    The clock period is ``hh·2 + mm//30 + 1``; ``2400`` is the day-end
+    boundary, i.e. period 1 of the next date. On clock-change days periods
+    count real half-hours from local midnight: from 02:00 on the spring day
+    is two periods earlier (01:00–01:59 does not exist → period 0, NaT
+    once converted), on the autumn day two periods later (01:00–01:59 is its
+    first, BST, occurrence). Missing or malformed times give NaN.
+    """
+    days = parse_dates(dates, date_format)
+    t = np.asarray(hhmm, dtype="float64")
+    hh, mm = np.divmod(np.where(np.isnan(t), 0, t).astype("int64"), 100)
+    ok = ~np.isnan(t) & (mm < 60) & (t >= 0) & (t <= 2400)
+
+    clock = hh * 2 + mm // 30 + 1
+    day_end = clock == 49
+    days = days + pd.to_timedelta(day_end.astype("int64"), unit="D")
+    clock = np.where(day_end, 1, clock)
+
+    shift = periods_in_day(days) - 48                   # -2 spring, +2 autumn, 0 otherwise
+    period = np.where(clock >= 5, clock + shift, clock)
+    period = np.where((shift < 0) & ((clock == 3) | (clock == 4)), 0, period)
+    return days, np.where(ok, period, np.nan)
+
+
+def settlement_to_utc(
+    dates,
+    periods,
+    date_format: str | None = None,
+    validate: bool = True,
+) -> pd.DatetimeIndex:
+    """
+    UTC start of each (settlement date, period) as a ``datetime64[ns, UTC]`` index.
+
+    *dates* may be strings (parsed with *date_format*) or datetimes. Missing
+    dates, and with *validate* periods outside 1…periods_in_day, give NaT.
+    """
+    codes, uniques = _factorize(dates)
+    periods = np.asarray(periods, dtype="float64")
+    p_ok = ~np.isnan(periods)
+    p = np.where(p_ok, periods, 1).astype("int64")
+
+    ok = (codes >= 0) & p_ok
+    if len(uniques):
+        midnight, n = _day_table(uniques, date_format)
+        c = np.maximum(codes, 0)
+        out = midnight[c] + (p - 1) * PERIOD_NS
+        if validate:
+            ok &= (p >= 1) & (p <= n[c])
+    else:
+        out = np.zeros(len(codes), dtype="int64")
+    out = np.where(ok, out, _NAT)
+    return pd.DatetimeIndex(out.view("M8[ns]")).tz_localize("UTC")
@@ -0,0 +1,324 @@
+"""
+Date-partitioned parquet storage for the processed half-hourly tables.
+
+Layout (Hive style, one directory per UTC calendar month):
+
+    <name>.parquet/
+        _meta.json                      # optional dataset-level metadata
+        year=2024/month=01/part-0.parquet
+        year=2024/month=02/part-0.parquet
+        …
+
+Rows are sorted by ``datetime`` before writing and split into row groups of
+``ROW_GROUP_ROWS`` (one week of half-hours), so a ``--start/--end`` read
+prunes whole months from the directory names and whole weeks from the
+row-group statistics.
+
+Legacy single-file outputs are still readable through the same functions.
+
+Usage:
+    >>> from gbpower.data.storage import read_dataset, write_dataset
+    >>> write_dataset(df, "data/processed/imbalance_prices.parquet")
+    >>> may = read_dataset("data/processed/imbalance_prices.parquet",
+    ...                    start="2025-05-01", end="2025-05-31T23:30Z")
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+TIME_COL = "datetime"
+PARTITION_COLS = ("year", "month")
+ROW_GROUP_ROWS = 48 * 7        # one week of half-hours
+META_FILE = "_meta.json"
+
+_WRITE_PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.string()), ("month", pa.string())]), flavor="hive"
+)
+_READ_PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int16()), ("month", pa.int8())]), flavor="hive"
+)
+
+
+# ───────────────────────── helpers ──────────────────────────
+def _utc(ts) -> pd.Timestamp | None:
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _to_table(data: pd.DataFrame | pa.Table) -> pa.Table:
+    if isinstance(data, pa.Table):
+        return data
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+
+def _open(path: Path) -> ds.Dataset:
+    if path.is_dir():
+        return ds.dataset(path, format="parquet", partitioning=_READ_PARTITIONING)
+    return ds.dataset(path, format="parquet")
+
+
+def _month_ge(ts: pd.Timestamp) -> ds.Expression:
+    y, m = ds.field("year"), ds.field("month")
+    return (y > ts.year) | ((y == ts.year) & (m >= ts.month))
+
+
+def _month_le(ts: pd.Timestamp) -> ds.Expression:
+    y, m = ds.field("year"), ds.field("month")
+    return (y < ts.year) | ((y == ts.year) & (m <= ts.month))
+
+
+def _time_filter(
+    dset: ds.Dataset,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+    after: pd.Timestamp | None,
+) -> ds.Expression | None:
+    if start is None and end is None and after is None:
+        return None
+    names = dset.schema.names
+    if TIME_COL not in names:
+        raise KeyError(f"dataset has no '{TIME_COL}' column")
+    typ = dset.schema.field(TIME_COL).type
+    if not pa.types.is_timestamp(typ):
+        raise TypeError(f"'{TIME_COL}' is stored as {typ}, not a timestamp")
+    col = ds.field(TIME_COL)
+    partitioned = all(c in names for c in PARTITION_COLS)
+
+    def scalar(ts: pd.Timestamp) -> pa.Scalar:
+        return pa.scalar(ts if typ.tz else ts.tz_localize(None), type=typ)
+
+    terms = []
+    if start is not None:
+        terms += [col >= scalar(start)] + ([_month_ge(start)] if partitioned else [])
+    if after is not None:
+        terms += [col > scalar(after)] + ([_month_ge(after)] if partitioned else [])
+    if end is not None:
+        terms += [col <= scalar(end)] + ([_month_le(end)] if partitioned else [])
+
+    expr = terms[0]
+    for t in terms[1:]:
+        expr = expr & t
+    return expr
+
+
+# ───────────────────────── reading ──────────────────────────
+def read_table(
+    path: str | Path,
+    start=None,
+    end=None,
+    columns: list[str] | None = None,
+    *,
+    after=None,
+) -> pa.Table:
+    """
+    Arrow table of rows with ``start <= datetime <= end`` (and ``> after``).
+
+    Month partitions outside the window are skipped from their directory
+    names; inside a file, row groups are skipped from their statistics.
+    """
+    path = Path(path)
+    dset = _open(path)
+    expr = _time_filter(dset, _utc(start), _utc(end), _utc(after))
+    if columns is not None and path.is_dir():
+        columns = [c for c in columns if c not in PARTITION_COLS]
+    table = dset.to_table(columns=columns, filter=expr)
+    if path.is_dir():
+        table = table.drop_columns([c for c in PARTITION_COLS if c in table.schema.names])
+    return table
+
+
+def read_dataset(
+    path: str | Path,
+    start=None,
+    end=None,
+    columns: list[str] | None = None,
+    *,
+    after=None,
+) -> pd.DataFrame:
+    """DataFrame version of :func:`read_table`, sorted by datetime."""
+    df = read_table(path, start, end, columns, after=after).to_pandas()
+    if TIME_COL in df.columns and not df[TIME_COL].is_monotonic_increasing:
+        df = df.sort_values(TIME_COL, kind="stable", ignore_index=True)
+    return df
+
+
+def dataset_schema(path: str | Path) -> pa.Schema:
+    """Schema of the stored columns (partition keys excluded)."""
+    path = Path(path)
+    schema = _open(path).schema
+    if path.is_dir():
+        for c in PARTITION_COLS:
+            if c in schema.names:
+                schema = schema.remove(schema.get_field_index(c))
+    return schema
+
+
+def time_bounds(path: str | Path) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """First and last datetime, from row-group statistics (no data pages read when present)."""
+    lo = hi = None
+    for frag in _open(Path(path)).get_fragments():
+        frag.ensure_complete_metadata()
+        for rg in frag.row_groups:
+            stats = (rg.statistics or {}).get(TIME_COL)
+            if stats is None or stats.get("min") is None:       # no statistics: scan the column once
+                col = read_table(path, columns=[TIME_COL]).column(TIME_COL)
+                lo, hi = pc.min(col).as_py(), pc.max(col).as_py()
+                return _utc(lo), _utc(hi)
+            lo = stats["min"] if lo is None else min(lo, stats["min"])
+            hi = stats["max"] if hi is None else max(hi, stats["max"])
+    return _utc(lo), _utc(hi)
+
+
+def dataset_mtime(path: str | Path) -> int:
+    """Newest ``st_mtime_ns`` among the dataset's files; 0 if absent or mid-swap."""
+    path = Path(path)
+    try:
+        if path.is_file():
+            return path.stat().st_mtime_ns
+        return max((p.stat().st_mtime_ns for p in path.rglob("*") if p.is_file()), default=0)
+    except FileNotFoundError:
+        return 0
+
+
+def read_meta(path: str | Path) -> dict:
+    meta = Path(path) / META_FILE
+    return json.loads(meta.read_text()) if meta.exists() else {}
+
+
+def write_meta(path: str | Path, meta: dict) -> None:
+    target = Path(path) / META_FILE
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(json.dumps(meta, indent=2, default=str))
+    tmp.replace(target)
+
+
+# ───────────────────────── writing ──────────────────────────
+def _partitioned(table: pa.Table) -> pa.Table:
+    dt = table.column(TIME_COL)
+    year = pc.cast(pc.year(dt), pa.string())
+    month = pc.utf8_lpad(pc.cast(pc.month(dt), pa.string()), 2, "0")
+    return table.append_column("year", year).append_column("month", month)
+
+
+def _write(
+    data: pa.Table | Iterable[pa.RecordBatch],
+    path: Path,
+    row_group_rows: int,
+    behaviour: str,
+    schema: pa.Schema | None = None,
+) -> None:
+    out_schema = None
+    if isinstance(data, pa.Table):
+        data = _partitioned(data)
+    else:
+        data = (
+            b
+            for batch in data
+            for b in _partitioned(pa.Table.from_batches([batch], schema=schema)).to_batches()
+        )
+        out_schema = _partitioned(schema.empty_table()).schema
+    ds.write_dataset(
+        data,
+        path,
+        schema=out_schema,
+        format="parquet",
+        partitioning=_WRITE_PARTITIONING,
+        max_rows_per_group=row_group_rows,
+        min_rows_per_group=row_group_rows,
+        existing_data_behavior=behaviour,
+    )
+
+
+def _swap_in(path: Path, fill, meta: dict | None) -> Path:
+    """Build a dataset next to *path* with *fill(tmp_dir)*, then swap it in."""
+    tmp = path.with_name(path.name + ".tmp")
+    old = path.with_name(path.name + ".old")
+    for p in (tmp, old):
+        if p.is_dir():
+            shutil.rmtree(p)
+    fill(tmp)
+    tmp.mkdir(parents=True, exist_ok=True)          # empty input → empty dataset
+    if meta is not None:
+        write_meta(tmp, meta)
+
+    if path.exists():
+        path.rename(old)
+    tmp.rename(path)
+    if old.is_dir():
+        shutil.rmtree(old)
+    elif old.exists():
+        old.unlink()
+    return path
+
+
+def write_dataset(
+    data: pd.DataFrame | pa.Table,
+    path: str | Path,
+    row_group_rows: int = ROW_GROUP_ROWS,
+    meta: dict | None = None,
+) -> Path:
+    """
+    Replace *path* with a year/month partitioned dataset of *data*.
+
+    Rows are stably sorted by datetime. The new dataset is built next to the
+    old one and swapped in, so readers never see a half-written directory; a
+    legacy single-file parquet at *path* is replaced the same way.
+    """
+    table = _to_table(data)
+    table = table.take(pc.sort_indices(table, [(TIME_COL, "ascending")]))   # stable
+    return _swap_in(Path(path), lambda tmp: _write(table, tmp, row_group_rows, "error"), meta)
+
+
+def write_batches(
+    batches: Iterable[pa.RecordBatch],
+    schema: pa.Schema,
+    path: str | Path,
+    row_group_rows: int = ROW_GROUP_ROWS,
+    meta: dict | None = None,
+) -> Path:
+    """
+    Stream *batches* (already in datetime order) into a partitioned dataset.
+
+    Only the batches in flight and the open row groups are held in memory,
+    so the output can be far larger than RAM. Swapped in like
+    :func:`write_dataset`.
+    """
+    return _swap_in(
+        Path(path), lambda tmp: _write(batches, tmp, row_group_rows, "error", schema), meta
+    )
+
+
+def overwrite_from(
+    data: pd.DataFrame | pa.Table,
+    path: str | Path,
+    since,
+    row_group_rows: int = ROW_GROUP_ROWS,
+) -> Path:
+    """
+    Rewrite every month partition from *since*'s month onward with *data*.
+
+    Earlier partitions are left untouched; *data* must therefore hold every
+    row that should remain in those later months.
+    """
+    path = Path(path)
+    since = _utc(since)
+    for part in path.glob("year=*/month=*"):
+        y = int(part.parent.name.split("=")[1])
+        m = int(part.name.split("=")[1])
+        if (y, m) >= (since.year, since.month):
+            shutil.rmtree(part)
+    table = _to_table(data)
+    table = table.take(pc.sort_indices(table, [(TIME_COL, "ascending")]))
+    _write(table, path, row_group_rows, "overwrite_or_ignore")
+    return path
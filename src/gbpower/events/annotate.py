@@ -1,16 +1,46 @@
+import numpy as np
 import pandas as pd
 
+from gbpower.profiling import timed
+
+
+@timed()
 def annotate_df(df: pd.DataFrame, event_log: pd.DataFrame) -> pd.DataFrame:
-    """Return a copy of *df* with `event_id` and `event_age` columns."""
+    """Return a copy of *df* with `event_id` and `event_age` columns.
+
+    Events are non-overlapping [start, end] intervals, so each row's event is
+    found with one binary search over the sorted starts (O(rows · log events))
+    and its age is the row offset from the first row at or after the start.
+    """
     out = df.copy()
-    out["event_id"] = pd.NA
+    n = len(out)
+    event_id = np.full(n, pd.NA, dtype=object)
+    event_age = np.full(n, np.nan)
+
+    if n and len(event_log):
+        dt = pd.DatetimeIndex(out["datetime"])
+        order = None if dt.is_monotonic_increasing else np.argsort(dt.asi8, kind="stable")
+        if order is not None:
+            dt = dt[order]
+
+        log = event_log.sort_values("start", kind="stable")
+        starts = pd.DatetimeIndex(log["start"])
+        ends = pd.DatetimeIndex(log["end"])
+        ids = log["event_id"].to_numpy(dtype=object)
+
+        # event k whose start is the last one <= t; inside it if t <= end_k
+        k = starts.searchsorted(dt, side="right") - 1
+        inside = k >= 0
+        inside[inside] = np.asarray(dt[inside] <= ends[k[inside]])
 
-    for _, row in event_log.iterrows():
-        mask = (out["datetime"] >= row["start"]) & (out["datetime"] <= row["end"])
-        out.loc[mask, "event_id"] = row["event_id"]
+        # event_age = rows since start (0,1,2,… within each event)
+        first_row = dt.searchsorted(starts, side="left")
+        pos = np.flatnonzero(inside)
+        ev = k[inside]
+        pos_out = pos if order is None else order[pos]
+        event_id[pos_out] = ids[ev]
+        event_age[pos_out] = pos - first_row[ev]
 
-    # event_age = periods since start (0,1,2,… within each event)
-    out["event_age"] = (
-        out.groupby("event_id").cumcount().where(out["event_id"].notna())
-    )
+    out["event_id"] = event_id
+    out["event_age"] = event_age
     return out
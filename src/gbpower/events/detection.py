@@ -1,80 +1,85 @@
+import numpy as np
 import pandas as pd
-import yaml
+from collections.abc import Mapping
 from pathlib import Path
 
-def _load_rules(path: Path):
-    with open(path, "r") as fp:
-        return yaml.safe_load(fp)
+from gbpower.events.rules import RuleSet
+from gbpower.profiling import timed
 
-def _threshold_series(series: pd.Series, rule: dict) -> pd.Series:
-    """Return Boolean mask where series breaches the rule."""
-    if rule["method"] == "percentile":
-        cut = series.quantile(rule["threshold"]/100)
-        return series.abs() >= abs(cut)
-    elif rule["method"] == "abs":
-        return series.abs() >= abs(rule["threshold"])
-    else:
-        raise ValueError(f"Unknown rule method: {rule['method']}")
 
+def _group_mode(values: pd.Series, bounds: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+    """Most common (weighted) value per contiguous group (smallest on ties, like ``Series.mode``)."""
+    codes, uniques = pd.factorize(values, sort=True)
+    n_groups, n_cats = len(bounds), max(len(uniques), 1)
+    group = np.repeat(np.arange(n_groups), np.diff(np.r_[bounds, len(values)]))
+    ok = codes >= 0
+    counts = np.bincount(group[ok] * n_cats + codes[ok], minlength=n_groups * n_cats,
+                         weights=None if weights is None else weights[ok])
+    counts = counts.reshape(n_groups, n_cats)
+    mode = np.append(np.asarray(uniques, dtype=object), np.nan)[counts.argmax(axis=1)]
+    mode[counts.max(axis=1) == 0] = np.nan
+    return mode
+
+
+@timed()
 def detect_extreme_events(df: pd.DataFrame,
-                          config_path: str | Path = "config/detection.yml"
+                          config_path: str | Path | Mapping = "config/detection.yml"
                           ) -> pd.DataFrame:
     """
     Build tidy event log from a half-hourly dataframe.
 
+    The rules are evaluated in one pass over the driver matrix
+    (:class:`~gbpower.events.rules.RuleSet`), giving one candidate row per
+    breaching period with a bitmask of the drivers that fired.
+
     Returns
     -------
     event_log : pd.DataFrame
         Columns: event_id, start, end, driver_col, peak_dt, peak_value, regime_flag_mode
     """
-    rules = _load_rules(Path(config_path))
-    drivers = rules["drivers"]
-
-    base = df.copy()
-    base = base.sort_values("datetime").reset_index(drop=True)
+    rules = RuleSet.from_config(config_path)
 
-    # 1 – build a single Boolean mask for each driver
-    masks = {
-        col: _threshold_series(base[col], drivers[col])
-        for col in drivers
-    }
+    base = df[["datetime", "regime_flag", *rules.columns]]
+    if not base["datetime"].is_monotonic_increasing:
+        base = base.sort_values("datetime", kind="stable")
 
-    # 2 – unify into one DataFrame of candidate rows
-    rows = []
-    for driver, mask in masks.items():
-        tmp = base.loc[mask, ["datetime", driver, "regime_flag"]].copy()
-        tmp["driver_col"] = driver
-        tmp["driver_value"] = tmp[driver]
-        rows.append(tmp)
-    cand = pd.concat(rows).sort_values("datetime").reset_index(drop=True)
+    # 1 – one candidate row per breaching period (peak driver + driver bitmask)
+    cand = rules.candidates(base)
 
     if cand.empty:
         return pd.DataFrame(
             columns=["event_id","start","end","driver_col","peak_dt","peak_value","regime_flag_mode"]
         )
 
-    # 3 – assign provisional event_id by time gap
-    merge_win = max(v["merge_window"] for v in drivers.values())
+    # 2 – assign event_id by time gap
     gap = cand["datetime"].diff().dt.total_seconds().div(1800).fillna(1)
-    cand["event_id"] = (gap > merge_win).cumsum()
+    eid = (gap > rules.merge_window).cumsum().to_numpy()
 
-    # 4 – collapse duplicates (two drivers overlap) by priority list
-    priority = {c: i for i, c in enumerate(rules["priority"])}
-    event_groups = []
-    for eid, sub in cand.groupby("event_id"):
-        # pick highest-priority driver row with max driver_value
-        best = (
-            sub.sort_values(["driver_col"], key=lambda s: s.map(priority))
-               .sort_values("driver_value", ascending=False)
-               .iloc[0]
-        )
-        event_groups.append({
-            "event_id":   eid,
-            "start":      sub["datetime"].min(),
-            "end":        sub["datetime"].max(),
-            "driver_col": best["driver_col"],
-            "peak_dt":    best["datetime"],
-            "peak_value": best["driver_value"],
-            "regime_flag_mode": sub["regime_flag"].mode().iloc[0]
-        })
-    return pd.DataFrame(event_groups)
+    # 3 – peak of every event: one lexsort by (event_id, -driver_value,
+    #     priority, row order); the first row of every event is its peak
+    value = cand["driver_value"].to_numpy()
+    prio = cand["driver_col"].map(rules.priority).to_numpy(dtype="float64", na_value=np.nan)
+    order = np.lexsort((
+        np.arange(len(cand)),
+        np.nan_to_num(prio, nan=np.inf),
+        np.nan_to_num(-value, nan=np.inf),          # descending, NaN last
+        eid,
+    ))
+    first = order[np.r_[True, eid[order][1:] != eid[order][:-1]]]
+
+    # cand is datetime-sorted with contiguous event ids → start/end are the
+    # first/last row of each run
+    bounds = np.r_[0, np.flatnonzero(eid[1:] != eid[:-1]) + 1]
+    last = np.r_[bounds[1:], len(cand)] - 1
+    dts = cand["datetime"].array
+
+    return pd.DataFrame({
+        "event_id":   eid[bounds],
+        "start":      dts[bounds],
+        "end":        dts[last],
+        "driver_col": cand["driver_col"].to_numpy()[first],
+        "peak_dt":    dts[first],
+        "peak_value": value[first],
+        # regime mode over (period, firing driver) pairs
+        "regime_flag_mode": _group_mode(cand["regime_flag"], bounds, cand["n_drivers"].to_numpy()),
+    })
@@ -1,19 +1,55 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
 import pandas as pd
 from pathlib import Path
 
+from gbpower.profiling import timed
+
 REGIME_COLOURS = {"NORMAL":"#4CAF50","HIGH_VOL":"#FFC107","EXTREME":"#F44336"}
+PLOT_COLS = ("err_TSD_MW","cashout_cost_GBP","spread_SBP_vs_MIP")
+PAD = pd.Timedelta(days=1)
+DPI = 150
+
+
+def event_window(df: pd.DataFrame, event_row: pd.Series, pad: pd.Timedelta = PAD) -> pd.DataFrame:
+    """Rows within *pad* of the event, sliced by binary search on a datetime-sorted *df*."""
+    dt = df["datetime"]
+    lo = dt.searchsorted(event_row["start"] - pad, side="left")
+    hi = dt.searchsorted(event_row["end"] + pad, side="right")
+    return df.iloc[lo:hi]
+
+
+def render_key(sub: pd.DataFrame, event_row: pd.Series, cols=PLOT_COLS) -> str:
+    """Hash of everything a figure depends on: data slice, event fields, plot code & style."""
+    h = hashlib.sha1(Path(__file__).read_bytes())
+    h.update(repr((tuple(cols), REGIME_COLOURS, DPI)).encode())
+    h.update(repr(tuple(event_row[k] for k in ("event_id", "start", "end", "peak_dt"))).encode())
+    used = [c for c in ("datetime", *cols, "regime_flag") if c in sub.columns]
+    h.update(pd.util.hash_pandas_object(sub[used], index=False).to_numpy().tobytes())
+    return h.hexdigest()
 
+
+def render_event(sub: pd.DataFrame, event_row: pd.Series, path: str | Path, cols=PLOT_COLS) -> Path:
+    """Save one event figure from its pre-sliced window and close it (pool worker)."""
+    import matplotlib                       # ~1 s; only paid when a figure is drawn
+    matplotlib.use("Agg")                   # files only, no display needed (workers too)
+    import matplotlib.pyplot as plt
+
+    fig = plot_event(sub, event_row, cols=cols, path=path)
+    plt.close(fig)
+    return Path(path)
+
+
+@timed()
 def plot_event(df: pd.DataFrame,
                event_row: pd.Series,
-               cols = ("err_TSD_MW","cashout_cost_GBP","spread_SBP_vs_MIP"),
+               cols = PLOT_COLS,
                path: str | Path | None = None
                ):
-    """Multi-panel diagnostic plot for a single event."""
+    """Multi-panel diagnostic plot for a single event (*df* sorted by datetime)."""
+    import matplotlib.pyplot as plt
+
     start, end = event_row["start"], event_row["end"]
-    sub = df[(df["datetime"] >= start - pd.Timedelta(days=1))
-             & (df["datetime"] <= end   + pd.Timedelta(days=1))]
+    sub = event_window(df, event_row)
 
     fig, axs = plt.subplots(len(cols)+1, 1, figsize=(14, 3.2*len(cols)+1),
                             sharex=True, gridspec_kw={"height_ratios": [2]*len(cols)+[0.6]})
@@ -35,5 +71,5 @@ def plot_event(df: pd.DataFrame,
     if path:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(path, dpi=150)
+        fig.savefig(path, dpi=DPI)
     return fig
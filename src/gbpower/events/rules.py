@@ -0,0 +1,240 @@
+"""
+Vectorized rule engine for the event drivers in config/detection.yml.
+
+The config compiles once into a :class:`RuleSet`. Evaluating it takes a
+few array operations over the (rows × drivers) matrix, whatever the number
+of drivers:
+
+• every rule method runs once for all of its drivers, with the rule
+  parameters broadcast as per-driver vectors (no per-driver Python loop)
+• every percentile cut comes from a single ``np.nanquantile`` call
+• the boolean hit matrix packs into one uint64 driver bitmask per row, and
+  :meth:`RuleSet.candidates` returns one row per breaching period
+
+Methods (``drivers.<name>.method``):
+
+• ``percentile``  ``|x| >= |q-th percentile|`` over the full sample (``threshold`` in %)
+• ``abs``         ``|x| >= |threshold|``
+• ``zscore``      ``|x - mean| >= threshold · std`` of the previous ``window`` rows
+• ``roc``         ``|x[t] - x[t-lag]| >= threshold`` (``lag`` rows, default 1)
+• ``all`` / ``any``  fires when all / any drivers in ``of: [a, b]`` fire;
+  its value is that of the first one
+
+A driver with ``emit: false`` is only a condition for ``all``/``any`` and
+never starts an event by itself. A new method is one function registered
+with ``@rule_method("name", **defaults)``: it gets the (rows × k) value
+matrix of its k drivers and one length-k vector per parameter, and returns
+the (rows × k) hit matrix.
+
+Usage:
+    >>> from gbpower.events.rules import RuleSet
+    >>> rules = RuleSet.from_config("config/detection.yml")
+    >>> hits, values = rules.evaluate(df)        # (rows × drivers)
+    >>> cand = rules.candidates(df)              # datetime, driver_mask, driver_col, …
+"""
+
+from __future__ import annotations
+
+import inspect
+import warnings
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+COMBINATIONS = ("all", "any")
+METHODS: dict[str, tuple] = {}          # name → (function, default parameters)
+
+
+def rule_method(name: str, **defaults):
+    """Register ``fn(x, **param_vectors) -> hits`` as a driver method."""
+    def register(fn):
+        METHODS[name] = (fn, defaults)
+        return fn
+    return register
+
+
+# ───────────────────────── methods ──────────────────────────
+@rule_method("percentile")
+def _percentile(x: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    q, inverse = np.unique(np.asarray(threshold, dtype="float64") / 100, return_inverse=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)             # all-NaN driver → NaN cut
+        cuts = np.nanquantile(x, q, axis=0)                         # (len(q), k), one call
+    cut = cuts[inverse, np.arange(x.shape[1])]
+    return np.abs(x) >= np.abs(cut)
+
+
+@rule_method("abs")
+def _abs(x: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    return np.abs(x) >= np.abs(threshold)
+
+
+def _lagged(x: np.ndarray, lag: np.ndarray) -> np.ndarray:
+    """x[t - lag_j] for every column j (NaN before the start)."""
+    idx = np.arange(len(x))[:, None] - np.asarray(lag, dtype="int64")[None, :]
+    out = np.take_along_axis(x, np.clip(idx, 0, None), axis=0)
+    out[idx < 0] = np.nan
+    return out
+
+
+@rule_method("roc", lag=1)
+def _roc(x: np.ndarray, threshold: np.ndarray, lag: np.ndarray) -> np.ndarray:
+    return np.abs(x - _lagged(x, lag)) >= np.abs(threshold)
+
+
+@rule_method("zscore")
+def _zscore(x: np.ndarray, threshold: np.ndarray, window: np.ndarray) -> np.ndarray:
+    """
+    Mean and sample std of the previous *window* rows (current row excluded),
+    from prefix sums with a per-column start offset; at least half the window
+    (and two values) must be present.
+    """
+    window = np.asarray(window, dtype="int64")
+    valid = ~np.isnan(x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)             # all-NaN driver
+        centre = np.nanmean(x, axis=0)
+    centred = np.where(valid, x - centre, 0.0)                      # keeps the prefix sums small
+    zeros = np.zeros((1, x.shape[1]))
+    sums = [np.vstack([zeros, np.cumsum(a, axis=0)]) for a in (valid, centred, centred**2)]
+    t = np.broadcast_to(np.arange(len(x))[:, None], x.shape)
+    lo = np.clip(t - window[None, :], 0, None)
+    n, s1, s2 = (np.take_along_axis(c, t, 0) - np.take_along_axis(c, lo, 0) for c in sums)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / n
+        std = np.sqrt(np.maximum(s2 - n * mean**2, 0) / (n - 1))
+        ok = (n >= np.maximum(2, window // 2)) & (std > 0)
+        return ok & (np.abs(centred - mean) >= np.abs(threshold) * std) & valid
+
+
+# ───────────────────────── rule set ──────────────────────────
+class RuleSet:
+    """detection.yml compiled into grouped, vectorized evaluations."""
+
+    def __init__(self, config: Mapping):
+        drivers = dict(config["drivers"])
+        self.names = list(drivers)
+        self.priority = {c: i for i, c in enumerate(config.get("priority", []))}
+        self.merge_window = max(rule["merge_window"] for rule in drivers.values())
+        self.emit = np.array([rule.get("emit", True) for rule in drivers.values()])
+        if self.emit.sum() > 64:
+            raise ValueError("at most 64 emitting drivers fit the bitmask")
+
+        pos = {name: i for i, name in enumerate(self.names)}
+        self.columns = [n for n, r in drivers.items() if r["method"] not in COMBINATIONS]
+        col_pos = {c: i for i, c in enumerate(self.columns)}
+        # value matrix column of every driver (a combination reports its first member)
+        self.value_col = np.empty(len(self.names), dtype="int64")
+
+        self.groups = []                # (function, driver positions, matrix columns, params)
+        by_method: dict[str, list[str]] = {}
+        for name, rule in drivers.items():
+            by_method.setdefault(rule["method"], []).append(name)
+        for method, names in by_method.items():
+            if method in COMBINATIONS:
+                continue
+            if method not in METHODS:
+                raise ValueError(f"Unknown rule method: {method}")
+            fn, defaults = METHODS[method]
+            params = {}
+            for p in list(inspect.signature(fn).parameters)[1:]:
+                try:
+                    params[p] = np.array([drivers[n].get(p, defaults.get(p)) if p in defaults
+                                          else drivers[n][p] for n in names])
+                except KeyError:
+                    raise ValueError(f"'{method}' rules need '{p}'") from None
+            cols = np.array([col_pos[n] for n in names])
+            self.groups.append((fn, np.array([pos[n] for n in names]), cols, params))
+            self.value_col[[pos[n] for n in names]] = cols
+
+        # combinations: one (combos × base drivers) membership matrix per kind
+        self.combos = []                # (kind, driver positions, membership)
+        for kind in COMBINATIONS:
+            names = by_method.get(kind, [])
+            if not names:
+                continue
+            member = np.zeros((len(names), len(self.names)), dtype="int32")
+            for i, name in enumerate(names):
+                of = drivers[name].get("of") or []
+                if not of or any(m not in col_pos for m in of):
+                    raise ValueError(f"{name}: '{kind}' needs 'of' listing non-combination drivers")
+                member[i, [pos[m] for m in of]] = 1
+                self.value_col[pos[name]] = col_pos[of[0]]
+            self.combos.append((kind, np.array([pos[n] for n in names]), member))
+
+        # tie-break rank: priority list first, then config order
+        rank = [self.priority.get(n, len(self.priority)) for n in self.names]
+        self.rank = np.array(rank, dtype="int64") * len(self.names) + np.arange(len(self.names))
+
+    @classmethod
+    def from_config(cls, config: str | Path | Mapping = "config/detection.yml") -> "RuleSet":
+        if isinstance(config, Mapping):
+            return cls(config)
+        with open(config, "r") as fp:
+            return cls(yaml.safe_load(fp))
+
+    # ── evaluation
+    def matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """(rows × base drivers) float64 values; missing → NaN."""
+        if not len(self.columns):
+            return np.empty((len(df), 0))
+        return df[self.columns].to_numpy(dtype="float64", na_value=np.nan)
+
+    def evaluate(self, data: pd.DataFrame | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(rows × drivers) hit matrix and the value each driver reports."""
+        x = data if isinstance(data, np.ndarray) else self.matrix(data)
+        hits = np.zeros((len(x), len(self.names)), dtype=bool)
+        if len(x):
+            with np.errstate(invalid="ignore"):
+                for fn, at, cols, params in self.groups:
+                    hits[:, at] = fn(x[:, cols], **params)
+            self.combine(hits)
+        return hits, x[:, self.value_col]
+
+    def combine(self, hits: np.ndarray) -> np.ndarray:
+        """Fill the all/any columns of *hits* (in place) from the other drivers' hits."""
+        if self.combos:
+            base = hits.astype("int32")
+            for kind, at, member in self.combos:
+                count = base @ member.T
+                hits[:, at] = count == member.sum(axis=1) if kind == "all" else count > 0
+        return hits
+
+    def bitmask(self, hits: np.ndarray) -> np.ndarray:
+        """uint64 per row, bit i set when the i-th emitting driver fired."""
+        emitted = hits[:, self.emit]
+        weights = np.left_shift(np.uint64(1), np.arange(emitted.shape[1], dtype="uint64"))
+        return (emitted * weights).sum(axis=1, dtype="uint64")
+
+    def emitted(self) -> list[str]:
+        """Driver names in bitmask bit order."""
+        return [n for n, e in zip(self.names, self.emit) if e]
+
+    def candidates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        One row per period where an emitting driver fires (*df* order kept).
+
+        ``driver_mask`` holds every firing driver; ``driver_col`` /
+        ``driver_value`` are the row's peak: largest value, ties to the
+        priority list, then config order. ``n_drivers`` counts the bits.
+        """
+        hits, values = self.evaluate(df)
+        hits = hits & self.emit
+        rows = np.flatnonzero(hits.any(axis=1))
+        hits, values = hits[rows], values[rows]
+
+        masked = np.where(hits, values, -np.inf)
+        top = masked.max(axis=1, initial=-np.inf)
+        tied = hits & (masked == top[:, None])
+        best = np.where(tied, self.rank, np.iinfo("int64").max).argmin(axis=1)
+
+        keep = [c for c in ("datetime", "regime_flag") if c in df.columns]
+        out = df[keep].iloc[rows].reset_index(drop=True)
+        out["driver_mask"] = self.bitmask(hits)
+        out["n_drivers"] = hits.sum(axis=1)
+        out["driver_col"] = np.asarray(self.names, dtype=object)[best]
+        out["driver_value"] = values[np.arange(len(rows)), best]
+        return out
@@ -0,0 +1,148 @@
+"""
+Threshold × merge-window sweeps for event detection.
+
+The feature frame is loaded and the rules evaluated once; after that
+
+• every swept (percentile) driver keeps its non-NaN values sorted, so the
+  cut for any percentile is an O(1) interpolation (same value as
+  ``np.nanquantile``)
+• per threshold, the candidate periods and their peak values are found
+  once; every merge window then only re-splits that run where the gap
+  exceeds the window (one comparison + ``reduceat``)
+• thresholds are spread over worker processes (``jobs``)
+
+A (threshold, merge_window) pair gives the same events as
+``detect_extreme_events`` with those values written into the config: the
+threshold replaces that of every swept driver, the window the largest
+``merge_window`` (the one detection glues events with).
+
+Usage:
+    >>> from gbpower.events.sweep import sweep
+    >>> table = sweep(df, "config/detection.yml",
+    ...               thresholds=np.arange(90, 99.6, 0.5), windows=range(1, 13), jobs=8)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from gbpower.events.rules import RuleSet
+
+HALF_HOUR_NS = 1800 * 10**9
+HOUR_NS = 2 * HALF_HOUR_NS
+# flagged / flagged_hours: periods breaching a rule (count, hours);
+# event_span_hours: summed (end − start + 30 min) of the merged events, which
+# also counts the unflagged periods a merge window bridges
+COLUMNS = ["threshold", "merge_window", "events", "flagged", "flagged_hours", "event_span_hours",
+           "dur_mean_h", "dur_median_h", "dur_max_h", "peak_mean", "peak_median", "peak_max"]
+
+
+def _quantile_sorted(s: np.ndarray, q: float) -> float:
+    """``np.nanquantile`` (linear) of the sorted, NaN-free *s* in O(1)."""
+    if not len(s):
+        return np.nan
+    v = (len(s) - 1) * q
+    lo = int(np.floor(v))
+    hi = min(lo + 1, len(s) - 1)
+    g = v - lo
+    a, b = s[lo], s[hi]
+    return a + (b - a) * g if g < 0.5 else b - (b - a) * (1 - g)     # numpy's _lerp
+
+
+class Sweep:
+    """Everything a sweep needs from the frame, precomputed once (picklable)."""
+
+    def __init__(self, df: pd.DataFrame, config: str | Path | Mapping = "config/detection.yml",
+                 drivers: list[str] | None = None):
+        if not isinstance(config, Mapping):
+            with open(config, "r") as fp:
+                config = yaml.safe_load(fp)
+        rules = RuleSet(config)
+        methods = {n: r["method"] for n, r in config["drivers"].items()}
+        drivers = drivers or [n for n, m in methods.items() if m == "percentile"]
+        bad = [n for n in drivers if methods.get(n) != "percentile"]
+        if bad:
+            raise ValueError(f"only percentile drivers can be swept: {bad}")
+
+        base = df[["datetime", *rules.columns]]
+        if not base["datetime"].is_monotonic_increasing:
+            base = base.sort_values("datetime", kind="stable")
+        x = rules.matrix(base)
+        self.rules = rules
+        self.t = pd.DatetimeIndex(base["datetime"]).as_unit("ns").asi8
+        self.hits, self.values = rules.evaluate(x)
+        self.at = np.array([rules.names.index(n) for n in drivers])
+        cols = rules.value_col[self.at]
+        self.abs_x = np.abs(x[:, cols])
+        self.sorted = [np.sort(c[~np.isnan(c)]) for c in x[:, cols].T]
+
+    def cuts(self, threshold: float) -> np.ndarray:
+        return np.array([_quantile_sorted(s, threshold / 100) for s in self.sorted])
+
+    def candidates(self, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+        """Times (int64 ns) and peak values of the periods flagged at *threshold*."""
+        hits = self.hits.copy()
+        with np.errstate(invalid="ignore"):
+            hits[:, self.at] = self.abs_x >= np.abs(self.cuts(threshold))
+        self.rules.combine(hits)
+        hits &= self.rules.emit
+        rows = np.flatnonzero(hits.any(axis=1))
+        peak = np.where(hits[rows], self.values[rows], -np.inf).max(axis=1, initial=-np.inf)
+        return self.t[rows], peak
+
+    def summarise(self, threshold: float, windows: Iterable[int]) -> list[dict]:
+        """One summary row per merge window, all from the same candidate run."""
+        t, peak = self.candidates(threshold)
+        gaps = np.diff(t) / HALF_HOUR_NS
+        out = []
+        for w in windows:
+            row = {"threshold": threshold, "merge_window": w, "events": 0, "flagged": len(t),
+                   "flagged_hours": len(t) * HALF_HOUR_NS / HOUR_NS, "event_span_hours": 0.0}
+            if len(t):
+                bounds = np.r_[0, np.flatnonzero(gaps > w) + 1]
+                last = np.r_[bounds[1:], len(t)] - 1
+                hours = (t[last] - t[bounds] + HALF_HOUR_NS) / HOUR_NS
+                peaks = np.maximum.reduceat(peak, bounds)
+                row.update(events=len(bounds), event_span_hours=hours.sum(),
+                           dur_mean_h=hours.mean(), dur_median_h=np.median(hours), dur_max_h=hours.max(),
+                           peak_mean=peaks.mean(), peak_median=np.median(peaks), peak_max=peaks.max())
+            out.append(row)
+        return out
+
+
+_state: Sweep | None = None
+
+
+def _init(state: Sweep) -> None:
+    global _state
+    _state = state
+
+
+def _summarise(args) -> list[dict]:
+    return _state.summarise(*args)
+
+
+def sweep(
+    df: pd.DataFrame,
+    config: str | Path | Mapping = "config/detection.yml",
+    thresholds: Iterable[float] = (90, 95, 97.5, 99),
+    windows: Iterable[int] = (1, 2, 4, 8),
+    drivers: list[str] | None = None,
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """Summary table (one row per threshold × window) of the events each pair gives."""
+    state = Sweep(df, config, drivers)
+    thresholds, windows = [float(t) for t in thresholds], [int(w) for w in windows]
+    tasks = [(t, windows) for t in thresholds]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init, initargs=(state,)) as pool:
+            parts = list(pool.map(_summarise, tasks, chunksize=max(1, len(tasks) // (4 * jobs))))
+    else:
+        parts = [state.summarise(*task) for task in tasks]
+    return pd.DataFrame([row for part in parts for row in part], columns=COLUMNS)
@@ -0,0 +1,226 @@
+"""
+Content-addressed DAG runner for the processing scripts.
+
+Each :class:`Stage` declares the files it reads and writes. The runner
+
+• orders stages by those files (a stage depends on whoever writes its inputs)
+• fingerprints a stage as sha256(command, params, code, input contents)
+  right before it would run, and skips it when the fingerprint matches the
+  last successful run and every output still exists
+• runs independent stages concurrently (``jobs`` at a time), each as its own
+  subprocess, and skips the dependents of a failed stage
+
+File hashes are cached by (size, mtime_ns), so a no-op rerun only stats the
+inputs. Directories (partitioned parquet datasets) hash every file under
+them. State lives in one JSON file, rewritten after every finished stage.
+
+Usage:
+    >>> from gbpower.pipeline import Pipeline, Stage
+    >>> p = Pipeline([Stage("merge", ["python", "radar/utils/merging.py"],
+    ...                     inputs=["data/processed/imbalance_prices.parquet"],
+    ...                     outputs=["data/processed/final_merged.parquet"])],
+    ...              root=".", state_path="data/interim/pipeline_state.json")
+    >>> p.run(jobs=4)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+HASH_BLOCK = 1 << 20
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    cmd: list[str]
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    code: list[str] = field(default_factory=list)       # source files whose edits invalidate the stage
+    params: dict = field(default_factory=dict)
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], root: str | Path = ".", state_path: str | Path | None = None):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("duplicate stage names")
+        self.root = Path(root).resolve()
+        self.state_path = self.root / (state_path or "data/interim/pipeline_state.json")
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+        self.deps = self._dependencies()
+
+    # ───────────────────── graph ─────────────────────
+    def _dependencies(self) -> dict[str, set[str]]:
+        writers = {}
+        for s in self.stages.values():
+            for out in s.outputs:
+                writers[Path(out)] = s.name
+        deps = {}
+        for s in self.stages.values():
+            deps[s.name] = {
+                w for i in s.inputs for out, w in writers.items()
+                if w != s.name and (Path(i) == out or out in Path(i).parents or Path(i) in out.parents)
+            }
+        self._check_acyclic(deps)
+        return deps
+
+    @staticmethod
+    def _check_acyclic(deps: dict[str, set[str]]) -> None:
+        seen, active = set(), set()
+
+        def visit(n):
+            if n in active:
+                raise ValueError(f"dependency cycle through stage '{n}'")
+            if n not in seen:
+                active.add(n)
+                for d in deps[n]:
+                    visit(d)
+                active.discard(n)
+                seen.add(n)
+
+        for n in deps:
+            visit(n)
+
+    def closure(self, names: list[str]) -> set[str]:
+        """*names* plus everything they depend on."""
+        todo, out = list(names), set()
+        while todo:
+            n = todo.pop()
+            if n not in self.stages:
+                raise KeyError(f"unknown stage '{n}'")
+            if n not in out:
+                out.add(n)
+                todo.extend(self.deps[n])
+        return out
+
+    # ───────────────────── hashing ─────────────────────
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            return json.loads(self.state_path.read_text())
+        return {"stages": {}, "files": {}}
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._state, indent=1, sort_keys=True))
+        tmp.replace(self.state_path)
+
+    def _file_hash(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path.relative_to(self.root)) if path.is_relative_to(self.root) else str(path)
+        with self._lock:
+            cached = self._state["files"].get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as fp:
+            while block := fp.read(HASH_BLOCK):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._lock:
+            self._state["files"][key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def content_hash(self, rel: str) -> str:
+        """sha256 of a file, or of every (relative path, hash) under a directory; 'missing' if absent."""
+        path = self.root / rel
+        if path.is_file():
+            return self._file_hash(path)
+        if path.is_dir():
+            h = hashlib.sha256()
+            files = (p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts)
+            for f in sorted(files):
+                h.update(f"{f.relative_to(path)}\0{self._file_hash(f)}\n".encode())
+            return h.hexdigest()
+        return "missing"
+
+    def fingerprint(self, stage: Stage) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps([stage.cmd, stage.params], sort_keys=True, default=str).encode())
+        for rel in sorted({*stage.code, *stage.inputs}):
+            h.update(f"{rel}\0{self.content_hash(rel)}\n".encode())
+        return h.hexdigest()
+
+    def is_fresh(self, stage: Stage, fp: str) -> bool:
+        with self._lock:
+            recorded = self._state["stages"].get(stage.name)
+        return recorded == fp and all((self.root / o).exists() for o in stage.outputs)
+
+    # ───────────────────── running ─────────────────────
+    def _execute(self, stage: Stage, force: bool, dry_run: bool) -> str:
+        fp = self.fingerprint(stage)
+        if not force and self.is_fresh(stage, fp):
+            return "cached"
+        if dry_run:
+            return "stale"
+        missing = [i for i in stage.inputs if not (self.root / i).exists()]
+        if missing:
+            print(f"❌ {stage.name}: missing input(s) {missing}")
+            return "failed"
+
+        t0 = time.perf_counter()
+        print(f"▶ {stage.name}: {' '.join(stage.cmd)}")
+        proc = subprocess.run(stage.cmd, cwd=self.root, capture_output=True, text=True)
+        secs = time.perf_counter() - t0
+        if proc.returncode != 0:
+            tail = "\n".join((proc.stdout + proc.stderr).strip().splitlines()[-15:])
+            print(f"❌ {stage.name} failed after {secs:.1f}s (exit {proc.returncode})\n{tail}")
+            return "failed"
+        with self._lock:
+            self._state["stages"][stage.name] = fp
+            self._save_state()
+        print(f"✓ {stage.name} ({secs:.1f}s)")
+        return "ran"
+
+    def run(
+        self,
+        only: list[str] | None = None,
+        jobs: int = 1,
+        force: bool = False,
+        dry_run: bool = False,
+    ) -> dict[str, str]:
+        """
+        Run the selected stages (default: all) and their dependencies.
+
+        Returns ``{stage: 'ran' | 'cached' | 'stale' | 'failed' | 'blocked'}``
+        ('stale' only with *dry_run*; 'blocked' when a dependency failed).
+        """
+        selected = self.closure(only) if only else set(self.stages)
+        result: dict[str, str] = {}
+        pending = set(selected)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            running = {}
+            while pending or running:
+                for name in sorted(pending):
+                    deps = self.deps[name] & selected
+                    if any(result.get(d) in ("failed", "blocked") for d in deps):
+                        result[name] = "blocked"
+                        pending.discard(name)
+                        print(f"⏭ {name}: blocked by a failed dependency")
+                    elif dry_run and any(result.get(d) == "stale" for d in deps):
+                        result[name] = "stale"                  # upstream would rerun first
+                        pending.discard(name)
+                    elif all(result.get(d) in ("ran", "cached", "stale") for d in deps):
+                        pending.discard(name)
+                        running[pool.submit(self._execute, self.stages[name], force, dry_run)] = name
+                if not running:
+                    if pending:                                 # unreachable for an acyclic graph
+                        raise RuntimeError(f"no runnable stage among {sorted(pending)}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    result[running.pop(fut)] = fut.result()
+
+        with self._lock:
+            self._save_state()
+        return result
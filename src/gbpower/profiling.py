@@ -0,0 +1,247 @@
+"""
+Where the time goes: per-stage timings and an opt-in profiler for the scripts.
+
+• ``@timed()`` / ``with stage(name):`` record wall time, CPU time, rows in /
+  out and peak RSS of a hot function or block, aggregated per name (calls
+  are summed, so a function called per event stays one line)
+• recording is a couple of clock reads per call and always on; nothing is
+  written unless a script runs with ``--profile``
+• ``profile_run(name, outdir)`` wraps a whole run: cProfile (or pyinstrument,
+  if installed) around it, then ``<name>-<stamp>.prof`` + ``.txt`` (or
+  ``.html``) and ``<name>-<stamp>.timings.json`` in *outdir*
+
+Times are inclusive: ``compute_vwap`` also counts inside ``normalise_columns``.
+Peak RSS is the process high-water mark when the stage ended (``getrusage``;
+not available on Windows). Work done in pool workers is not recorded.
+
+Usage:
+    >>> from gbpower.profiling import timed, stage, profile_run
+    >>> @timed()
+    ... def compute_vwap(df): ...
+    >>> with stage("write", rows_in=len(df)):
+    ...     write_dataset(df, path)
+    >>> with profile_run("merge", "reports/profiles"):
+    ...     run(root)
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import json
+import platform
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:                     # Windows
+    resource = None
+
+PROFILE_DIR = "reports/profiles"
+TOP_N = 40                              # functions in the text report
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    peak_rss_mb: float | None = None
+
+
+class _Probe:
+    """Handed to a ``with stage(...)`` block so it can report its output size."""
+    __slots__ = ("rows_in", "rows_out")
+
+    def __init__(self, rows_in):
+        self.rows_in, self.rows_out = rows_in, None
+
+
+_stats: dict[str, StageStats] = {}
+_lock = threading.Lock()
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10     # bytes vs KiB
+
+
+def _rows(obj) -> int | None:
+    shape = getattr(obj, "shape", None)                 # DataFrame, ndarray, pa.Table
+    return int(shape[0]) if shape else None
+
+
+def _add(a: int | None, b: int | None) -> int | None:
+    return a if b is None else (b if a is None else a + b)
+
+
+def _record(name: str, wall: float, cpu: float, rows_in, rows_out) -> None:
+    rss = peak_rss_mb()
+    with _lock:
+        s = _stats.setdefault(name, StageStats())
+        s.calls += 1
+        s.wall_s += wall
+        s.cpu_s += cpu
+        s.rows_in = _add(s.rows_in, rows_in)
+        s.rows_out = _add(s.rows_out, rows_out)
+        s.peak_rss_mb = rss if s.peak_rss_mb is None else max(s.peak_rss_mb, rss)
+
+
+@contextmanager
+def stage(name: str, rows_in: int | None = None):
+    """Time the block under *name*; set ``probe.rows_out`` inside it to record output rows."""
+    probe = _Probe(rows_in)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield probe
+    finally:
+        _record(name, time.perf_counter() - wall, time.process_time() - cpu, probe.rows_in, probe.rows_out)
+
+
+def timed(name: str | None = None):
+    """Decorator: record each call; rows in/out from the first positional argument and the result."""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            wall, cpu = time.perf_counter(), time.process_time()
+            out = fn(*args, **kwargs)
+            _record(label, time.perf_counter() - wall, time.process_time() - cpu,
+                    _rows(args[0]) if args else None, _rows(out))
+            return out
+        return inner
+    return wrap
+
+
+def timings() -> dict[str, dict]:
+    """Snapshot of everything recorded so far, in first-seen order."""
+    with _lock:
+        return {k: asdict(v) for k, v in _stats.items()}
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def _fmt(v, spec: str) -> str:
+    return "—" if v is None else format(v, spec)
+
+
+def format_timings(stats: dict[str, dict]) -> str:
+    lines = [f"{'stage':<26}{'calls':>6}{'wall ms':>11}{'cpu ms':>11}{'rows in':>11}{'rows out':>11}{'peak MB':>9}"]
+    for name, s in stats.items():
+        lines.append(f"{name:<26}{s['calls']:>6}{s['wall_s'] * 1e3:>11.1f}{s['cpu_s'] * 1e3:>11.1f}"
+                     f"{_fmt(s['rows_in'], ','):>11}{_fmt(s['rows_out'], ','):>11}{_fmt(s['peak_rss_mb'], '.0f'):>9}")
+    return "\n".join(lines)
+
+
+# ───────────────────── whole-run profiling ─────────────────────
+class _CProfile:
+    suffix = ".txt"
+
+    def __init__(self):
+        self.prof = cProfile.Profile()
+
+    def start(self):
+        self.prof.enable()
+
+    def stop(self):
+        self.prof.disable()
+
+    def save(self, base: Path) -> Path:
+        self.prof.dump_stats(base.with_suffix(".prof"))         # snakeviz / pstats
+        buf = io.StringIO()
+        pstats.Stats(self.prof, stream=buf).sort_stats("cumulative").print_stats(TOP_N)
+        path = base.with_suffix(self.suffix)
+        path.write_text(buf.getvalue())
+        return path
+
+
+class _PyInstrument:
+    suffix = ".html"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+        self.prof = Profiler()
+
+    def start(self):
+        self.prof.start()
+
+    def stop(self):
+        self.prof.stop()
+
+    def save(self, base: Path) -> Path:
+        path = base.with_suffix(self.suffix)
+        path.write_text(self.prof.output_html())
+        return path
+
+
+PROFILERS = {"cprofile": _CProfile, "pyinstrument": _PyInstrument}
+
+
+@contextmanager
+def profile_run(name: str, outdir: str | Path = PROFILE_DIR, profiler: str = "cprofile"):
+    """
+    Profile the block and write its report and timings JSON to *outdir*.
+
+    The timings file holds run metadata (argv, versions, total wall/CPU,
+    peak RSS) and every stage recorded while the block ran.
+    """
+    try:
+        prof = PROFILERS[profiler]()
+    except ImportError:
+        print(f"⚠️  {profiler} is not installed – falling back to cProfile")
+        prof = _CProfile()
+    reset()
+    started = datetime.now(timezone.utc)
+    wall, cpu = time.perf_counter(), time.process_time()
+    prof.start()
+    try:
+        yield
+    finally:
+        prof.stop()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        base = outdir / f"{name}-{started:%Y%m%dT%H%M%S}"
+        report = prof.save(base)
+        stats = timings()
+        meta = {
+            "command": name, "argv": sys.argv, "date": started.isoformat(timespec="seconds"),
+            "wall_s": wall, "cpu_s": cpu, "peak_rss_mb": peak_rss_mb(),
+            "python": platform.python_version(), "platform": platform.platform(),
+        }
+        json_path = base.with_suffix(".timings.json")
+        json_path.write_text(json.dumps({"meta": meta, "stages": stats}, indent=1))
+        print(f"\n── Profile ({wall:.2f}s wall, {cpu:.2f}s CPU) ──────────────────────")
+        print(format_timings(stats))
+        print(f"💾  {report}\n💾  {json_path}")
+
+
+def add_profile_args(p) -> None:
+    """The shared ``--profile [DIR]`` / ``--profiler`` options."""
+    p.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                   help=f"profile the run; report + timings JSON go to DIR (default: {PROFILE_DIR})")
+    p.add_argument("--profiler", choices=sorted(PROFILERS), default="cprofile",
+                   help="profiler used by --profile (default: cprofile)")
+
+
+def maybe_profile(name: str, args):
+    """``profile_run`` when ``args.profile`` is set, else a no-op context."""
+    if getattr(args, "profile", None):
+        return profile_run(name, args.profile, args.profiler)
+    return nullcontext()
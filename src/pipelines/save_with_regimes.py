@@ -2,29 +2,98 @@
 Run:
     python -m src.pipelines.save_with_regimes  --in data/processed/final_merged_with_features.parquet \
                                               --out data/processed/final_merged_with_regimes.parquet
+
+Trailing 30-day thresholds (no look-ahead), then only new rows on later runs:
+    python -m src.pipelines.save_with_regimes  --in … --out … \
+                                              --threshold-window 1440 --state data/interim/regimes_state.json
+
+Smaller, faster output. This changes the published schema: the 0/1 flag
+columns become int8 (default int64) and regime_flag a categorical (default
+str), so only use it where every reader accepts those dtypes:
+    python -m src.pipelines.save_with_regimes  --in … --out … --compact
+
+Where the time goes (cProfile report + timings JSON in reports/profiles):
+    python -m src.pipelines.save_with_regimes  --in … --out … --profile
 """
 
-import argparse, sys
-import pandas as pd
+import argparse, json, sys
 from pathlib import Path
-from src.features.regime_flags import add_regime_flags
 
-def cli():
+import pandas as pd
+import pyarrow as pa
+
+from gbpower.data import storage
+from gbpower.data.cache import open_cached
+from gbpower.data.storage import read_dataset, write_dataset
+from gbpower.profiling import add_profile_args, maybe_profile, stage
+from src.features.regime_flags import RollingRegimeFlags, add_regime_flags
+
+VOL_WINDOW = 48
+
+def cli(argv=None):
     p = argparse.ArgumentParser()
     p.add_argument("--in",  dest="input_path",  required=True, help="feature parquet")
     p.add_argument("--out", dest="output_path", required=True, help="output parquet")
-    return p.parse_args()
+    p.add_argument("--threshold-window", type=int,
+                   help="trailing rows for the 95/99th percentile thresholds (e.g. 1440 = 30 days); "
+                        "default: full sample")
+    p.add_argument("--state", help="JSON state file; with --threshold-window, later runs "
+                                   "only flag rows newer than the state")
+    p.add_argument("--compact", action="store_true",
+                   help="one-pass flags stored compactly; changes the output dtypes "
+                        "(0/1 flags int64 → int8, regime_flag str → category)")
+    add_profile_args(p)
+    args = p.parse_args(argv)
+    if args.state and not args.threshold_window:
+        p.error("--state needs --threshold-window")
+    return args
+
+def append_rows(new: pd.DataFrame, out_path: Path) -> None:
+    """Append *new* (all later than the stored rows) by rewriting from its first month."""
+    first = new["datetime"].min().tz_convert("UTC")
+    month_start = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0, nanosecond=0)
+    schema = storage.dataset_schema(out_path)
+    kept = storage.read_table(out_path, start=month_start, end=first - pd.Timedelta(1, "ns")).cast(schema)
+    table = pa.Table.from_pandas(new, schema=schema, preserve_index=False)
+    storage.overwrite_from(pa.concat_tables([kept, table]), out_path, since=month_start)
+
+def main(argv=None):
+    args = cli(argv)
+    with maybe_profile("regimes", args):
+        run(args)
+
+def run(args):
+    out_path = Path(args.output_path)
+    state_path = Path(args.state) if args.state else None
+
+    if state_path and state_path.exists() and out_path.is_dir():
+        flagger = RollingRegimeFlags.from_state(json.loads(state_path.read_text()))
+        df = read_dataset(args.input_path, after=flagger.last_datetime)
+        if df.empty:
+            print(f"✅  Nothing newer than {flagger.last_datetime} – {out_path} is up to date")
+            return
+        append_rows(flagger.update(df), out_path)
+        print(f"↻  Flagged {len(df):,} new rows → {out_path}")
+    else:
+        df = open_cached(args.input_path)
 
-def main():
-    args = cli()
-    df = pd.read_parquet(args.input_path)
+        # Build regime flags (uses 48-period rolling window); --compact computes
+        # int8 / categorical columns in one pass and joins them without a copy
+        df = add_regime_flags(df, config={}, window=VOL_WINDOW,
+                              threshold_window=args.threshold_window, compact=args.compact)
 
-    # Build regime flags (uses 48-period rolling window)
-    df = add_regime_flags(df, config={}, window=48)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with stage("write_dataset", rows_in=len(df)):
+            write_dataset(df, out_path)
+        print("✅  Saved file with regime flags →", args.output_path)
+        if state_path:
+            flagger = RollingRegimeFlags(args.threshold_window, window=VOL_WINDOW,
+                                         compact=args.compact).seed(df)
 
-    Path(args.output_path).parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(args.output_path, index=False)
-    print("✅  Saved file with regime flags →", args.output_path)
+    if state_path:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps(flagger.state()))
+        print("💾  Regime state →", state_path)
 
 if __name__ == "__main__":
     sys.exit(main())
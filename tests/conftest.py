@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# make the script trees (radar/, src/) importable alongside the gbpower package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
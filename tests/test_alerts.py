@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+from gbpower.alerts import AlertRules, AlertService, SlackSender
+from gbpower.data.storage import write_dataset
+
+RULES = {"drivers": {"spread_SBP_vs_MIP": {"method": "abs", "threshold": 50, "merge_window": 2}},
+         "priority": ["spread_SBP_vs_MIP"]}
+
+@pytest.fixture
+def webhook():
+    """Local stand-in for a Slack incoming webhook; answers 429 to the first *fail* posts."""
+    received, state = [], {"fail": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if state["fail"]:
+                state["fail"] -= 1
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            received.append((time.monotonic(), body["text"]))
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hook", received, state
+    server.shutdown()
+
+def _rows(spread, regime=None, start="2025-01-01"):
+    n = len(spread)
+    return pd.DataFrame({"datetime": pd.date_range(start, periods=n, freq="30min", tz="UTC"),
+                         "spread_SBP_vs_MIP": np.asarray(spread, dtype="float64"),
+                         "regime_flag": regime if regime is not None else ["NORMAL"] * n})
+
+def test_rules_deduplicate_open_events_and_regimes():
+    rules = AlertRules(RULES)
+    df = _rows([0, 60, 70, 0, 80, 0, 0, 0, 0, 0],
+               ["NORMAL", "EXTREME", "EXTREME", "HIGH_VOL", "EXTREME", "NORMAL", "EXTREME", "NORMAL", "NORMAL", "NORMAL"])
+    alerts = [a for row in df.to_dict("records") for a in rules.evaluate(row)]
+    assert [(a["kind"], a["status"]) for a in alerts] == [
+        ("event", "opened"), ("regime", "opened"),          # one event spans rows 1-4
+        ("regime", "opened"), ("event", "closed"),          # regime re-alerts only after NORMAL
+    ]
+    assert "peak 80.0" in alerts[-1]["text"]
+
+def test_sender_batches_rate_limits_and_retries(webhook):
+    url, received, state = webhook
+    state["fail"] = 1
+    sender = SlackSender(url, rate=5, max_batch=4, linger=0.05)
+    t0 = time.perf_counter()
+    for i in range(10):
+        assert sender.send({"text": f"alert {i}"})
+    assert time.perf_counter() - t0 < 0.05                   # send() never waits on the network
+    sender.close(timeout=10)
+    lines = [line for _, text in received for line in text.split("\n")]
+    assert lines == [f"alert {i}" for i in range(10)]
+    assert sender.posts == len(received) <= 4 and sender.sent == 10 and sender.dropped == 0
+    gaps = np.diff([t for t, _ in received])
+    assert np.all(gaps >= 0.15)                              # 5 posts/s, burst 1
+
+def test_service_alerts_within_seconds_of_landing(webhook, tmp_path):
+    url, received, _ = webhook
+    path = tmp_path / "regimes.parquet"
+    history = _rows(np.zeros(96))
+    write_dataset(history, path)
+
+    sender = SlackSender(url, rate=10, linger=0.1)
+    svc = AlertService(path, AlertRules(RULES), sender, poll=0.1)
+    svc.start()
+    stop = threading.Event()
+    threading.Thread(target=svc.run_forever, args=(stop,), daemon=True).start()
+
+    time.sleep(0.3)
+    assert not received
+    landed = time.monotonic()
+    write_dataset(pd.concat([history, _rows([90.0], ["EXTREME"], start="2025-01-03")]), path)
+    deadline = landed + 5
+    while len(received) < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stop.set()
+    sender.close(timeout=5)
+    assert received and received[0][0] - landed < 3
+    assert "opened 2025-01-03 00:00" in received[0][1] and "Regime EXTREME" in received[0][1]
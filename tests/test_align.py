@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from gbpower.data.align import align_sources
+
+def _chained(sources):
+    frames = [(df.sort_values("datetime", kind="stable").drop_duplicates("datetime").set_index("datetime"), sfx)
+              for df, sfx in sources]
+    merged = frames[0][0]
+    for df, sfx in frames[1:]:
+        merged = merged.join(df, how="outer", rsuffix=sfx)
+    return merged
+
+def _frame(dt, seed, **extra):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"datetime": dt, "price": rng.normal(60, 20, len(dt)),
+                         "mw": rng.integers(0, 40_000, len(dt)), **extra})
+
+def test_matches_chained_outer_join():
+    dt = pd.date_range("2024-03-30", periods=200, freq="30min", tz="UTC")
+    a = _frame(dt.delete([3, 4, 90]), 0, flag=True, sp=np.arange(197) % 48 + 1)
+    b = _frame(dt[::-1][:150], 1, name=pd.array(["x"] * 150, dtype="str"))      # unsorted, shorter
+    b = pd.concat([b, b.iloc[[10]].assign(price=-1.0)])                          # duplicate → first kept
+    c = _frame(dt[20:], 2).drop(columns="mw")
+    sources = [(a, ""), (b, "_b"), (c, "_c"), (pd.DataFrame({"datetime": dt[:0], "x": []}), "")]
+    pd.testing.assert_frame_equal(align_sources(sources), _chained(sources))
+
+def test_off_grid_and_overlap_without_suffix():
+    dt = pd.DatetimeIndex(["2024-01-01 00:00", "2024-01-01 00:10", "2024-01-01 01:00"], tz="UTC")
+    a, b = _frame(dt, 0), _frame(dt[1:].as_unit("us"), 1).rename(columns={"price": "p"})
+    sources = [(a, ""), (b, "_b")]
+    pd.testing.assert_frame_equal(align_sources(sources), _chained(sources))
+    with pytest.raises(ValueError, match="overlap"):
+        align_sources([(a, ""), (b, "")])
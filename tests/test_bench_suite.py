@@ -0,0 +1,23 @@
+import json
+
+from benchmarks import suite
+from benchmarks.synthetic import make_sources
+
+def test_synthetic_sources_cover_the_grid():
+    src = make_sources(months=1, providers=3)
+    assert len(src["DEMAND"]) == 31 * 48 and len(src["INTRADAY"]) == 3 * 31 * 48
+    assert src["INTRADAY"]["Market Index Data Provider Id"].nunique() == 3
+    assert (src["FORECAST"]["datetime"] == src["IMBALANCE"]["datetime"]).all()
+
+def test_suite_writes_comparable_json(tmp_path, capsys):
+    report = suite.run_suite(months=1, providers=2, repeat=1, only=["compute_vwap", "annotate"])
+    assert set(report["results"]) == {"compute_vwap", "annotate"}
+    assert report["results"]["compute_vwap"]["rows"] == 2 * 31 * 48
+    old = suite.save(report, tmp_path, "a")
+    assert json.loads(old.read_text())["meta"]["months"] == 1
+
+    report["results"]["annotate"]["best_s"] *= 3
+    new = suite.save(report, tmp_path, "b")
+    assert suite.compare(old, old) == 0
+    assert suite.compare(old, new, threshold=1.2) == 1
+    assert "slower" in capsys.readouterr().out
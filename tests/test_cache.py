@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from gbpower.data.cache import cache_path, open_cached
+from gbpower.data.storage import read_dataset, write_dataset
+
+def _frame(n=48 * 70, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    x[::7] = np.nan
+    return pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC"),
+                         "spread": x, "n": np.arange(n), "regime_flag": rng.choice(["NORMAL", "EXTREME"], n)})
+
+def test_matches_read_dataset_and_subsets(tmp_path):
+    src, cache = tmp_path / "merged.parquet", tmp_path / "cache"
+    write_dataset(_frame(), src)
+    pd.testing.assert_frame_equal(open_cached(src, cache_dir=cache), read_dataset(src))
+    pd.testing.assert_frame_equal(open_cached(src, ["datetime", "spread"], cache_dir=cache),
+                                  read_dataset(src, columns=["datetime", "spread"]))
+    assert [p.name for p in cache.iterdir()] == [cache_path(src, cache).name]
+
+def test_warm_open_is_zero_copy(tmp_path):
+    src, cache = tmp_path / "merged.parquet", tmp_path / "cache"
+    write_dataset(_frame(48 * 365), src)
+    open_cached(src, cache_dir=cache)
+    before = pa.total_allocated_bytes()
+    df = open_cached(src, ["datetime", "spread", "n"], cache_dir=cache)
+    assert pa.total_allocated_bytes() - before < 1024             # buffers live in the mapped file
+    assert not df["spread"].to_numpy().flags.writeable
+
+def test_rewritten_source_invalidates(tmp_path):
+    src, cache = tmp_path / "merged.parquet", tmp_path / "cache"
+    write_dataset(_frame(), src)
+    old = cache_path(src, cache)
+    open_cached(src, cache_dir=cache)
+    write_dataset(_frame(seed=1), src)
+    got = open_cached(src, cache_dir=cache)
+    pd.testing.assert_frame_equal(got, read_dataset(src))
+    assert not old.exists() and cache_path(src, cache).exists()
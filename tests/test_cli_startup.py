@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import time
+
+import pytest
+from gbpower.cli import main as cli
+
+HEAVY = ("pandas", "numpy", "pyarrow", "matplotlib", "seaborn", "requests", "yaml")
+
+def test_help_imports_nothing_heavy():
+    code = ("import sys; from gbpower.cli.main import main\n"
+            "try: main(['--help'])\n"
+            "except SystemExit: pass\n"
+            f"print(sorted(m for m in {HEAVY!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "[]"
+
+def test_help_under_150ms():
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "gbpower", "--help"], capture_output=True, check=True)
+        best = min(best, time.perf_counter() - t0)
+    assert best < 0.15, f"gbpower --help took {best * 1e3:.0f} ms"
+
+def test_subcommand_args_are_forwarded(monkeypatch):
+    seen = []
+    monkeypatch.setattr(cli, "run_script", lambda path, argv: seen.append((path, argv)) or 0)
+    monkeypatch.setattr(cli, "run_module", lambda name, argv, prog: seen.append((name, argv)) or 0)
+    cli.main(["merge", "--chunked", "--out", "x.parquet"])
+    cli.main(["collect", "imbalance"])
+    cli.main(["events", "--help"])
+    assert seen == [(cli.MERGE_SCRIPT, ["--chunked", "--out", "x.parquet"]),
+                    (cli.COLLECTORS["imbalance"], []), ("gbpower.cli.build_events", ["--help"])]
+    with pytest.raises(SystemExit):
+        cli.main(["collect", "nope"])
+
+def test_run_script_needs_repo_root(tmp_path):
+    with pytest.raises(SystemExit, match="repo root"):
+        cli.run_script(cli.MERGE_SCRIPT, [], root=tmp_path)
+
+def test_distribution_ships_every_subpackage():
+    import tomllib
+    from pathlib import Path
+    from setuptools import find_namespace_packages
+    root = Path(__file__).resolve().parents[1]
+    find = tomllib.loads((root / "pyproject.toml").read_text())["tool"]["setuptools"]["packages"]["find"]
+    shipped = set(find_namespace_packages(str(root / find["where"][0]), include=find["include"]))
+    on_disk = {".".join(p.parent.relative_to(root / "src").parts) for p in (root / "src/gbpower").rglob("__init__.py")}
+    assert on_disk <= shipped and {"gbpower.cli", "gbpower.data", "gbpower.events"} <= on_disk
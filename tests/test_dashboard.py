@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from gbpower.dashboard import DashboardData, REGIMES
+from gbpower.data.downsample import lttb, minmax_lttb
+
+def _frame(n=48 * 365 * 3, seed=0):
+    rng = np.random.default_rng(seed)
+    sbp = 70 + np.cumsum(rng.normal(size=n))
+    mip = sbp + rng.standard_t(3, size=n) * 5
+    df = pd.DataFrame({"datetime": pd.date_range("2022-01-01", periods=n, freq="30min", tz="UTC"),
+                       "sbp_IMBALANCE": sbp, "mip_price_INTRADAY": mip, "spread_SBP_vs_MIP": sbp - mip,
+                       "regime_flag": rng.choice(REGIMES, size=n, p=[0.9, 0.08, 0.02])})
+    df.loc[rng.choice(n, 500, replace=False), "mip_price_INTRADAY"] = np.nan
+    return df
+
+def test_lttb_keeps_endpoints_and_size():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    idx = lttb(np.arange(10_000), y, 500)
+    assert len(idx) == 500 and idx[0] == 0 and idx[-1] == 9_999 and np.all(np.diff(idx) > 0)
+
+def test_minmax_lttb_keeps_extremes_and_skips_nan():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=100_000)
+    y[rng.choice(100_000, 1_000, replace=False)] = np.nan
+    idx = minmax_lttb(pd.date_range("2024-01-01", periods=100_000, freq="30min"), y, 1_000)
+    assert len(idx) <= 1_002 and np.all(np.diff(idx) > 0) and not np.isnan(y[idx]).any()
+    assert np.nanargmax(y) in idx and np.nanargmin(y) in idx
+
+def test_rollups_match_resample():
+    df = _frame(48 * 120)
+    d = DashboardData(df)
+    ref = df.set_index("datetime")["spread_SBP_vs_MIP"].resample("W-MON", label="left", closed="left")
+    weekly = d.rollup("weekly")
+    assert (weekly.index.dayofweek == 0).all()                        # Monday-start calendar weeks
+    assert weekly.index[1] == pd.Timestamp("2022-01-03", tz="UTC")
+    np.testing.assert_allclose(weekly["spread_SBP_vs_MIP_mean"], ref.mean())
+    np.testing.assert_allclose(weekly["spread_SBP_vs_MIP_max"], ref.max())
+    shares = df.set_index("datetime")["regime_flag"].eq("EXTREME").resample("MS").mean()
+    np.testing.assert_allclose(d.rollup("monthly")["share_EXTREME"], shares)
+
+def test_regimes_empty_without_regime_column():
+    d = DashboardData(_frame(48 * 30).drop(columns="regime_flag"))
+    runs = d.regimes("2022-01-02", "2022-01-05")
+    assert runs.empty and list(runs.columns) == ["datetime", "regime_flag"]
+
+def test_summary_matches_window_stats():
+    df = _frame(48 * 60)
+    d = DashboardData(df.sample(frac=1, random_state=0))       # unsorted input is sorted once
+    got = d.summary("2022-01-10", "2022-02-01 12:00")
+    w = df[(df["datetime"] >= "2022-01-10") & (df["datetime"] <= "2022-02-01 12:00")]["mip_price_INTRADAY"]
+    assert got.loc["mip_price_INTRADAY", "count"] == w.count()
+    np.testing.assert_allclose(got.loc["mip_price_INTRADAY", ["mean", "std"]].astype(float), [w.mean(), w.std()])
+
+def test_query_shapes():                  # timing budget: benchmarks/bench_dashboard.py
+    d = DashboardData(_frame())
+    runs = d.regimes("2022-03-01", "2022-03-02")
+    assert runs["regime_flag"].ne(runs["regime_flag"].shift()).all()
+    traces = d.series(d.columns, "2022-01-01", "2024-12-31")
+    assert all(len(t) <= d.max_points + 2 for t in traces.values())
+    daily = d.rollup("daily", "2022-01-01", "2024-12-31")
+    assert len(daily) == 3 * 365 and daily.index.is_monotonic_increasing       # 1095 whole days
+    assert d.summary("2022-01-01", "2024-12-31").loc["sbp_IMBALANCE", "count"] == 48 * 3 * 365
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+from gbpower.events.annotate import annotate_df
+
+def _legacy(df, log):
+    out = df.copy()
+    out["event_id"] = pd.NA
+    for _, row in log.iterrows():
+        out.loc[(out["datetime"] >= row["start"]) & (out["datetime"] <= row["end"]), "event_id"] = row["event_id"]
+    out["event_age"] = out.groupby("event_id").cumcount().where(out["event_id"].notna())
+    return out
+
+def test_matches_mask_loop():
+    dt = pd.date_range("2024-01-01", periods=60, freq="30min", tz="UTC").delete([11, 12, 40])
+    df = pd.DataFrame({"datetime": dt, "x": np.arange(len(dt))})
+
+    def t(i):
+        return pd.Timestamp("2024-01-01", tz="UTC") + pd.Timedelta(minutes=30 * i)
+
+    log = pd.DataFrame({"event_id": [7, 2, 5], "start": [t(38), t(3), t(10)],   # unsorted, starts in a gap
+                        "end": [t(45), t(3), t(15)]})
+    pd.testing.assert_frame_equal(annotate_df(df, log), _legacy(df, log))
+    pd.testing.assert_frame_equal(annotate_df(df, log.iloc[:0]), _legacy(df, log.iloc[:0]))
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
+import pytest
+import yaml
 from gbpower.events.detection import detect_extreme_events
+from gbpower.events.rules import RuleSet
 
 def test_event_merge():
     # artificial 6-period toy frame
@@ -16,3 +20,76 @@ def test_event_merge():
     ev = log.iloc[0]
     assert ev.start == pd.Timestamp("2024-01-01 00:00+0000", tz="UTC")
     assert ev.end   == pd.Timestamp("2024-01-01 02:30+0000", tz="UTC")
+
+
+DRIVERS = ["cashout_cost_GBP", "spread_SBP_vs_MIP", "err_TSD_MW"]
+
+def _random_frame(seed, n=400):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC")})
+    for c in DRIVERS:
+        df[c] = rng.choice([0.0, 50.0, 100.0, 200.0], n) * rng.choice([-1, 1], n)   # many ties
+    df["regime_flag"] = rng.choice(["NORMAL", "HIGH_VOL", "EXTREME"], n)
+    return df
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("pct", [50, 90])
+def test_event_log_properties(tmp_path, seed, pct):
+    rules = yaml.safe_load(open("config/detection.yml"))
+    for d in rules["drivers"].values():
+        d["threshold"] = pct
+    cfg = tmp_path / "rules.yml"
+    cfg.write_text(yaml.safe_dump(rules))
+    df = _random_frame(seed)
+    log = detect_extreme_events(df, cfg)
+
+    assert list(log.columns) == ["event_id", "start", "end", "driver_col", "peak_dt", "peak_value", "regime_flag_mode"]
+    assert log["event_id"].is_unique and (log["start"] <= log["end"]).all()
+    assert (log["start"].iloc[1:].to_numpy() > log["end"].iloc[:-1].to_numpy()).all()   # disjoint, ordered
+    assert log["start"].le(log["peak_dt"]).all() and log["peak_dt"].le(log["end"]).all()
+
+    prio = {c: i for i, c in enumerate(rules["priority"])}
+    for ev in log.itertuples():
+        win = df[(df["datetime"] >= ev.start) & (df["datetime"] <= ev.end)]
+        assert ev.peak_value == win.loc[win["datetime"] == ev.peak_dt, ev.driver_col].iloc[0]
+        # the peak is the largest breaching value in the window; ties go to the priority driver
+        breach = {c: win[win[c].abs() >= abs(df[c].quantile(pct / 100))] for c in DRIVERS}
+        hits = [(b[c].max(), -prio[c]) for c, b in breach.items() if len(b)]
+        assert (ev.peak_value, -prio[ev.driver_col]) == max(hits)
+        # regime mode over the candidate rows (one per breaching driver), smallest on ties
+        counts = pd.concat([b["regime_flag"] for b in breach.values()]).value_counts()
+        assert ev.regime_flag_mode == min(counts.index[counts == counts.max()])
+
+def _rules(**drivers):
+    return RuleSet({"drivers": {k: {"merge_window": 1, **v} for k, v in drivers.items()},
+                    "priority": list(drivers)})
+
+def test_rule_methods_match_pandas():
+    s = _random_frame(0, n=600)["err_TSD_MW"]
+    s[::37] = np.nan
+    df = pd.DataFrame({"p": s, "r": s, "z": s})
+    rules = _rules(p={"method": "percentile", "threshold": 90},
+                   r={"method": "roc", "threshold": 150, "lag": 2},
+                   z={"method": "zscore", "threshold": 1.5, "window": 24})
+    hits, values = rules.evaluate(df)
+    prev = s.shift(1).rolling(24, min_periods=12)
+    assert (hits[:, 0] == (s.abs() >= abs(s.quantile(0.9)))).all()
+    assert (hits[:, 1] == (s.diff(2).abs() >= 150)).all()
+    assert (hits[:, 2] == ((s - prev.mean()).abs() >= 1.5 * prev.std()).fillna(False)).all()
+    np.testing.assert_array_equal(values[:, 0], s.to_numpy())
+
+def test_candidates_bitmask_and_combinations():
+    df = pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=5, freq="30min", tz="UTC"),
+                       "a": [0, 5, 5, 0, 9], "b": [0, 7, 0, 7, 0], "regime_flag": "NORMAL"})
+    rules = _rules(a={"method": "abs", "threshold": 5},
+                   b={"method": "abs", "threshold": 7, "emit": False},
+                   both={"method": "all", "of": ["b", "a"]})
+    cand = rules.candidates(df)
+    assert rules.emitted() == ["a", "both"]
+    assert cand["datetime"].tolist() == df["datetime"][[1, 2, 4]].tolist()      # row 3: b alone is silent
+    assert cand["driver_mask"].tolist() == [0b11, 0b01, 0b01]
+    assert cand["n_drivers"].tolist() == [2, 1, 1]
+    assert cand["driver_col"].tolist() == ["both", "a", "a"]                    # b's 7 beats a's 5
+    assert cand["driver_value"].tolist() == [7, 5, 9]
+    with pytest.raises(ValueError, match="Unknown rule method"):
+        _rules(a={"method": "median"})
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from gbpower.cli.sweep import grid
+from gbpower.events.detection import detect_extreme_events
+from gbpower.events.sweep import sweep
+
+def _frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC"),
+                       "regime_flag": "NORMAL"})
+    for c in ["cashout_cost_GBP", "spread_SBP_vs_MIP", "err_TSD_MW"]:
+        df[c] = rng.standard_t(3, n) * 100
+    df.loc[::50, "err_TSD_MW"] = np.nan
+    return df
+
+def test_sweep_matches_detection():
+    df, cfg = _frame(), yaml.safe_load(open("config/detection.yml"))
+    cfg["drivers"]["err_TSD_MW"] = {"method": "abs", "threshold": 250, "merge_window": 1}   # not swept
+    table = sweep(df, cfg, thresholds=[80, 93.3, 99], windows=[1, 3, 6])
+    assert len(table) == 9
+    for r in table.itertuples():
+        drivers = {k: {**v, "merge_window": r.merge_window} for k, v in cfg["drivers"].items()}
+        for k in ("cashout_cost_GBP", "spread_SBP_vs_MIP"):
+            drivers[k]["threshold"] = r.threshold
+        log = detect_extreme_events(df, {**cfg, "drivers": drivers})
+        hours = (log["end"] - log["start"] + pd.Timedelta("30min")) / pd.Timedelta("1h")
+        assert r.events == len(log) and r.event_span_hours == pytest.approx(hours.sum())
+        assert r.flagged_hours == r.flagged / 2 <= r.event_span_hours
+        assert r.dur_max_h == hours.max() and r.peak_max == log["peak_value"].max()
+        assert r.peak_median == pytest.approx(log["peak_value"].median())
+
+def test_parallel_sweep_and_grid():
+    df = _frame(500)
+    serial = sweep(df, thresholds=grid("90:99:0.5"), windows=grid("1:4:1", int))
+    pd.testing.assert_frame_equal(serial, sweep(df, thresholds=grid("90:99:0.5"), windows=[1, 2, 3, 4], jobs=2))
+    assert grid("95,97.5") == [95.0, 97.5] and len(serial) == 19 * 4
+    with pytest.raises(ValueError, match="percentile"):
+        sweep(df, drivers=["nope"])
@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+collector = pytest.importorskip("radar.collectors.ELEXON_forecast_demand_collector")
+
+class _Stub(BaseHTTPRequestHandler):
+    """Slow BMRS stand-in: first call for every chunk answers 503."""
+    latency = 0.05
+    seen: dict = {}
+    in_flight = peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        q = parse_qs(urlparse(self.path).query)
+        key = (q["from"][0], q["to"][0])
+        with self.lock:
+            type(self).in_flight += 1
+            type(self).peak = max(self.peak, self.in_flight)
+            self.seen[key] = self.seen.get(key, 0) + 1
+            first = self.seen[key] == 1
+        time.sleep(self.latency)
+        if first:
+            body, code = b"busy", 503
+        else:
+            rows = [{"settlementDate": key[0], "settlementPeriod": 1, "boundary": "N",
+                     "transmissionSystemDemand": 25000, "nationalDemand": 23000}]
+            body, code = json.dumps({"data": rows}).encode(), 200
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.lock:
+            type(self).in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub():
+    _Stub.seen, _Stub.in_flight, _Stub.peak = {}, 0, 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}/forecast"
+    srv.shutdown()
+
+def test_concurrent_download_retries_and_resumes(stub, tmp_path):
+    plan = collector.chunk_plan(date(2024, 1, 1), date(2024, 3, 1), raw_dir=tmp_path)
+    done = plan[0][2]
+    done.write_text(json.dumps({"data": []}))        # left by an earlier, killed run
+
+    files = collector.download_chunks(plan, workers=4, rate=200, burst=4, url=stub, backoff=0.01)
+
+    assert files == [f for _, _, f in plan]
+    assert all(f.exists() for f in files)
+    assert not list(tmp_path.glob(".*.tmp"))
+    assert (plan[0][0].isoformat(), plan[0][1].isoformat()) not in _Stub.seen   # resumed, not refetched
+    assert all(n == 2 for n in _Stub.seen.values())                             # one 503 + one retry each
+    assert _Stub.peak > 1                                                        # really concurrent
+    assert json.loads(files[1].read_text())["data"][0]["settlementDate"] == plan[1][0].isoformat()
+
+def test_token_bucket_paces_requests():
+    from gbpower.data.http import TokenBucket
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now[0],
+                         sleep=lambda s: now.__setitem__(0, now[0] + s))
+    for _ in range(6):
+        bucket.acquire()
+    assert now[0] == pytest.approx(2.0)     # 2 free (burst) + 4 at 2/s
@@ -0,0 +1,40 @@
+import json
+import os
+
+import pytest
+
+from gbpower.data.storage import read_dataset
+
+collector = pytest.importorskip("radar.collectors.ELEXON_forecast_demand_collector")
+
+def _chunk(path, day_periods, demand):
+    rows = [{"settlementDate": day, "settlementPeriod": p, "boundary": "N",
+             "transmissionSystemDemand": demand, "nationalDemand": demand}
+            for day, periods in day_periods for p in periods]
+    path.write_text(json.dumps({"data": rows}))
+    return path
+
+def test_fragments_are_cached_and_streamed(tmp_path, monkeypatch):
+    raw, frags = tmp_path / "raw", tmp_path / "frag"
+    raw.mkdir()
+    frags.mkdir()
+    a = _chunk(raw / "forecast_20240101_20240101.json", [("2024-01-01", range(1, 49))], 100)
+    b = _chunk(raw / "forecast_20240102_20240102.json",                 # re-publishes a's last period
+               [("2024-01-01", [48]), ("2024-01-02", range(1, 49))], 200)
+
+    fa = collector.fragment_for(a, frags)
+    assert collector.fragment_for(a, frags) == fa                  # cache hit
+    os.utime(a, ns=(a.stat().st_atime_ns, a.stat().st_mtime_ns + 10**9))
+    fa2 = collector.fragment_for(a, frags)
+    assert fa2 != fa and not fa.exists()                           # mtime change → re-converted
+
+    monkeypatch.setattr(collector, "FRAG_DIR", frags)
+    monkeypatch.setattr(collector, "OUT_PARQUET", tmp_path / "out.parquet")
+    monkeypatch.setattr(collector, "download_chunks", lambda plan, workers: [a, b])
+    collector.main("2024-01-01", "2024-01-02")
+    assert list(frags.glob("forecast_20240102_*.parquet"))         # main() used the patched FRAG_DIR
+
+    out = read_dataset(tmp_path / "out.parquet")
+    assert len(out) == 48 + 48                                     # overlapping key kept once
+    assert out["datetime"].is_unique and out["datetime"].is_monotonic_increasing
+    assert out.loc[out["datetime"] == "2024-01-01 23:30Z", "nationalDemand"].item() == 100
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from gbpower.data.gaps import count_missing, fill, find_gaps, missing_runs, to_slots
+
+def _grid(n=200):
+    return pd.date_range("2024-03-30", periods=n, freq="30min", tz="UTC")
+
+def test_runs_match_date_range_difference():
+    rng = np.random.default_rng(0)
+    dt = _grid(2_000)
+    have = dt[np.sort(rng.choice(len(dt), 1_500, replace=False))]
+    have = have.append(have[:10])[rng.permutation(1_510)]              # unsorted, duplicated
+    expected = pd.date_range(have.min(), have.max(), freq="30min").difference(have)
+    gaps = find_gaps(have)
+    rebuilt = pd.DatetimeIndex(np.concatenate(
+        [pd.date_range(g.start, g.end, freq="30min") for g in gaps.itertuples()]))
+    pd.testing.assert_index_equal(rebuilt, expected, check_names=False)
+    assert count_missing(have) == len(expected) == gaps["n_missing"].sum()
+
+def test_missing_runs_edges():
+    s = np.array([3, 4, 7, 8, 9, 12])
+    starts, lengths = missing_runs(s)
+    assert starts.tolist() == [5, 10] and lengths.tolist() == [2, 2]
+    starts, lengths = missing_runs(s, start=0, end=14)
+    assert starts.tolist() == [0, 5, 10, 13] and lengths.tolist() == [3, 2, 2, 2]
+    assert missing_runs(np.array([], dtype="int64"), 5, 7)[1].tolist() == [3]
+    assert missing_runs(np.array([], dtype="int64"))[0].size == 0
+
+def test_to_slots_drops_nat_and_keeps_naive_as_utc():
+    dt = pd.DatetimeIndex(["2024-01-01 00:00", None, "2024-01-01 01:00"])
+    assert np.diff(to_slots(dt)).tolist() == [2]
+    assert (to_slots(dt) == to_slots(dt.tz_localize("UTC"))).all()
+
+def test_fill_priority_and_provenance():
+    dt = _grid(10)
+    elexon = pd.DataFrame({"datetime": dt[[0, 1, 4, 5, 6, 8]], "nd": [1.0, 2, np.nan, 5, 6, 8]})
+    neso = pd.DataFrame({"datetime": dt[::-1], "nd": np.arange(109.0, 99, -1)}).drop(index=6)   # no slot 3
+    other = pd.DataFrame({"datetime": dt[[3, 3, 9]], "nd": [-1.0, -2, -3]})                      # duplicate → first
+    out = fill([("elexon", elexon), ("neso", neso), ("other", other)], "nd")
+    assert out["datetime"].tolist() == list(dt[:9])                    # span of the first source
+    assert out["nd"].tolist() == [1, 2, 102, -1, 104, 5, 6, 107, 8]
+    assert out["source"].tolist() == ["elexon", "elexon", "neso", "other", "neso",
+                                      "elexon", "elexon", "neso", "elexon"]
+    assert list(out["source"].cat.categories) == ["elexon", "neso", "other"]
+    wide = fill([("elexon", elexon), ("other", other)], "nd", span=(dt[0], dt[-1]))
+    assert wide["datetime"].iloc[-1] == dt[9] and wide["nd"].iloc[-1] == -3
+
+def test_fill_matches_concat_drop_duplicates():
+    rng = np.random.default_rng(1)
+    dt = _grid(5_000)
+    a = pd.DataFrame({"datetime": dt[np.sort(rng.choice(5_000, 3_000, replace=False))], "nd": rng.normal(size=3_000)})
+    b = pd.DataFrame({"datetime": dt[rng.permutation(5_000)[:4_000]], "nd": rng.normal(size=4_000)})
+    old = (pd.concat([a, b[b["datetime"].between(a["datetime"].min(), a["datetime"].max())]], ignore_index=True)
+           .drop_duplicates("datetime").sort_values("datetime", ignore_index=True))
+    new = fill([("a", a), ("b", b)], "nd")
+    pd.testing.assert_frame_equal(new[["datetime", "nd"]], old)
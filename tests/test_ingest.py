@@ -0,0 +1,34 @@
+import pandas as pd
+from gbpower.data.ingest import find_columns, read_csv_window
+from gbpower.data.settlement import settlement_to_utc
+
+def test_window_dtypes_and_categories(tmp_path):
+    days = pd.date_range("2023-12-25", "2024-01-10", freq="D")
+    rows = [(d.strftime("%d/%m/%Y"), sp, f"P{sp % 3}", 10.5 * sp) for d in days for sp in range(1, 49)]
+    path = tmp_path / "mid.csv"
+    pd.DataFrame(rows, columns=["Settlement Date", "Settlement Period", "Provider Id", "Price"]).to_csv(path, index=False)
+
+    cols = find_columns(path, date="date", sp="period", prov="provider")
+    df = read_csv_window(path, date_col=cols["date"], date_format="%d/%m/%Y",
+                         dtypes={cols["sp"]: "int8", cols["prov"]: "category", "Price": "float64"},
+                         start="2024-01-01T00:00Z", end="2024-01-05T23:30Z", chunksize=100)
+
+    # one-day margin above end for the BST spill of the next date, none below start
+    assert df["Settlement Date"].min() == pd.Timestamp("2024-01-01")
+    assert df["Settlement Date"].max() == pd.Timestamp("2024-01-06")
+    assert len(df) == 6 * 48
+    assert df["Settlement Period"].dtype == "int8"
+    assert list(df["Provider Id"].cat.categories) == ["P0", "P1", "P2"]
+    assert df.attrs["ingest"]["rows_read"] == len(rows)
+
+def test_bst_window_keeps_next_date_spill(tmp_path):
+    days = pd.date_range("2024-05-25", "2024-07-05", freq="D")
+    rows = [(d.strftime("%d/%m/%Y"), sp) for d in days for sp in range(1, 49)]
+    path = tmp_path / "sbp.csv"
+    pd.DataFrame(rows, columns=["Settlement Date", "Settlement Period"]).to_csv(path, index=False)
+
+    start, end = pd.Timestamp("2024-06-01T00:00Z"), pd.Timestamp("2024-06-30T23:30Z")
+    df = read_csv_window(path, date_col="Settlement Date", date_format="%d/%m/%Y", start=start, end=end)
+    dt = settlement_to_utc(df["Settlement Date"], df["Settlement Period"])
+    june = dt[(dt >= start) & (dt <= end)]
+    assert len(june) == 30 * 48 and june.max() == end             # 23:00Z / 23:30Z come from 1 July
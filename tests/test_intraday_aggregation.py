@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from gbpower.data.intraday import aggregate_trades
+
+def test_aggregate_matches_groupby():
+    rng = np.random.default_rng(0)
+    dt = pd.date_range("2024-01-01", periods=200, freq="30min", tz="UTC")
+    df = pd.DataFrame({
+        "datetime": rng.choice(dt, 600),                 # unsorted, 1..n trades per period
+        "price": rng.normal(80, 20, 600),
+        "volume": rng.choice([0.0, 5.0, 120.0], 600),
+    })
+    agg = aggregate_trades(df)
+
+    ref = df.groupby("datetime").agg(
+        mean_price=("price", "mean"), min_price=("price", "min"), max_price=("price", "max"),
+        std_price=("price", "std"), total_volume=("volume", "sum"),
+    ).reset_index()
+    pv = (df["price"] * df["volume"]).groupby(df["datetime"]).sum()
+    w = df.groupby("datetime")["volume"].sum()
+    ref["vwap_price"] = (pv / w.where(w != 0)).to_numpy()
+
+    assert agg["datetime"].tolist() == ref["datetime"].tolist()
+    for c in ref.columns[1:]:
+        np.testing.assert_allclose(agg[c], ref[c], rtol=1e-9, equal_nan=True)
+
+def test_zero_volume_period_is_nan():
+    df = pd.DataFrame({
+        "datetime": pd.to_datetime(["2024-01-01 00:00", "2024-01-01 00:00", "2024-01-01 00:30"], utc=True),
+        "price": [50.0, 0.0, 60.0],
+        "volume": [0.0, 0.0, 10.0],
+    })
+    agg = aggregate_trades(df)
+    assert np.isnan(agg["vwap_price"].iloc[0])
+    assert agg["vwap_price"].iloc[1] == 60.0
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from gbpower.events.detection import detect_extreme_events
+from gbpower.events.online import OnlineDetector, P2Quantile
+
+def _history(n=48 * 60, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC")})
+    for c in ["cashout_cost_GBP", "spread_SBP_vs_MIP", "err_TSD_MW"]:
+        df[c] = rng.standard_t(3, n) * 100                       # heavy tails, stationary
+    df["regime_flag"] = rng.choice(["NORMAL", "HIGH_VOL", "EXTREME"], n, p=[.8, .15, .05])
+    return df
+
+def _overlap(a, b):
+    """Share of events in *a* that overlap some event in *b*."""
+    j = np.searchsorted(b["start"].to_numpy(), a["end"].to_numpy(), side="right") - 1
+    return ((j >= 0) & (b["end"].to_numpy()[np.maximum(j, 0)] >= a["start"].to_numpy())).mean()
+
+def test_p2_tracks_exact_quantile():
+    x = np.random.default_rng(1).lognormal(0, 1.5, 20_000)
+    sketch = P2Quantile(0.95)
+    for v in x:
+        sketch.update(v)
+    assert abs(sketch.value / np.quantile(x, 0.95) - 1) < 0.02
+    small = P2Quantile(0.5)
+    for v in [3.0, 1.0, 2.0]:
+        small.update(v)
+    assert small.value == 2.0
+
+def test_replay_agrees_with_batch():
+    df = _history()
+    cut = df["datetime"].iloc[48 * 30]
+    det = OnlineDetector("config/detection.yml")
+    det.warm_up(df[df["datetime"] < cut])
+    recs = det.update_many(df[df["datetime"] >= cut]) + det.flush()
+
+    online = pd.DataFrame([r for r in recs if r["status"] == "closed"])
+    batch = detect_extreme_events(df, "config/detection.yml")
+    batch = batch[batch["start"] >= cut]
+    assert _overlap(batch, online) >= 0.9 and _overlap(online, batch) >= 0.9
+
+    # every event opens once, closes once, and its id sequence is increasing
+    status = pd.DataFrame(recs).groupby("event_id")["status"].agg(list)
+    assert status.map(lambda s: s[0] == "opened" and s[-1] == "closed" and s.count("closed") == 1).all()
+
+def test_merge_window_and_records():
+    det = OnlineDetector({"drivers": {"x": {"method": "abs", "threshold": 10, "merge_window": 2}},
+                          "priority": ["x"]})
+    t = pd.date_range("2024-01-01", periods=8, freq="30min", tz="UTC")
+    vals = [0, 20, 0, 30, 0, 0, 0, 15]
+    recs = [r for ts, v in zip(t, vals) for r in det.update({"datetime": ts, "x": v, "regime_flag": "NORMAL"})]
+    assert [r["status"] for r in recs] == ["opened", "updated", "closed", "opened"]
+    assert recs[2]["start"] == t[1] and recs[2]["end"] == t[3] and recs[2]["peak_value"] == 30
+    assert det.flush()[0]["event_id"] == 1
+
+def test_batch_only_methods_are_rejected_by_name():
+    cfg = {"priority": [], "drivers": {"x": {"method": "abs", "threshold": 1, "merge_window": 1},
+                                       "jump": {"method": "roc", "threshold": 5, "merge_window": 1}}}
+    with pytest.raises(ValueError, match="jump: method 'roc' is batch-only"):
+        OnlineDetector(cfg)
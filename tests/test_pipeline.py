@@ -0,0 +1,56 @@
+import sys
+from gbpower.pipeline import Pipeline, Stage
+
+def _copy(name, src, dst, log):
+    """Stage that appends its name to *log* and copies *src* → *dst* (upper-cased)."""
+    code = (f"import pathlib; pathlib.Path({log!r}).open('a').write({name!r} + '\\n');"
+            f"pathlib.Path({dst!r}).write_text(pathlib.Path({src!r}).read_text().upper())")
+    return Stage(name, [sys.executable, "-c", code], inputs=[src], outputs=[dst])
+
+def _stages(tmp_path):
+    log = str(tmp_path / "log.txt")
+    return [_copy("a", "raw_a.txt", "a.txt", log), _copy("b", "raw_b.txt", "b.txt", log),
+            _copy("c", "a.txt", "c.txt", log)], tmp_path / "log.txt"
+
+def test_skips_unchanged_and_reruns_dependents(tmp_path):
+    (tmp_path / "raw_a.txt").write_text("x")
+    (tmp_path / "raw_b.txt").write_text("y")
+    stages, log = _stages(tmp_path)
+    pipe = Pipeline(stages, root=tmp_path, state_path="state.json")
+    assert pipe.deps == {"a": set(), "b": set(), "c": {"a"}}
+    assert pipe.run(jobs=2) == {"a": "ran", "b": "ran", "c": "ran"}
+
+    assert set(Pipeline(stages, root=tmp_path, state_path="state.json").run(jobs=2).values()) == {"cached"}
+
+    (tmp_path / "raw_a.txt").write_text("z")                  # only a's input changes
+    log.write_text("")
+    res = Pipeline(stages, root=tmp_path, state_path="state.json").run(jobs=2)
+    assert res == {"a": "ran", "b": "cached", "c": "ran"}
+    assert log.read_text().split() == ["a", "c"] and (tmp_path / "c.txt").read_text() == "Z"
+
+    (tmp_path / "c.txt").unlink()                             # missing output → rerun
+    assert Pipeline(stages, root=tmp_path, state_path="state.json").run(only=["c"])["c"] == "ran"
+
+def test_failure_blocks_dependents(tmp_path):
+    (tmp_path / "raw_b.txt").write_text("y")                  # raw_a.txt missing → a fails
+    stages, _ = _stages(tmp_path)
+    res = Pipeline(stages, root=tmp_path, state_path="state.json").run(jobs=3)
+    assert res == {"a": "failed", "b": "ran", "c": "blocked"}
+
+def test_library_edit_reruns_script_stage(tmp_path):
+    from gbpower.cli.pipeline import default_stages
+    stages = {s.name: s for s in default_stages()}
+    assert all("src/gbpower/data" in s.code for s in stages.values())
+    code = stages["merge"].code
+    for rel in code:                                          # a minimal tree with the merge code
+        f = tmp_path / rel if rel.endswith(".py") else tmp_path / rel / "mod.py"
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_text("# v1\n")
+    merge = Stage("merge", [sys.executable, "-c", "open('out.txt', 'a').write('x')"],
+                  outputs=["out.txt"], code=code)
+
+    def run():
+        return Pipeline([merge], root=tmp_path, state_path="state.json").run()["merge"]
+    assert (run(), run()) == ("ran", "cached")
+    (tmp_path / "src/gbpower/data/mod.py").write_text("# v2\n")    # e.g. align.py edited
+    assert run() == "ran"
@@ -0,0 +1,33 @@
+import json
+
+import numpy as np
+import pandas as pd
+from gbpower import profiling
+from gbpower.profiling import profile_run, stage, timed, timings
+
+@timed("double")
+def _double(df):
+    return pd.concat([df, df])
+
+def test_timed_and_stage_aggregate_per_name():
+    profiling.reset()
+    df = pd.DataFrame({"x": np.arange(10)})
+    assert len(_double(df)) == 20 and len(_double(df)) == 20
+    with stage("block", rows_in=5) as probe:
+        probe.rows_out = 3
+    t = timings()
+    assert list(t) == ["double", "block"]
+    assert t["double"]["calls"] == 2 and (t["double"]["rows_in"], t["double"]["rows_out"]) == (20, 40)
+    assert (t["block"]["rows_in"], t["block"]["rows_out"]) == (5, 3)
+    assert t["double"]["wall_s"] >= 0 and t["double"]["cpu_s"] >= 0
+    assert _double.__name__ == "_double"
+
+def test_profile_run_writes_report_and_timings(tmp_path, capsys):
+    with profile_run("unit", tmp_path):
+        _double(pd.DataFrame({"x": [1, 2]}))
+    files = {p.suffix for p in tmp_path.iterdir()}
+    assert files == {".prof", ".txt", ".json"}
+    report = json.loads(next(tmp_path.glob("*.timings.json")).read_text())
+    assert report["meta"]["command"] == "unit" and report["meta"]["wall_s"] > 0
+    assert report["stages"]["double"]["rows_out"] == 4
+    assert "double" in capsys.readouterr().out
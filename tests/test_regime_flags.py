@@ -0,0 +1,61 @@
+import json
+import numpy as np
+import pandas as pd
+from src.features.regime_flags import RollingRegimeFlags, add_regime_flags
+from src.features.rolling_quantile import RollingQuantile
+
+def _features(n=48 * 20, seed=0):
+    rng = np.random.default_rng(seed)
+    spread = rng.standard_t(3, n) * 20
+    spread[::97] = np.nan
+    return pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC"),
+                         "spread_SBP_vs_MIP": spread, "err_TSD_%": rng.normal(0, 2, n)})
+
+def test_rolling_quantile_matches_pandas():
+    x = pd.Series(np.random.default_rng(3).normal(size=2_000)).mask(lambda s: s > 2)
+    got = RollingQuantile(200, (0.95, 0.99), min_periods=20).run(x)
+    for j, q in enumerate((0.95, 0.99)):
+        np.testing.assert_allclose(got[:, j], x.rolling(200, min_periods=20).quantile(q), equal_nan=True)
+
+def test_incremental_update_matches_batch():
+    df = _features()
+    full = add_regime_flags(df, config={}, window=48, threshold_window=48 * 7)
+    assert (full["regime_flag"].iloc[:47] == "NORMAL").all()
+
+    flagger = RollingRegimeFlags(48 * 7, window=48)
+    parts = [flagger.update(df.iloc[:500])]
+    for lo, hi in [(500, 501), (501, 700), (700, len(df))]:
+        flagger = RollingRegimeFlags.from_state(json.loads(json.dumps(flagger.state())))   # saved & restored
+        parts.append(flagger.update(df.iloc[lo:hi]))
+    inc = pd.concat(parts)
+
+    vol = ["vol_spread_SBP_vs_MIP", "vol_err_TSD_%"]       # rolling std: equal up to rounding
+    pd.testing.assert_frame_equal(inc.drop(columns=vol), full.drop(columns=vol))
+    np.testing.assert_allclose(inc[vol], full[vol], rtol=1e-9)
+    assert flagger.last_datetime == df["datetime"].iloc[-1]
+
+def test_compact_flags_match_and_share_input():
+    df = _features()
+    for tw in (None, 48 * 7):
+        wide = add_regime_flags(df, config={}, window=48, threshold_window=tw)
+        compact = add_regime_flags(df, config={}, window=48, threshold_window=tw, compact=True)
+        assert list(compact.columns) == list(wide.columns)
+        assert compact["regime_flag"].dtype == "category" and compact["is_extreme"].dtype == "int8"
+        pd.testing.assert_frame_equal(compact.astype({"regime_flag": str}), wide, check_dtype=False)
+    assert np.shares_memory(compact["err_TSD_%"].to_numpy(), df["err_TSD_%"].to_numpy())
+
+    flagger = RollingRegimeFlags(48 * 7, window=48, compact=True)
+    inc = pd.concat([flagger.update(df.iloc[:300]), flagger.update(df.iloc[300:])])
+    assert inc["regime_flag"].astype(str).tolist() == compact["regime_flag"].astype(str).tolist()
+
+def test_save_with_regimes_keeps_default_schema(tmp_path, monkeypatch):
+    from gbpower.data import cache
+    from src.pipelines import save_with_regimes
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")        # keep the repo's cache clean
+    _features().to_parquet(tmp_path / "in.parquet")
+    for flag in ([], ["--compact"]):
+        out = tmp_path / f"out{len(flag)}"
+        save_with_regimes.main(["--in", str(tmp_path / "in.parquet"), "--out", str(out), *flag])
+        dtypes = pd.read_parquet(out).dtypes
+        assert (dtypes["is_extreme"], dtypes["regime_flag"] == "category") == (
+            ("int8", True) if flag else ("int64", False))
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from gbpower.cli.build_events import render_figures
+from gbpower.events.plotting import event_window
+
+def _frame(n=200):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"datetime": pd.date_range("2024-01-01", periods=n, freq="30min", tz="UTC"),
+                         **{c: rng.normal(size=n) for c in ["err_TSD_MW", "cashout_cost_GBP", "spread_SBP_vs_MIP"]},
+                         "regime_flag": "NORMAL"})
+
+def _log(df):
+    t = df["datetime"]
+    return pd.DataFrame({"event_id": [1, 2], "start": [t[20], t[150]], "end": [t[22], t[151]],
+                         "peak_dt": [t[21], t[150]], "peak_value": [3.0, 2.0]})
+
+def test_event_window_matches_masks():
+    df, row = _frame(), _log(_frame()).iloc[0]
+    mask = (df["datetime"] >= row["start"] - pd.Timedelta(days=1)) & (df["datetime"] <= row["end"] + pd.Timedelta(days=1))
+    pd.testing.assert_frame_equal(event_window(df, row), df[mask])
+
+def test_render_cache_skips_unchanged(tmp_path, capsys):
+    df = _frame()
+    assert len(render_figures(df, _log(df), tmp_path, jobs=2)) == 2
+    stamp = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.png")}
+    capsys.readouterr()
+
+    df.loc[160, "cashout_cost_GBP"] = 99.0              # only event 2's window changes
+    render_figures(df, _log(df), tmp_path)
+    out = capsys.readouterr().out
+    assert "event_001.png (unchanged)" in out and "📊" in out and out.count("📊") == 1
+    assert (tmp_path / "event_001.png").stat().st_mtime_ns == stamp["event_001.png"]
@@ -0,0 +1,32 @@
+import pandas as pd
+from gbpower.data.settlement import clock_to_period, periods_in_day, settlement_to_utc
+
+def test_clock_change_days():
+    dates = ["2024-03-31"] * 3 + ["2024-10-27"] * 3 + ["2024-01-15", "2024-07-01"]
+    periods = [1, 46, 47, 1, 50, 51, 48, 1]
+    got = settlement_to_utc(dates, periods, "%Y-%m-%d")
+    want = pd.to_datetime([
+        "2024-03-31 00:00", "2024-03-31 22:30", None,     # 46-period day, BST from 01:00 UTC
+        "2024-10-26 23:00", "2024-10-27 23:30", None,     # 50-period day, starts in BST
+        "2024-01-15 23:30", "2024-06-30 23:00",
+    ], utc=True)
+    pd.testing.assert_index_equal(got, pd.DatetimeIndex(want).as_unit("ns"))
+    assert list(periods_in_day(pd.Series(["2024-03-31", "2024-10-27", "2024-06-01"]), "%Y-%m-%d")) == [46, 50, 48]
+
+def test_datetime_input_and_missing_dates():
+    dates = pd.Series(pd.to_datetime(["2024-07-01", None, "2024-07-01"]))
+    got = settlement_to_utc(dates, [2, 1, 3])
+    assert got[0] == pd.Timestamp("2024-06-30 23:30Z") and got[1] is pd.NaT and got[2] == pd.Timestamp("2024-07-01 00:00Z")
+
+def test_hhmm_clock_times():
+    dates = ["2023-12-31", "2024-07-01", "2024-07-01", "2024-03-31", "2024-03-31", "2024-03-31",
+             "2024-10-27", "2024-10-27", "2024-10-27", "2024-01-15"]
+    hhmm = [800, 0, 2400, 30, 130, 200, 130, 200, 2330, 1275]
+    got = settlement_to_utc(*clock_to_period(dates, hhmm, "%Y-%m-%d"))
+    want = pd.to_datetime([
+        "2023-12-31 08:00", "2024-06-30 23:00", "2024-07-01 23:00",    # 2400 → next local midnight
+        "2024-03-31 00:30", None, "2024-03-31 01:00",                  # 01:30 doesn't exist
+        "2024-10-27 00:30", "2024-10-27 02:00", "2024-10-27 23:30",    # 01:30 → first (BST) one
+        None,                                                          # malformed HHMM
+    ], utc=True)
+    pd.testing.assert_index_equal(got, pd.DatetimeIndex(want).as_unit("ns"))
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from gbpower.data import storage
+
+def _frame(n=48 * 120):
+    dt = pd.date_range("2023-12-01", periods=n, freq="30min", tz="UTC")
+    return pd.DataFrame({"datetime": dt, "sbp": np.arange(n, dtype="float64")})
+
+def test_roundtrip_sorted_and_partitioned(tmp_path):
+    df = _frame()
+    out = storage.write_dataset(df.sample(frac=1, random_state=1), tmp_path / "imb.parquet")
+    assert sorted(p.name for p in (out / "year=2024").iterdir()) == ["month=01", "month=02", "month=03"]
+    pd.testing.assert_frame_equal(storage.read_dataset(out), df)
+
+def test_window_read_prunes_partitions(tmp_path):
+    df = _frame()
+    out = storage.write_dataset(df, tmp_path / "imb.parquet")
+    start, end = "2024-01-08", "2024-01-14T23:30Z"
+    got = storage.read_dataset(out, start, end)
+    ref = df[(df["datetime"] >= start) & (df["datetime"] <= end)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, ref)
+
+    dset = storage._open(out)
+    expr = storage._time_filter(dset, storage._utc(start), storage._utc(end), None)
+    assert [f.path.split("imb.parquet/")[1] for f in dset.get_fragments(filter=expr)] == ["year=2024/month=01/part-0.parquet"]
+
+def test_legacy_single_file_still_readable(tmp_path):
+    df = _frame(96)
+    df.to_parquet(tmp_path / "old.parquet", index=False)
+    got = storage.read_dataset(tmp_path / "old.parquet", after=df["datetime"].iloc[47])
+    pd.testing.assert_frame_equal(got, df.iloc[48:].reset_index(drop=True))